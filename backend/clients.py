@@ -0,0 +1,87 @@
+"""
+Process-wide GitHub client plumbing for the backend: one shared response cache and
+a pool of keep-alive sessions, one per token. Sessions are looked up by token
+fingerprint; cached responses are keyed by fingerprint too, so one token's
+responses are never served to another. Requests that bring several tokens share a
+TokenPool per token set, so its quota tracking and private-repo pins outlive a
+single request.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from typing import List, Optional
+
+import requests
+
+from gh_visibility.github_client import GitHubClient, make_session
+from gh_visibility.http_cache import ResponseCache, token_fingerprint
+from gh_visibility.token_pool import TokenPool, pool_fingerprint
+
+RESPONSE_CACHE = ResponseCache(
+  max_bytes=int(os.environ.get("GH_VISIBILITY_CACHE_MB", "64")) * 1024 * 1024,
+  ttl=float(os.environ.get("GH_VISIBILITY_CACHE_TTL", "60")),
+  stale_ttl=float(os.environ.get("GH_VISIBILITY_CACHE_STALE_TTL", "3600")),
+)
+
+
+class SessionPool:
+  """LRU of per-token sessions; the least recently used session is closed beyond max_tokens."""
+
+  def __init__(self, max_tokens: int = 256) -> None:
+    self._max_tokens = max_tokens
+    self._sessions: "OrderedDict[str, requests.Session]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def session_for(self, token: str) -> requests.Session:
+    fp = token_fingerprint(token)
+    with self._lock:
+      session = self._sessions.get(fp)
+      if session is not None:
+        self._sessions.move_to_end(fp)
+        return session
+      session = make_session(token)
+      self._sessions[fp] = session
+      while len(self._sessions) > self._max_tokens:
+        _, old = self._sessions.popitem(last=False)
+        old.close()
+      return session
+
+  def close(self) -> None:
+    with self._lock:
+      for session in self._sessions.values():
+        session.close()
+      self._sessions.clear()
+
+
+SESSIONS = SessionPool()
+
+_TOKEN_POOLS: "OrderedDict[str, TokenPool]" = OrderedDict()
+_TOKEN_POOLS_MAX = 64
+_TOKEN_POOLS_LOCK = threading.Lock()
+
+
+def _token_pool(tokens: List[str]) -> TokenPool:
+  fp = pool_fingerprint(tokens)
+  with _TOKEN_POOLS_LOCK:
+    pool = _TOKEN_POOLS.get(fp)
+    if pool is None:
+      pool = _TOKEN_POOLS[fp] = TokenPool(tokens, SESSIONS.session_for)
+      while len(_TOKEN_POOLS) > _TOKEN_POOLS_MAX:
+        _TOKEN_POOLS.popitem(last=False)
+    else:
+      _TOKEN_POOLS.move_to_end(fp)
+    return pool
+
+
+def client_for(token: str, extra_tokens: Optional[List[str]] = None) -> GitHubClient:
+  """
+  GitHubClient backed by the pooled session for this token and the shared cache, or by
+  a TokenPool when extra tokens are given.
+  """
+  tokens = list(dict.fromkeys(t for t in [token, *(extra_tokens or [])] if t))
+  if len(tokens) > 1:
+    return GitHubClient(token="", cache=RESPONSE_CACHE, pool=_token_pool(tokens))
+  return GitHubClient(token=token, session=SESSIONS.session_for(token), cache=RESPONSE_CACHE)
@@ -0,0 +1,192 @@
+"""
+Background scan jobs: a bounded worker pool with progress, partial results and cancellation.
+
+Jobs live in memory only. The request (including the PAT) is held by the worker
+closure until the job finishes and is never exposed in job snapshots.
+"""
+
+from __future__ import annotations
+
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFull(RuntimeError):
+  """Raised when too many jobs are already waiting for a worker."""
+
+
+class JobCancelled(Exception):
+  """Raised inside a job runner when cancellation was requested."""
+
+
+def _now() -> str:
+  return datetime.now(timezone.utc).isoformat()
+
+
+@dataclass
+class ScanJob:
+  id: str
+  username: str
+  preset_id: str
+  status: str = QUEUED
+  phase: str = "queued"
+  done: int = 0
+  total: Optional[int] = None
+  evaluations: List[Dict[str, Any]] = field(default_factory=list)
+  scan_id: Optional[int] = None
+  error: Optional[str] = None
+  retry_at: Optional[str] = None  # when a failed job can be resubmitted (tokens rate limited)
+  created_at: str = field(default_factory=_now)
+  started_at: Optional[str] = None
+  finished_at: Optional[str] = None
+  _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+  _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+  _future: Optional[Future] = field(default=None, repr=False)
+
+  @property
+  def cancel_requested(self) -> bool:
+    return self._cancel.is_set()
+
+  def check_cancelled(self) -> None:
+    """Raise JobCancelled if cancellation was requested; call at repo boundaries."""
+    if self._cancel.is_set():
+      raise JobCancelled()
+
+  def set_progress(self, phase: str, done: int, total: Optional[int]) -> None:
+    with self._lock:
+      self.phase = phase
+      self.done = done
+      self.total = total
+
+  def add_result(self, evaluation: Dict[str, Any]) -> None:
+    with self._lock:
+      self.evaluations.append(evaluation)
+
+  def set_retry_at(self, epoch: Optional[float]) -> None:
+    """Record when resubmitting can succeed; call before raising the error that fails the job."""
+    with self._lock:
+      self.retry_at = datetime.fromtimestamp(epoch, timezone.utc).isoformat() if epoch is not None else None
+
+  def set_results(self, evaluations: List[Dict[str, Any]]) -> None:
+    with self._lock:
+      self.evaluations = evaluations
+
+  def snapshot(self, include_results: bool = True) -> Dict[str, Any]:
+    """JSON-ready view of the job. Partial results are included while running."""
+    with self._lock:
+      out: Dict[str, Any] = {
+        "id": self.id,
+        "username": self.username,
+        "preset_id": self.preset_id,
+        "status": self.status,
+        "progress": {"phase": self.phase, "done": self.done, "total": self.total},
+        "scan_id": self.scan_id,
+        "error": self.error,
+        "retry_at": self.retry_at,
+        "created_at": self.created_at,
+        "started_at": self.started_at,
+        "finished_at": self.finished_at,
+        "result_count": len(self.evaluations),
+      }
+      if include_results:
+        out["evaluations"] = list(self.evaluations)
+      return out
+
+
+class JobManager:
+  """
+  Runs scan jobs on a fixed-size thread pool. At most max_pending jobs may wait
+  for a worker; finished jobs are kept (oldest evicted first) up to max_finished.
+  """
+
+  def __init__(self, max_workers: int = 4, max_pending: int = 100, max_finished: int = 500) -> None:
+    self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scan-job")
+    self._max_pending = max_pending
+    self._max_finished = max_finished
+    self._jobs: "OrderedDict[str, ScanJob]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def submit(
+    self,
+    username: str,
+    preset_id: str,
+    runner: Callable[[ScanJob], None],
+  ) -> ScanJob:
+    """Queue runner(job). The runner reports progress/results on the job and may raise JobCancelled."""
+    job = ScanJob(id=uuid.uuid4().hex, username=username, preset_id=preset_id)
+    with self._lock:
+      pending = sum(1 for j in self._jobs.values() if j.status == QUEUED)
+      if pending >= self._max_pending:
+        raise JobQueueFull(f"{pending} scan jobs already queued; try again later")
+      self._jobs[job.id] = job
+      self._evict_finished()
+    job._future = self._executor.submit(self._run, job, runner)
+    return job
+
+  def get(self, job_id: str) -> Optional[ScanJob]:
+    with self._lock:
+      return self._jobs.get(job_id)
+
+  def status_counts(self) -> Dict[str, int]:
+    counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED)}
+    with self._lock:
+      for job in self._jobs.values():
+        counts[job.status] += 1
+    return counts
+
+  def cancel(self, job_id: str) -> Optional[ScanJob]:
+    """Request cancellation. Queued jobs never start; running jobs stop at the next repo."""
+    job = self.get(job_id)
+    if job is None:
+      return None
+    job._cancel.set()
+    if job._future is not None and job._future.cancel():
+      self._finish(job, CANCELLED)
+    return job
+
+  def shutdown(self) -> None:
+    for job in list(self._jobs.values()):
+      job._cancel.set()
+    self._executor.shutdown(wait=False, cancel_futures=True)
+
+  def _run(self, job: ScanJob, runner: Callable[[ScanJob], None]) -> None:
+    if job.cancel_requested:
+      self._finish(job, CANCELLED)
+      return
+    with job._lock:
+      job.status = RUNNING
+      job.started_at = _now()
+    try:
+      runner(job)
+    except JobCancelled:
+      self._finish(job, CANCELLED)
+    except Exception as e:
+      self._finish(job, FAILED, error=str(e))
+    else:
+      self._finish(job, SUCCEEDED)
+
+  def _finish(self, job: ScanJob, status: str, error: Optional[str] = None) -> None:
+    with job._lock:
+      job.status = status
+      job.error = error
+      job.finished_at = _now()
+      if status == SUCCEEDED:
+        job.phase = "done"
+
+  def _evict_finished(self) -> None:
+    finished = [jid for jid, j in self._jobs.items() if j.status in FINISHED_STATES]
+    for jid in finished[: max(0, len(finished) - self._max_finished)]:
+      del self._jobs[jid]
@@ -1,29 +1,72 @@
 """
 Thin FastAPI backend for gh-visibility: runs the same scan as the CLI.
-PAT is used only for the request and never logged or persisted.
+PAT is used only for the request and never logged or persisted; pooled sessions and
+cached GitHub responses are keyed by a token fingerprint, never the raw token.
 """
 
 from __future__ import annotations
 
+import json
+import os
 import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
 from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # Add repo root so we can import gh_visibility and read presets/
 REPO_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(REPO_ROOT / "src"))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
 from gh_visibility.analyzer import Analyzer
 from gh_visibility.github_client import GitHubClient
-from gh_visibility.presets import load_preset
+from gh_visibility.http_cache import token_fingerprint
+from gh_visibility.token_pool import TokenPoolExhausted, pool_fingerprint
+from gh_visibility.metrics import METRICS, timed
+from gh_visibility.registry import default_registry, thaw
 
-from store import get_history, save_scan
+from clients import RESPONSE_CACHE, client_for
+from jobs import JobManager, JobQueueFull, ScanJob
+from singleflight import SingleFlight
+from store import (
+  DIMENSIONS,
+  GRANULARITIES,
+  diff_scans,
+  get_evaluations_page,
+  get_history,
+  get_latest_scan_id,
+  get_previous_scan_id,
+  get_readme_signatures,
+  get_scan,
+  get_scan_evaluations,
+  get_scan_token_fingerprint,
+  get_trend,
+  remove_scan_repos,
+  save_scan,
+  update_scan_evaluations,
+)
+from webhooks import RepoChange, RescoreQueue, WEBHOOK_RESCORES, handle_delivery, summary_from_payload
 
 app = FastAPI(title="GitHub Account Presentation Optimizer API")
 
+# Presets and rubric are validated once at startup and reloaded when presets/ changes.
+registry = default_registry()
+registry.start_watching()
+
+# Bounded pool for background scans (POST /scans); size via GH_VISIBILITY_SCAN_WORKERS.
+jobs = JobManager(max_workers=int(os.environ.get("GH_VISIBILITY_SCAN_WORKERS", "4")))
+
+# Identical concurrent POST /scan requests share one execution; results can be
+# reused for GH_VISIBILITY_SCAN_REUSE_SECONDS after finishing (default: off).
+scan_flights = SingleFlight(reuse_window=float(os.environ.get("GH_VISIBILITY_SCAN_REUSE_SECONDS", "0")))
+
 app.add_middleware(
   CORSMiddleware,
   allow_origins=["*"],
@@ -36,6 +79,7 @@ app.add_middleware(
 class ScanRequest(BaseModel):
   username: str
   token: str
+  tokens: list[str] | None = None  # Extra tokens; requests are spread over all of them
   preset: str = "indie-hacker"
   preset_payload: dict | None = None  # If set, use instead of loading preset by id
   repo: str | None = None
@@ -45,69 +89,414 @@ class ScanRequest(BaseModel):
   llm_api_key: str | None = None  # Optional; if not set, backend uses env FRONTIER_LLM_API_KEY / OPENAI_API_KEY
 
 
+def _prepare_scan(req: ScanRequest) -> Tuple[GitHubClient, Dict[str, Any], Analyzer]:
+  """Build client, preset and analyzer for a scan request. Raises FileNotFoundError for unknown presets."""
+  client = client_for(req.token, req.tokens)
+  if req.preset_payload and isinstance(req.preset_payload, dict):
+    preset = req.preset_payload
+    if "id" not in preset:
+      preset["id"] = req.preset
+  else:
+    preset = registry.get(req.preset)
+  rubric_path = REPO_ROOT / "schema" / "rubric.json"
+  analyzer = Analyzer(rubric_path=rubric_path, preset=preset, rubric=registry.rubric)
+  return client, preset, analyzer
+
+
+def _save_scan_quietly(
+  req: ScanRequest, evaluations: List[Dict[str, Any]], signatures: List[Optional[bytes]]
+) -> int | None:
+  try:
+    with timed("store_write"):
+      return save_scan(
+        req.username, req.preset, evaluations, token_fp=token_fingerprint(req.token), signatures=signatures
+      )
+  except Exception:
+    return None
+
+
+def _apply_llm(req: ScanRequest, preset: Dict[str, Any], evaluations: List[Dict[str, Any]]) -> None:
+  if not (req.use_llm and req.mode == "suggest"):
+    return
+  from gh_visibility.llm_suggestions import generate_llm_suggestions
+  api_key = req.llm_api_key or os.environ.get("FRONTIER_LLM_API_KEY") or os.environ.get("OPENAI_API_KEY")
+  if api_key:
+    for ev in evaluations:
+      ev["suggestions"] = list(ev.get("suggestions") or [])
+      extra = generate_llm_suggestions(
+        ev.get("repo", {}),
+        ev["suggestions"],
+        preset,
+        api_key=api_key,
+      )
+      ev["suggestions"].extend(extra)
+
+
+def _scan_key(req: ScanRequest) -> Tuple[Any, ...]:
+  """Coalescing key: everything that affects the result, with secrets reduced to fingerprints."""
+  payload = json.dumps(req.preset_payload, sort_keys=True) if req.preset_payload else None
+  return (
+    pool_fingerprint([req.token, *(req.tokens or [])]),
+    req.username.lower(),
+    req.preset,
+    payload,
+    req.repo,
+    req.mode,
+    req.benchmark,
+    req.use_llm,
+    token_fingerprint(req.llm_api_key) if req.llm_api_key else None,
+  )
+
+
 @app.post("/scan")
-def run_scan(req: ScanRequest):
-  """Run the same scan as the CLI. Token is used only for this request and discarded."""
+def run_scan(req: ScanRequest, response: Response):
+  """
+  Run the same scan as the CLI. Token is used only for this request and discarded.
+  Identical concurrent requests from the same token share one scan (X-Scan-Coalesced: 1).
+  """
+  def scan() -> List[Dict[str, Any]]:
+    client, preset, analyzer = _prepare_scan(req)
+    # evaluate_account, keeping the README signatures for the store.
+    scored = list(analyzer.iter_evaluations(client, req.username, repo_filter=req.repo, mode=req.mode))
+    evaluations = analyzer.finalize(scored, benchmark_mode=req.benchmark, mode=req.mode)
+    _save_scan_quietly(req, evaluations, [e.readme_signature for e in scored])
+    _apply_llm(req, preset, evaluations)
+    return evaluations
+
   try:
-    client = GitHubClient(token=req.token)
-    if req.preset_payload and isinstance(req.preset_payload, dict):
-      preset = req.preset_payload
-      if "id" not in preset:
-        preset["id"] = req.preset
-    else:
-      preset = load_preset(req.preset, presets_dir=REPO_ROOT / "presets")
-    rubric_path = REPO_ROOT / "schema" / "rubric.json"
-    analyzer = Analyzer(rubric_path=rubric_path, preset=preset)
-    evaluations = analyzer.evaluate_account(
-      client=client,
-      username=req.username,
-      repo_filter=req.repo,
-      benchmark_mode=req.benchmark,
-      mode=req.mode,
-    )
-    try:
-      save_scan(req.username, req.preset, evaluations)
-    except Exception:
-      pass
-    if req.use_llm and req.mode == "suggest":
-      import os
-      from gh_visibility.llm_suggestions import generate_llm_suggestions
-      api_key = req.llm_api_key or os.environ.get("FRONTIER_LLM_API_KEY") or os.environ.get("OPENAI_API_KEY")
-      if api_key:
-        for ev in evaluations:
-          ev["suggestions"] = list(ev.get("suggestions") or [])
-          extra = generate_llm_suggestions(
-            ev.get("repo", {}),
-            ev["suggestions"],
-            preset,
-            api_key=api_key,
-          )
-          ev["suggestions"].extend(extra)
+    evaluations, shared = scan_flights.do(_scan_key(req), scan)
+    response.headers["X-Scan-Coalesced"] = "1" if shared else "0"
     return evaluations
   except FileNotFoundError as e:
     raise HTTPException(status_code=400, detail=str(e))
+  except TokenPoolExhausted as e:
+    raise _pool_exhausted(e)
   except Exception as e:
     raise HTTPException(status_code=500, detail=str(e))
 
 
+def _pool_exhausted(e: TokenPoolExhausted) -> HTTPException:
+  """429 with Retry-After while a token is resting; 401 once every token was rejected."""
+  retry_after = e.retry_after()
+  if retry_after is None:
+    return HTTPException(status_code=401, detail=str(e))
+  return HTTPException(status_code=429, detail=e.describe(), headers={"Retry-After": str(retry_after)})
+
+
+def _stream_event(kind: str, data: Dict[str, Any], fmt: str) -> str:
+  if fmt == "ndjson":
+    return json.dumps({"type": kind, **data}) + "\n"
+  return f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_scan(
+  req: ScanRequest,
+  client: GitHubClient,
+  preset: Dict[str, Any],
+  analyzer: Analyzer,
+  fmt: str,
+) -> Iterator[str]:
+  """
+  One "evaluation" event per repo as it is scored, then a "summary" event (or an
+  "error" event if the scan fails). Account-level passes run after the per-repo events,
+  so the summary's "updated" maps each repo whose scores or suggestions they changed
+  to its final evaluation; LLM suggestions already streamed are kept.
+  """
+  evaluations = []
+  # Scores and suggestions as streamed; finalize mutates the evaluations' dicts in place.
+  sent: Dict[str, str] = {}
+  llm_extra: Dict[str, List[Dict[str, Any]]] = {}
+  try:
+    for ev in analyzer.iter_evaluations(client, req.username, repo_filter=req.repo, mode=req.mode):
+      evaluations.append(ev)
+      ev_dict = ev.to_dict()
+      name = _repo_name(ev_dict)
+      own = len(ev_dict.get("suggestions") or [])
+      _apply_llm(req, preset, [ev_dict])
+      sent[name] = _scored_json(ev_dict)
+      llm_extra[name] = (ev_dict.get("suggestions") or [])[own:]
+      yield _stream_event("evaluation", {"evaluation": ev_dict}, fmt)
+    results = analyzer.finalize(evaluations, benchmark_mode=req.benchmark, mode=req.mode)
+    summary: Dict[str, Any] = {
+      "repo_count": len(results),
+      "scan_id": _save_scan_quietly(req, results, [e.readme_signature for e in evaluations]),
+    }
+    duplicates = {
+      _repo_name(e): e["analysis"]["readmeDuplicateGroup"]
+      for e in results
+      if e["analysis"].get("readmeDuplicateGroup")
+    }
+    if duplicates:
+      summary["readmeDuplicateGroups"] = duplicates
+    if req.benchmark != "none" or duplicates:
+      summary["overall"] = {_repo_name(e): e["scores"].get("overall") for e in results}
+    updated = {}
+    for e in results:
+      name = _repo_name(e)
+      if llm_extra.get(name):
+        e["suggestions"] = list(e.get("suggestions") or []) + llm_extra[name]
+      if sent.get(name) != _scored_json(e):
+        updated[name] = e
+    if updated:
+      summary["updated"] = updated
+    yield _stream_event("summary", summary, fmt)
+  except TokenPoolExhausted as e:
+    yield _stream_event("error", {"detail": e.describe(), "retry_after": e.retry_after()}, fmt)
+  except Exception as e:
+    yield _stream_event("error", {"detail": str(e)}, fmt)
+
+
+def _scored_json(evaluation: Dict[str, Any]) -> str:
+  return json.dumps([evaluation.get("scores"), evaluation.get("suggestions")], sort_keys=True)
+
+
+def _repo_name(evaluation: Dict[str, Any]) -> str:
+  repo = evaluation.get("repo") or {}
+  return repo.get("fullName") or repo.get("name") or "?"
+
+
+@app.post("/scan/stream")
+def run_scan_stream(req: ScanRequest, format: str = "sse"):
+  """
+  Run a scan and stream each evaluation as soon as its repo is scored, then a final
+  summary event. format=sse (text/event-stream, default) or ndjson (one JSON object per line).
+  """
+  if format not in ("sse", "ndjson"):
+    raise HTTPException(status_code=400, detail="format must be 'sse' or 'ndjson'")
+  try:
+    client, preset, analyzer = _prepare_scan(req)
+  except FileNotFoundError as e:
+    raise HTTPException(status_code=400, detail=str(e))
+  media_type = "application/x-ndjson" if format == "ndjson" else "text/event-stream"
+  return StreamingResponse(
+    _stream_scan(req, client, preset, analyzer, format),
+    media_type=media_type,
+    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+  )
+
+
+def _scan_job_runner(req: ScanRequest, client: GitHubClient, preset: Dict[str, Any], analyzer: Analyzer):
+  def run(job: ScanJob) -> None:
+    def progress(phase: str, done: int, total: int | None) -> None:
+      job.check_cancelled()
+      job.set_progress(phase, done, total)
+
+    evaluations = []
+    try:
+      for ev in analyzer.iter_evaluations(
+        client,
+        req.username,
+        repo_filter=req.repo,
+        mode=req.mode,
+        progress=progress,
+      ):
+        evaluations.append(ev)
+        job.add_result(ev.to_dict())
+        job.check_cancelled()
+    except TokenPoolExhausted as e:
+      job.set_retry_at(e.reset_at)
+      raise
+    job.set_progress("finalizing", job.done, job.total)
+    results = analyzer.finalize(evaluations, benchmark_mode=req.benchmark, mode=req.mode)
+    job.scan_id = _save_scan_quietly(req, results, [e.readme_signature for e in evaluations])
+    _apply_llm(req, preset, results)
+    job.set_results(results)
+
+  return run
+
+
+@app.post("/scans", status_code=202)
+def create_scan_job(req: ScanRequest):
+  """Queue a scan on the background worker pool and return its job id immediately."""
+  try:
+    client, preset, analyzer = _prepare_scan(req)
+  except FileNotFoundError as e:
+    raise HTTPException(status_code=400, detail=str(e))
+  try:
+    job = jobs.submit(req.username, req.preset, _scan_job_runner(req, client, preset, analyzer))
+  except JobQueueFull as e:
+    raise HTTPException(status_code=429, detail=str(e))
+  return job.snapshot(include_results=False)
+
+
+@app.get("/scans/{job_id}")
+def get_scan_job(job_id: str, include_results: bool = True):
+  """Job status, progress (done/total, phase) and results so far."""
+  job = jobs.get(job_id)
+  if job is None:
+    raise HTTPException(status_code=404, detail=f"Scan job not found: {job_id}")
+  return job.snapshot(include_results=include_results)
+
+
+@app.delete("/scans/{job_id}")
+def cancel_scan_job(job_id: str):
+  """Cancel a queued or running job. Running jobs stop at the next repo boundary."""
+  job = jobs.cancel(job_id)
+  if job is None:
+    raise HTTPException(status_code=404, detail=f"Scan job not found: {job_id}")
+  return job.snapshot(include_results=False)
+
+
+def _resolve_scan_id(scan_ref: str) -> int:
+  """A stored scan id, or a finished job id resolved to the scan it saved."""
+  if scan_ref.isdigit():
+    return int(scan_ref)
+  job = jobs.get(scan_ref)
+  if job is None or job.scan_id is None:
+    raise HTTPException(status_code=404, detail=f"Scan not found: {scan_ref}")
+  return job.scan_id
+
+
+# Token fingerprint -> (checked at, GitHub login), so authorizing a read costs at most
+# one GET /user per token every LOGIN_TTL seconds.
+_LOGINS: "OrderedDict[str, Tuple[float, Optional[str]]]" = OrderedDict()
+_LOGINS_MAX = 1024
+_LOGINS_LOCK = threading.Lock()
+LOGIN_TTL = 300.0
+
+
+def _bearer_token(request: Request) -> str:
+  """The PAT from "Authorization: Bearer <token>" (or "token <token>"); 401 if missing."""
+  scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+  if scheme.lower() not in ("bearer", "token") or not token.strip():
+    raise HTTPException(
+      status_code=401,
+      detail="Stored scans and trends require Authorization: Bearer <GitHub token>",
+      headers={"WWW-Authenticate": "Bearer"},
+    )
+  return token.strip()
+
+
+def _token_login(token: str) -> Optional[str]:
+  """GitHub login the token belongs to (cached), or None if GitHub rejects it."""
+  fp = token_fingerprint(token)
+  now = time.monotonic()
+  with _LOGINS_LOCK:
+    cached = _LOGINS.get(fp)
+    if cached is not None and now - cached[0] < LOGIN_TTL:
+      return cached[1]
+  login = client_for(token).get_authenticated_login()
+  with _LOGINS_LOCK:
+    _LOGINS[fp] = (now, login)
+    _LOGINS.move_to_end(fp)
+    while len(_LOGINS) > _LOGINS_MAX:
+      _LOGINS.popitem(last=False)
+  return login
+
+
+def _is_account_token(token: str, username: str) -> bool:
+  """True if token belongs to the GitHub account username (in any letter case)."""
+  login = _token_login(token)
+  return login is not None and login.lower() == username.lower()
+
+
+def _readable_scan(scan_ref: str, request: Request) -> Tuple[int, Dict[str, Any]]:
+  """
+  Resolve scan_ref and check the caller may read it: a finished job id is enough
+  (job ids are unguessable and only known to whoever queued the scan); a stored scan
+  id needs the token that ran the scan or a token of the scanned account. Scans the
+  caller may not read are reported as not found, so ids cannot be probed.
+  """
+  scan_id = _resolve_scan_id(scan_ref)
+  scan = get_scan(scan_id)
+  if scan is None:
+    raise HTTPException(status_code=404, detail=f"Scan not found: {scan_ref}")
+  if not scan_ref.isdigit():
+    return scan_id, scan
+  token = _bearer_token(request)
+  if get_scan_token_fingerprint(scan_id) == token_fingerprint(token):
+    return scan_id, scan
+  if not _is_account_token(token, scan["username"]):
+    raise HTTPException(status_code=404, detail=f"Scan not found: {scan_ref}")
+  return scan_id, scan
+
+
+@app.get("/scans/{scan_ref}/evaluations")
+def list_scan_evaluations(
+  scan_ref: str,
+  request: Request,
+  sort: str = "position",
+  order: str = "asc",
+  limit: int = 50,
+  cursor: str | None = None,
+):
+  """
+  Page through a stored scan's evaluations. sort: position (scan order), name, overall
+  or any dimension id; order: asc|desc; cursor: next_cursor from the previous page.
+  Thresholds: min_<dimension>=N / max_<dimension>=N (e.g. max_readmeStructure=60).
+  scan_ref is a finished job id, or a scan id (see /history) read with the token that
+  ran the scan or a token of the scanned account (Authorization: Bearer <token>).
+  """
+  scan_id, scan = _readable_scan(scan_ref, request)
+  min_scores: Dict[str, float] = {}
+  max_scores: Dict[str, float] = {}
+  for key, value in request.query_params.items():
+    for prefix, bounds in (("min_", min_scores), ("max_", max_scores)):
+      if key.startswith(prefix):
+        dim = key[len(prefix):]
+        if dim not in DIMENSIONS:
+          raise HTTPException(status_code=400, detail=f"Unknown dimension filter: {key}")
+        try:
+          bounds[dim] = float(value)
+        except ValueError:
+          raise HTTPException(status_code=400, detail=f"{key} must be a number")
+  try:
+    page = get_evaluations_page(
+      scan_id,
+      sort=sort,
+      order=order,
+      limit=max(1, min(limit, 500)),
+      cursor=cursor,
+      min_scores=min_scores,
+      max_scores=max_scores,
+    )
+  except ValueError as e:
+    raise HTTPException(status_code=400, detail=str(e))
+  return {**scan, **page}
+
+
+@app.get("/scans/{before_ref}/diff/{after_ref}")
+def diff_stored_scans(
+  before_ref: str,
+  after_ref: str,
+  request: Request,
+  threshold: float = 5.0,
+  dimension: str | None = None,
+  limit: int = 1000,
+):
+  """
+  Repos added and removed between two stored scans, and repos with a dimension score
+  moved by at least threshold points. Refs are scan ids or finished job ids; before_ref
+  "previous" is the account's scan before after_ref with the same preset, so alerting
+  after each scan is one call. dimension: optional comma-separated list (default: all).
+  Both scans must be readable by the caller, as for /scans/{ref}/evaluations.
+  """
+  after_id, after = _readable_scan(after_ref, request)
+  if before_ref == "previous":
+    before_id = get_previous_scan_id(after_id)
+    if before_id is None:
+      raise HTTPException(status_code=404, detail=f"No earlier scan of {after['username']} with preset {after['preset_id']}")
+    before_ref = str(before_id)
+  before_id, before = _readable_scan(before_ref, request)
+  dims = [d.strip() for d in dimension.split(",") if d.strip()] if dimension else None
+  unknown = [d for d in dims or [] if d not in DIMENSIONS]
+  if unknown:
+    raise HTTPException(status_code=400, detail=f"Unknown dimension(s): {', '.join(unknown)}")
+  result = diff_scans(before_id, after_id, threshold=threshold, dimensions=dims, limit=max(1, min(limit, 10_000)))
+  return {"before": before, "after": after, "threshold": threshold, **result}
+
+
 @app.get("/presets")
 def list_presets():
   """Return list of preset ids (and optionally full JSON)."""
-  presets_dir = REPO_ROOT / "presets"
-  if not presets_dir.is_dir():
-    return []
-  ids = []
-  for p in presets_dir.glob("*.json"):
-    ids.append(p.stem)
-  return sorted(ids)
+  return registry.ids()
 
 
 @app.get("/presets/{preset_id}")
 def get_preset(preset_id: str):
   """Return full preset JSON for a given id."""
   try:
-    preset = load_preset(preset_id, presets_dir=REPO_ROOT / "presets")
-    return preset
+    return thaw(registry.get(preset_id))
   except FileNotFoundError:
     raise HTTPException(status_code=404, detail=f"Preset not found: {preset_id}")
 
@@ -121,6 +510,136 @@ def history(username: str, limit: int = 20):
     raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/trends")
+def trends(
+  request: Request,
+  username: str,
+  repo: str | None = None,
+  dimension: str | None = None,
+  granularity: str = "day",
+  start: date | None = None,
+  end: date | None = None,
+):
+  """
+  Score time series downsampled to day/week/month min/avg/max buckets, read from
+  incrementally maintained rollups. Without repo, buckets aggregate the whole account.
+  dimension: optional comma-separated list (default: all dimensions and overall).
+  Rollups mix every scan of the account (and can name private repos), so only a token
+  of the account may read them (Authorization: Bearer <token>); others get 404.
+  """
+  if not _is_account_token(_bearer_token(request), username):
+    raise HTTPException(status_code=404, detail=f"No trends for {username}")
+  dims = [d.strip() for d in dimension.split(",") if d.strip()] if dimension else list(DIMENSIONS)
+  unknown = [d for d in dims if d not in DIMENSIONS]
+  if unknown:
+    raise HTTPException(status_code=400, detail=f"Unknown dimension(s): {', '.join(unknown)}")
+  if granularity not in GRANULARITIES:
+    raise HTTPException(status_code=400, detail=f"granularity must be one of {', '.join(GRANULARITIES)}")
+  try:
+    series = get_trend(username, repo=repo, dimensions=dims, granularity=granularity, start=start, end=end)
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=str(e))
+  return {
+    "username": username,
+    "repo": repo,
+    "granularity": granularity,
+    "series": series,
+  }
+
+
+def _webhook_tokens() -> List[str]:
+  """Server-side tokens for webhook rescoring (comma-separated); empty if not configured."""
+  raw = (
+    os.environ.get("GH_VISIBILITY_WEBHOOK_TOKENS")
+    or os.environ.get("GITHUB_TOKENS")
+    or os.environ.get("GITHUB_TOKEN")
+    or ""
+  )
+  return [t.strip() for t in raw.split(",") if t.strip()]
+
+
+def _rescore_changes(changes: List[RepoChange]) -> None:
+  """
+  Re-evaluate repos named by webhook deliveries and refresh them in their owner's latest
+  scan with the webhook preset; deleted repos are dropped from it. Owners never scanned
+  with that preset have nothing to refresh.
+  """
+  tokens = _webhook_tokens()
+  client = client_for(tokens[0], tokens[1:])
+  preset_id = os.environ.get("GH_VISIBILITY_WEBHOOK_PRESET", "indie-hacker")
+  mode = os.environ.get("GH_VISIBILITY_WEBHOOK_MODE", "suggest")
+  analyzer = Analyzer(preset=registry.get(preset_id), rubric=registry.rubric)
+  by_owner: Dict[str, List[RepoChange]] = {}
+  for change in changes:
+    by_owner.setdefault(change.owner, []).append(change)
+  for owner, owner_changes in by_owner.items():
+    scan_id = get_latest_scan_id(owner, preset_id)
+    if scan_id is None:
+      WEBHOOK_RESCORES.inc(len(owner_changes), result="no_scan")
+      continue
+    removed = [
+      {"id": c.repository.get("id"), "fullName": c.full_name} for c in owner_changes if c.removed
+    ]
+    if removed:
+      with timed("store_write"):
+        remove_scan_repos(scan_id, removed)
+      WEBHOOK_RESCORES.inc(len(removed), result="removed")
+    evs = []
+    for change in owner_changes:
+      if change.removed:
+        continue
+      ev = analyzer.evaluate_summary(client, summary_from_payload(change.repository), mode=mode)
+      if ev is not None:
+        evs.append(ev)
+    if not evs:
+      continue
+    results = analyzer.refresh(
+      evs, get_scan_evaluations(scan_id), mode=mode, account_signatures=get_readme_signatures(scan_id)
+    )
+    with timed("store_write"):
+      update_scan_evaluations(scan_id, results, signatures=[e.readme_signature for e in evs])
+    WEBHOOK_RESCORES.inc(len(results), result="saved")
+
+
+# Webhook deliveries for one repo within the delay coalesce into one re-evaluation.
+webhook_queue = RescoreQueue(
+  _rescore_changes,
+  delay=float(os.environ.get("GH_VISIBILITY_WEBHOOK_DELAY_SECONDS", "10")),
+  max_delay=float(os.environ.get("GH_VISIBILITY_WEBHOOK_MAX_DELAY_SECONDS", "60")),
+)
+
+
+@app.post("/webhooks/github")
+async def github_webhook(request: Request):
+  """
+  Receive GitHub push, repository and public events (signed with
+  GH_VISIBILITY_WEBHOOK_SECRET) and queue a debounced re-evaluation of the affected
+  repo; the result replaces the repo's evaluation in the owner's latest scan.
+  """
+  secret = os.environ.get("GH_VISIBILITY_WEBHOOK_SECRET")
+  if not secret or not _webhook_tokens():
+    raise HTTPException(status_code=503, detail="Webhook rescoring is not configured on this server")
+  body = await request.body()
+  status, payload = handle_delivery(request.headers, body, secret, webhook_queue)
+  return JSONResponse(payload, status_code=status)
+
+
+CACHE_BYTES = METRICS.gauge("ghv_response_cache_bytes", "Bytes held by the shared GitHub response cache.")
+CACHE_ENTRIES = METRICS.gauge("ghv_response_cache_entries", "Entries in the shared GitHub response cache.")
+SCAN_JOBS = METRICS.gauge("ghv_scan_jobs", "Background scan jobs by status.", ["status"])
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+  """Prometheus text exposition of stage timings, GitHub request, cache, LLM and job metrics."""
+  stats = RESPONSE_CACHE.stats()
+  CACHE_BYTES.set(stats["bytes"])
+  CACHE_ENTRIES.set(stats["entries"])
+  for status, count in jobs.status_counts().items():
+    SCAN_JOBS.set(count, status=status)
+  return PlainTextResponse(METRICS.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
   import uvicorn
   uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,66 @@
+"""
+Single-flight coalescing: concurrent calls with the same key share one execution.
+
+Used by POST /scan so a burst of identical scans (e.g. a shared dashboard link)
+costs one GitHub scan. Optionally, a finished result is reused for reuse_window
+seconds. Failures are shared with waiting callers but never reused.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class SingleFlight:
+  def __init__(self, reuse_window: float = 0.0, max_reused: int = 256) -> None:
+    self.reuse_window = reuse_window
+    self._max_reused = max_reused
+    self._inflight: Dict[Hashable, Future] = {}
+    self._recent: Dict[Hashable, Tuple[float, Any]] = {}
+    self._lock = threading.Lock()
+
+  def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+    """
+    Run fn() unless an identical call is in flight (or recently finished), and
+    return (result, shared). shared is True when this caller did not run fn.
+    """
+    with self._lock:
+      recent = self._recent.get(key)
+      if recent is not None:
+        finished_at, result = recent
+        if time.monotonic() - finished_at <= self.reuse_window:
+          return result, True
+        del self._recent[key]
+      future = self._inflight.get(key)
+      leader = future is None
+      if leader:
+        future = Future()
+        self._inflight[key] = future
+
+    if not leader:
+      return future.result(), True
+
+    try:
+      result = fn()
+    except BaseException as e:
+      with self._lock:
+        del self._inflight[key]
+      future.set_exception(e)
+      raise
+    with self._lock:
+      del self._inflight[key]
+      if self.reuse_window > 0:
+        self._prune(time.monotonic())
+        self._recent[key] = (time.monotonic(), result)
+    future.set_result(result)
+    return result, False
+
+  def _prune(self, now: float) -> None:
+    expired = [k for k, (t, _) in self._recent.items() if now - t > self.reuse_window]
+    for k in expired:
+      del self._recent[k]
+    while len(self._recent) >= self._max_reused:
+      del self._recent[next(iter(self._recent))]
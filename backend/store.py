@@ -1,91 +1,673 @@
 """
-Minimal scan history storage (SQLite). No PAT or full README content stored.
+Minimal scan history storage (SQLite). No PAT or full README content stored; a
+scan keeps only the fingerprint of the token that ran it.
+
+Connections come from a small pool opened once in WAL mode, so concurrent scans
+can write while history is read. Per-repo, per-dimension scores are stored as
+rows in repo_scores (indexed by username, repo and timestamp) rather than as a
+JSON blob per scan. Daily, weekly and monthly min/avg/max rollups per repo and
+per account are maintained on every write, so trend queries never scan raw rows.
+Full evaluations (repo metadata, analysis, scores, suggestions; never README text)
+are kept per scan in scan_evaluations, with one indexed column per score so pages
+can be sorted and filtered in SQL, and a covering index on repo id plus scores so
+two scans are diffed by a merge join that never reads evaluation payloads. They can
+name private repos, so the API serves stored scans only to the token that ran them
+or to a token of the scanned account. Repos re-evaluated after a webhook delivery
+are refreshed in place in the account's latest scan rather than saved as a new one
+(deleted repos are dropped from it); each evaluation keeps its README's MinHash so
+the refresh can recheck duplicates.
 """
 
 from __future__ import annotations
 
+import base64
 import json
+import queue
 import sqlite3
-from datetime import datetime, timezone
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, List
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from gh_visibility.diff import ScanDiff, ScoreRow, row_key
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 DB_PATH = DATA_DIR / "scans.db"
 
+POOL_SIZE = 4
 
-def _init_db() -> None:
-  DATA_DIR.mkdir(parents=True, exist_ok=True)
-  conn = sqlite3.connect(DB_PATH)
-  try:
-    conn.execute("""
-      CREATE TABLE IF NOT EXISTS scans (
-        scan_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        username TEXT NOT NULL,
-        preset_id TEXT NOT NULL,
-        timestamp TEXT NOT NULL,
-        repo_count INTEGER NOT NULL,
-        summary TEXT NOT NULL
+DIMENSIONS = (
+  "overall",
+  "nameClarity",
+  "descriptionQuality",
+  "topicCoverage",
+  "readmeStructure",
+  "activityRecency",
+  "metadataHygiene",
+)
+
+_SCHEMA = """
+  CREATE TABLE IF NOT EXISTS scans (
+    scan_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    preset_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    repo_count INTEGER NOT NULL,
+    summary TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT 'scan',
+    token_fp TEXT
+  );
+  CREATE INDEX IF NOT EXISTS idx_scans_username ON scans (username, scan_id);
+  CREATE TABLE IF NOT EXISTS repo_scores (
+    scan_id INTEGER NOT NULL REFERENCES scans (scan_id),
+    position INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    score REAL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (scan_id, position, dimension)
+  );
+  CREATE INDEX IF NOT EXISTS idx_repo_scores_user_repo_ts
+    ON repo_scores (username, repo, timestamp);
+  CREATE INDEX IF NOT EXISTS idx_repo_scores_user_dim_ts
+    ON repo_scores (username, dimension, timestamp);
+  CREATE TABLE IF NOT EXISTS score_rollups (
+    username TEXT NOT NULL,
+    repo TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min_score REAL NOT NULL,
+    max_score REAL NOT NULL,
+    PRIMARY KEY (username, repo, dimension, granularity, bucket)
+  ) WITHOUT ROWID;
+  CREATE TABLE IF NOT EXISTS scan_evaluations (
+    scan_id INTEGER NOT NULL REFERENCES scans (scan_id),
+    position INTEGER NOT NULL,
+    repo_id INTEGER,
+    full_name TEXT NOT NULL,
+    overall REAL NOT NULL,
+    name_clarity REAL NOT NULL,
+    description_quality REAL NOT NULL,
+    topic_coverage REAL NOT NULL,
+    readme_structure REAL NOT NULL,
+    activity_recency REAL NOT NULL,
+    metadata_hygiene REAL NOT NULL,
+    payload TEXT NOT NULL,
+    readme_signature BLOB,
+    PRIMARY KEY (scan_id, position)
+  ) WITHOUT ROWID;
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_repo_scores ON scan_evaluations
+    (scan_id, repo_id, full_name, overall, name_clarity, description_quality, topic_coverage,
+     readme_structure, activity_recency, metadata_hygiene);
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_overall ON scan_evaluations (scan_id, overall, position);
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_name_clarity ON scan_evaluations (scan_id, name_clarity, position);
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_description_quality ON scan_evaluations (scan_id, description_quality, position);
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_topic_coverage ON scan_evaluations (scan_id, topic_coverage, position);
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_readme_structure ON scan_evaluations (scan_id, readme_structure, position);
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_activity_recency ON scan_evaluations (scan_id, activity_recency, position);
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_metadata_hygiene ON scan_evaluations (scan_id, metadata_hygiene, position);
+  CREATE INDEX IF NOT EXISTS idx_scan_evaluations_full_name ON scan_evaluations (scan_id, full_name, position);
+"""
+
+# Evaluation sort keys -> scan_evaluations columns. Missing scores are stored as -1.
+EVALUATION_COLUMNS = {
+  "overall": "overall",
+  "nameClarity": "name_clarity",
+  "descriptionQuality": "description_quality",
+  "topicCoverage": "topic_coverage",
+  "readmeStructure": "readme_structure",
+  "activityRecency": "activity_recency",
+  "metadataHygiene": "metadata_hygiene",
+  "name": "full_name",
+  "position": "position",
+}
+
+GRANULARITIES = ("day", "week", "month")
+
+# Rollup rows with this repo value aggregate every repo of the account.
+ACCOUNT_REPO = ""
+
+_UPSERT_ROLLUP = """
+  INSERT INTO score_rollups (username, repo, dimension, granularity, bucket, count, total, min_score, max_score)
+  VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+  ON CONFLICT (username, repo, dimension, granularity, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    total = total + excluded.total,
+    min_score = MIN(min_score, excluded.min_score),
+    max_score = MAX(max_score, excluded.max_score)
+"""
+
+
+def bucket_start(day: date, granularity: str) -> str:
+  """ISO date of the first day of the day/week (Monday)/month bucket containing day."""
+  if granularity == "day":
+    return day.isoformat()
+  if granularity == "week":
+    return (day - timedelta(days=day.weekday())).isoformat()
+  if granularity == "month":
+    return day.replace(day=1).isoformat()
+  raise ValueError(f"Unknown granularity: {granularity} (expected one of {', '.join(GRANULARITIES)})")
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+  """Add columns introduced after a database was created."""
+  columns = {row[1] for row in conn.execute("PRAGMA table_info(scans)")}
+  if "source" not in columns:
+    with conn:
+      conn.execute("ALTER TABLE scans ADD COLUMN source TEXT NOT NULL DEFAULT 'scan'")
+  if "token_fp" not in columns:
+    with conn:
+      conn.execute("ALTER TABLE scans ADD COLUMN token_fp TEXT")
+  columns = {row[1] for row in conn.execute("PRAGMA table_info(scan_evaluations)")}
+  if "readme_signature" not in columns:
+    with conn:
+      conn.execute("ALTER TABLE scan_evaluations ADD COLUMN readme_signature BLOB")
+
+
+class _ConnectionPool:
+  """
+  Fixed set of connections to one database file, handed out one thread at a time.
+  close() closes idle connections at once and checked-out ones when they are returned;
+  later checkouts raise sqlite3.ProgrammingError.
+  """
+
+  def __init__(self, path: Path, size: int) -> None:
+    self.path = path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    self._idle: "queue.Queue[Optional[sqlite3.Connection]]" = queue.Queue()
+    self._lock = threading.Lock()
+    self._closed = False
+    for i in range(size):
+      conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+      conn.execute("PRAGMA journal_mode=WAL")
+      conn.execute("PRAGMA synchronous=NORMAL")
+      conn.execute("PRAGMA foreign_keys=ON")
+      if i == 0:
+        conn.executescript(_SCHEMA)
+        _migrate(conn)
+      self._idle.put(conn)
+
+  @contextmanager
+  def connection(self) -> Iterator[sqlite3.Connection]:
+    conn = self._idle.get()
+    if conn is None:
+      # Closed: pass the wake-up on to the next waiter.
+      self._idle.put(None)
+      raise sqlite3.ProgrammingError(f"Connection pool for {self.path} is closed")
+    try:
+      yield conn
+    finally:
+      with self._lock:
+        if self._closed:
+          conn.close()
+        else:
+          self._idle.put(conn)
+
+  def close(self) -> None:
+    with self._lock:
+      self._closed = True
+      while True:
+        try:
+          conn = self._idle.get_nowait()
+        except queue.Empty:
+          break
+        if conn is not None:
+          conn.close()
+      self._idle.put(None)
+
+
+_pool: Optional[_ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+@contextmanager
+def _connection() -> Iterator[sqlite3.Connection]:
+  """Borrow a pooled connection; the schema is created once when the pool opens."""
+  global _pool
+  with _pool_lock:
+    if _pool is None or _pool.path != DB_PATH:
+      if _pool is not None:
+        _pool.close()
+      _pool = _ConnectionPool(DB_PATH, POOL_SIZE)
+    pool = _pool
+  with pool.connection() as conn:
+    yield conn
+
+
+def _score_of(scores: Dict[str, Any], dim: str) -> Optional[float]:
+  v = scores.get(dim)
+  if isinstance(v, dict) and "score" in v:
+    return v["score"]
+  return None
+
+
+def _rollup_rows(username: str, timestamp: str, score_rows: List[tuple]) -> List[tuple]:
+  """Rollup deltas for one scan: one row per repo and dimension, plus account-wide rows."""
+  day = datetime.fromisoformat(timestamp).date()
+  account: Dict[str, List[float]] = {}
+  per_repo = []
+  for _, _, _, repo, dim, score, _ in score_rows:
+    if score is None:
+      continue
+    per_repo.append((repo, dim, score))
+    account.setdefault(dim, []).append(score)
+  out = []
+  for granularity in GRANULARITIES:
+    bucket = bucket_start(day, granularity)
+    for repo, dim, score in per_repo:
+      out.append((username, repo, dim, granularity, bucket, 1, score, score, score))
+    for dim, values in account.items():
+      out.append((username, ACCOUNT_REPO, dim, granularity, bucket, len(values), sum(values), min(values), max(values)))
+  return out
+
+
+_INSERT_REPO_SCORE = (
+  "INSERT INTO repo_scores (scan_id, position, username, repo, dimension, score, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_INSERT_EVALUATION = (
+  "INSERT INTO scan_evaluations (scan_id, position, repo_id, full_name, overall, name_clarity, description_quality,"
+  " topic_coverage, readme_structure, activity_recency, metadata_hygiene, payload, readme_signature)"
+  " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _evaluation_rows(
+  scan_id: int, position: int, username: str, timestamp: str, e: Dict[str, Any], signature: Optional[bytes]
+) -> Tuple[List[tuple], tuple]:
+  """repo_scores rows and the scan_evaluations row for one evaluation."""
+  repo = e.get("repo", {})
+  scores = e.get("scores", {})
+  name = repo.get("fullName") or repo.get("name") or "?"
+  dim_scores = [_score_of(scores, dim) for dim in DIMENSIONS]
+  score_rows = [(scan_id, position, username, name, dim, score, timestamp) for dim, score in zip(DIMENSIONS, dim_scores)]
+  evaluation_row = (
+    scan_id,
+    position,
+    repo.get("id"),
+    name,
+    *(-1.0 if v is None else v for v in dim_scores),
+    json.dumps(e),
+    signature,
+  )
+  return score_rows, evaluation_row
+
+
+def save_scan(
+  username: str,
+  preset_id: str,
+  evaluations: List[Dict[str, Any]],
+  source: str = "scan",
+  token_fp: Optional[str] = None,
+  signatures: Optional[Sequence[Optional[bytes]]] = None,
+) -> int:
+  """
+  Persist a scan, its per-repo dimension scores and full evaluations. Returns scan_id.
+  Never stores the PAT, only token_fp (its fingerprint) to authorize later reads.
+  source: "scan" (databases from before webhook refreshes may also hold "webhook").
+  signatures: each evaluation's README MinHash, so webhook refreshes can recheck
+  duplicates without refetching the account's READMEs.
+  """
+  timestamp = datetime.now(timezone.utc).isoformat()
+  with _connection() as conn:
+    with conn:
+      cur = conn.execute(
+        "INSERT INTO scans (username, preset_id, timestamp, repo_count, summary, source, token_fp)"
+        " VALUES (?, ?, ?, ?, '', ?, ?)",
+        (username, preset_id, timestamp, len(evaluations), source, token_fp),
       )
-    """)
-    conn.commit()
-  finally:
-    conn.close()
-
-
-def save_scan(username: str, preset_id: str, evaluations: List[Dict[str, Any]]) -> int:
-  """Persist a scan summary. Returns scan_id. Do not store PAT or full payload."""
-  _init_db()
-  summary = []
-  for e in evaluations:
-    repo = e.get("repo", {})
-    scores = e.get("scores", {})
-    overall = None
-    if isinstance(scores.get("overall"), dict) and "score" in scores["overall"]:
-      overall = scores["overall"]["score"]
-    summary.append({
-      "fullName": repo.get("fullName") or repo.get("name"),
-      "overall": overall,
-    })
-  conn = sqlite3.connect(DB_PATH)
-  try:
-    cur = conn.execute(
-      "INSERT INTO scans (username, preset_id, timestamp, repo_count, summary) VALUES (?, ?, ?, ?, ?)",
-      (
-        username,
-        preset_id,
-        datetime.now(timezone.utc).isoformat(),
-        len(evaluations),
-        json.dumps(summary),
-      ),
-    )
-    conn.commit()
-    return cur.lastrowid or 0
-  finally:
-    conn.close()
+      scan_id = cur.lastrowid or 0
+      rows = []
+      evaluation_rows = []
+      for position, e in enumerate(evaluations):
+        signature = signatures[position] if signatures else None
+        score_rows, evaluation_row = _evaluation_rows(scan_id, position, username, timestamp, e, signature)
+        rows.extend(score_rows)
+        evaluation_rows.append(evaluation_row)
+      conn.executemany(_INSERT_REPO_SCORE, rows)
+      conn.executemany(_UPSERT_ROLLUP, _rollup_rows(username, timestamp, rows))
+      conn.executemany(_INSERT_EVALUATION, evaluation_rows)
+    return scan_id
+
+
+def get_latest_scan_id(username: str, preset_id: str) -> Optional[int]:
+  """The newest account scan of username (in any letter case) with preset_id, if any."""
+  with _connection() as conn:
+    row = conn.execute(
+      "SELECT scan_id FROM scans WHERE username = ? COLLATE NOCASE AND preset_id = ? AND source = 'scan'"
+      " ORDER BY scan_id DESC LIMIT 1",
+      (username, preset_id),
+    ).fetchone()
+  return row[0] if row is not None else None
+
+
+def get_scan_evaluations(scan_id: int) -> List[Dict[str, Any]]:
+  """Every stored evaluation of scan_id, in scan order."""
+  with _connection() as conn:
+    rows = conn.execute(
+      "SELECT payload FROM scan_evaluations WHERE scan_id = ? ORDER BY position", (scan_id,)
+    ).fetchall()
+  return [json.loads(payload) for (payload,) in rows]
+
+
+def get_readme_signatures(scan_id: int) -> List[Optional[bytes]]:
+  """README MinHash of every evaluation of scan_id, in scan order (None if not stored)."""
+  with _connection() as conn:
+    rows = conn.execute(
+      "SELECT readme_signature FROM scan_evaluations WHERE scan_id = ? ORDER BY position", (scan_id,)
+    ).fetchall()
+  return [bytes(signature) if signature is not None else None for (signature,) in rows]
+
+
+def _scan_position(conn: sqlite3.Connection, scan_id: int, repo: Dict[str, Any]) -> Optional[int]:
+  """Position of repo in scan_id, matched by repo id, else by full name."""
+  if repo.get("id") is not None:
+    found = conn.execute(
+      "SELECT position FROM scan_evaluations WHERE scan_id = ? AND repo_id = ?", (scan_id, repo["id"])
+    ).fetchone()
+  else:
+    found = conn.execute(
+      "SELECT position FROM scan_evaluations WHERE scan_id = ? AND repo_id IS NULL AND full_name = ?",
+      (scan_id, repo.get("fullName") or repo.get("name") or "?"),
+    ).fetchone()
+  return found[0] if found is not None else None
+
+
+def _delete_position(conn: sqlite3.Connection, scan_id: int, position: int) -> None:
+  conn.execute("DELETE FROM scan_evaluations WHERE scan_id = ? AND position = ?", (scan_id, position))
+  conn.execute("DELETE FROM repo_scores WHERE scan_id = ? AND position = ?", (scan_id, position))
+
+
+def _scan_username(conn: sqlite3.Connection, scan_id: int) -> str:
+  row = conn.execute("SELECT username FROM scans WHERE scan_id = ?", (scan_id,)).fetchone()
+  if row is None:
+    raise ValueError(f"Unknown scan: {scan_id}")
+  return row[0]
+
+
+def update_scan_evaluations(
+  scan_id: int,
+  evaluations: List[Dict[str, Any]],
+  signatures: Optional[Sequence[Optional[bytes]]] = None,
+) -> int:
+  """
+  Refresh repos in a stored scan, e.g. after a webhook: evaluations of repos already in
+  it (matched by repo id, else full name) are replaced, others are appended. Their
+  repo_scores rows are rewritten and each repo gets a rollup sample at the current time;
+  account-wide rollups only take samples from full scans. signatures: as for save_scan.
+  Returns the number appended.
+  """
+  timestamp = datetime.now(timezone.utc).isoformat()
+  with _connection() as conn:
+    with conn:
+      username = _scan_username(conn, scan_id)
+      next_position = conn.execute(
+        "SELECT COALESCE(MAX(position) + 1, 0) FROM scan_evaluations WHERE scan_id = ?", (scan_id,)
+      ).fetchone()[0]
+      rows = []
+      added = 0
+      for i, e in enumerate(evaluations):
+        position = _scan_position(conn, scan_id, e.get("repo", {}))
+        if position is not None:
+          _delete_position(conn, scan_id, position)
+        else:
+          position = next_position
+          next_position += 1
+          added += 1
+        signature = signatures[i] if signatures else None
+        score_rows, evaluation_row = _evaluation_rows(scan_id, position, username, timestamp, e, signature)
+        rows.extend(score_rows)
+        conn.execute(_INSERT_EVALUATION, evaluation_row)
+      conn.executemany(_INSERT_REPO_SCORE, rows)
+      conn.executemany(
+        _UPSERT_ROLLUP, [r for r in _rollup_rows(username, timestamp, rows) if r[1] != ACCOUNT_REPO]
+      )
+      if added:
+        conn.execute("UPDATE scans SET repo_count = repo_count + ? WHERE scan_id = ?", (added, scan_id))
+  return added
+
+
+def remove_scan_repos(scan_id: int, repos: List[Dict[str, Any]]) -> int:
+  """
+  Drop repos (evaluation-style repo objects: id, fullName) from a stored scan, e.g. after
+  a webhook reports them deleted. Rollup samples already taken are kept. Returns how
+  many were in the scan.
+  """
+  with _connection() as conn:
+    with conn:
+      _scan_username(conn, scan_id)
+      removed = 0
+      for repo in repos:
+        position = _scan_position(conn, scan_id, repo)
+        if position is not None:
+          _delete_position(conn, scan_id, position)
+          removed += 1
+      if removed:
+        conn.execute("UPDATE scans SET repo_count = repo_count - ? WHERE scan_id = ?", (removed, scan_id))
+  return removed
 
 
 def get_history(username: str, limit: int = 20) -> List[Dict[str, Any]]:
   """Return last N scans for the given username."""
-  _init_db()
-  conn = sqlite3.connect(DB_PATH)
-  try:
-    rows = conn.execute(
-      "SELECT scan_id, username, preset_id, timestamp, repo_count, summary FROM scans WHERE username = ? ORDER BY scan_id DESC LIMIT ?",
+  with _connection() as conn:
+    scans = conn.execute(
+      "SELECT scan_id, username, preset_id, timestamp, repo_count, summary, source FROM scans WHERE username = ? ORDER BY scan_id DESC LIMIT ?",
       (username, limit),
     ).fetchall()
-    out = []
-    for r in rows:
-      scan_id, uname, preset_id, ts, repo_count, summary_json = r
+    if not scans:
+      return []
+    ids = [r[0] for r in scans]
+    placeholders = ",".join("?" * len(ids))
+    by_scan: Dict[int, List[Dict[str, Any]]] = {}
+    for scan_id, repo, score in conn.execute(
+      f"SELECT scan_id, repo, score FROM repo_scores WHERE scan_id IN ({placeholders}) AND dimension = 'overall' ORDER BY scan_id, position",
+      ids,
+    ):
+      by_scan.setdefault(scan_id, []).append({"fullName": repo, "overall": score})
+  out = []
+  for scan_id, uname, preset_id, ts, repo_count, summary_json, source in scans:
+    summary = by_scan.get(scan_id)
+    if summary is None:
+      # Rows written before per-repo scores were normalized keep a JSON summary.
       summary = json.loads(summary_json) if summary_json else []
-      out.append({
-        "scan_id": scan_id,
-        "username": uname,
-        "preset_id": preset_id,
-        "timestamp": ts,
-        "repo_count": repo_count,
-        "summary": summary,
+    out.append({
+      "scan_id": scan_id,
+      "username": uname,
+      "preset_id": preset_id,
+      "timestamp": ts,
+      "repo_count": repo_count,
+      "source": source,
+      "summary": summary,
+    })
+  return out
+
+
+def get_trend(
+  username: str,
+  repo: Optional[str] = None,
+  dimensions: Optional[List[str]] = None,
+  granularity: str = "day",
+  start: Optional[date] = None,
+  end: Optional[date] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+  """
+  Downsampled score series from rollups: dimension -> [{bucket, count, min, avg, max}].
+  Without repo, each bucket aggregates every repo of the account.
+  start/end are inclusive and widened to whole buckets.
+  """
+  if granularity not in GRANULARITIES:
+    raise ValueError(f"Unknown granularity: {granularity} (expected one of {', '.join(GRANULARITIES)})")
+  dims = list(dimensions or DIMENSIONS)
+  sql = (
+    "SELECT dimension, bucket, count, total, min_score, max_score FROM score_rollups"
+    f" WHERE username = ? AND repo = ? AND granularity = ? AND dimension IN ({','.join('?' * len(dims))})"
+  )
+  params: List[Any] = [username, repo or ACCOUNT_REPO, granularity, *dims]
+  if start is not None:
+    sql += " AND bucket >= ?"
+    params.append(bucket_start(start, granularity))
+  if end is not None:
+    sql += " AND bucket <= ?"
+    params.append(bucket_start(end, granularity))
+  sql += " ORDER BY dimension, bucket"
+  series: Dict[str, List[Dict[str, Any]]] = {d: [] for d in dims}
+  with _connection() as conn:
+    for dim, bucket, count, total, lo, hi in conn.execute(sql, params):
+      series[dim].append({
+        "bucket": bucket,
+        "count": count,
+        "min": lo,
+        "avg": total / count if count else None,
+        "max": hi,
       })
-    return out
-  finally:
-    conn.close()
+  return series
+
+
+def _encode_cursor(value: Any, position: int) -> str:
+  return base64.urlsafe_b64encode(json.dumps([value, position]).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+  try:
+    value, position = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    return value, int(position)
+  except Exception:
+    raise ValueError("Invalid cursor")
+
+
+def get_scan(scan_id: int) -> Optional[Dict[str, Any]]:
+  """Scan metadata (no evaluations), or None if unknown."""
+  with _connection() as conn:
+    row = conn.execute(
+      "SELECT scan_id, username, preset_id, timestamp, repo_count, source FROM scans WHERE scan_id = ?",
+      (scan_id,),
+    ).fetchone()
+  if row is None:
+    return None
+  return dict(zip(("scan_id", "username", "preset_id", "timestamp", "repo_count", "source"), row))
+
+
+def get_scan_token_fingerprint(scan_id: int) -> Optional[str]:
+  """Fingerprint of the token that ran scan_id (None for unknown or older scans)."""
+  with _connection() as conn:
+    row = conn.execute("SELECT token_fp FROM scans WHERE scan_id = ?", (scan_id,)).fetchone()
+  return row[0] if row is not None else None
+
+
+def get_evaluations_page(
+  scan_id: int,
+  sort: str = "position",
+  order: str = "asc",
+  limit: int = 50,
+  cursor: Optional[str] = None,
+  min_scores: Optional[Dict[str, float]] = None,
+  max_scores: Optional[Dict[str, float]] = None,
+) -> Dict[str, Any]:
+  """
+  One page of a scan's evaluations, sorted by a score, the repo name or scan order,
+  with keyset pagination (cursor from the previous page's next_cursor) and optional
+  per-dimension score thresholds. Returns {items, total, next_cursor}.
+  """
+  if sort not in EVALUATION_COLUMNS:
+    raise ValueError(f"Unknown sort key: {sort} (expected one of {', '.join(EVALUATION_COLUMNS)})")
+  if order not in ("asc", "desc"):
+    raise ValueError("order must be 'asc' or 'desc'")
+  col = EVALUATION_COLUMNS[sort]
+  direction = "ASC" if order == "asc" else "DESC"
+  op = ">" if order == "asc" else "<"
+
+  where = ["scan_id = ?"]
+  params: List[Any] = [scan_id]
+  for bound, op_sql in ((min_scores, ">="), (max_scores, "<=")):
+    for dim, value in (bound or {}).items():
+      if dim not in DIMENSIONS:
+        raise ValueError(f"Unknown dimension: {dim}")
+      where.append(f"{EVALUATION_COLUMNS[dim]} {op_sql} ?")
+      params.append(value)
+  filter_sql = " AND ".join(where)
+  filter_params = list(params)
+
+  if cursor:
+    value, position = _decode_cursor(cursor)
+    if col == "position":
+      where.append(f"position {op} ?")
+      params.append(position)
+    else:
+      where.append(f"({col} {op} ? OR ({col} = ? AND position {op} ?))")
+      params.extend([value, value, position])
+  params.append(limit + 1)
+
+  with _connection() as conn:
+    rows = conn.execute(
+      f"SELECT {col}, position, payload FROM scan_evaluations WHERE {' AND '.join(where)}"
+      f" ORDER BY {col} {direction}, position {direction} LIMIT ?",
+      params,
+    ).fetchall()
+    total = conn.execute(
+      f"SELECT COUNT(*) FROM scan_evaluations WHERE {filter_sql}", filter_params
+    ).fetchone()[0]
+
+  next_cursor = None
+  if len(rows) > limit:
+    rows = rows[:limit]
+    next_cursor = _encode_cursor(rows[-1][0], rows[-1][1])
+  return {
+    "items": [json.loads(payload) for _, _, payload in rows],
+    "total": total,
+    "next_cursor": next_cursor,
+  }
+
+
+def get_previous_scan_id(scan_id: int) -> Optional[int]:
+  """The account scan before scan_id with the same username and preset, if any."""
+  with _connection() as conn:
+    row = conn.execute(
+      "SELECT prev.scan_id FROM scans cur JOIN scans prev"
+      " ON prev.username = cur.username AND prev.preset_id = cur.preset_id"
+      " WHERE cur.scan_id = ? AND prev.scan_id < cur.scan_id AND prev.source = 'scan'"
+      " ORDER BY prev.scan_id DESC LIMIT 1",
+      (scan_id,),
+    ).fetchone()
+  return row[0] if row else None
+
+
+_SCORE_COLUMNS = ", ".join(EVALUATION_COLUMNS[dim] for dim in DIMENSIONS)
+
+
+def _score_rows(conn: sqlite3.Connection, scan_id: int) -> Iterator[ScoreRow]:
+  """A scan's score rows in join-key order: repos with an id by id, then the rest by name."""
+  for where, order in (("repo_id IS NOT NULL", "repo_id, full_name"), ("repo_id IS NULL", "full_name")):
+    for repo_id, full_name, *scores in conn.execute(
+      f"SELECT repo_id, full_name, {_SCORE_COLUMNS} FROM scan_evaluations"
+      f" WHERE scan_id = ? AND {where} ORDER BY {order}",
+      (scan_id,),
+    ):
+      yield ScoreRow(row_key(repo_id, full_name), repo_id, full_name, tuple(None if v < 0 else v for v in scores))
+
+
+def diff_scans(
+  before_id: int,
+  after_id: int,
+  threshold: float,
+  dimensions: Optional[Sequence[str]] = None,
+  limit: int = 1000,
+) -> Dict[str, Any]:
+  """
+  Repos added, removed or with scores moved by >= threshold between two stored scans,
+  from a merge join over cursors on the repo id index (payloads are not read).
+  Returns {repos, summary, truncated}; summary counts every repo even past limit.
+  """
+  with _connection() as conn:
+    diff = ScanDiff(_score_rows(conn, before_id), _score_rows(conn, after_id), threshold, dimensions)
+    repos = []
+    total = 0
+    for entry in diff:
+      total += 1
+      if total <= limit:
+        repos.append(entry.to_dict())
+  return {"repos": repos, "summary": diff.summary.to_dict(), "truncated": total > limit}
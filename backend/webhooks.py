@@ -0,0 +1,260 @@
+"""
+GitHub webhook intake for push-driven rescoring (POST /webhooks/github).
+
+Deliveries are verified against the shared secret (X-Hub-Signature-256) and reduced
+to the repo they affect. RescoreQueue coalesces changes per repo: a repo is
+re-evaluated once it has been quiet for `delay` seconds (or `max_delay` after its
+first queued change, so a busy repo is not starved), however many events arrived in
+between. The repository object in the payload supplies the metadata, so a
+re-evaluation costs about one API call (the README, often a free 304 through the
+shared cache). GitHub's redeliveries are recognised by X-GitHub-Delivery and dropped.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from gh_visibility.github_client import RepoSummary
+from gh_visibility.metrics import METRICS
+
+SIGNATURE_HEADER = "X-Hub-Signature-256"
+EVENT_HEADER = "X-GitHub-Event"
+DELIVERY_HEADER = "X-GitHub-Delivery"
+HANDLED_EVENTS = ("push", "repository", "public")
+
+DEFAULT_DELAY = 10.0
+DEFAULT_MAX_DELAY = 60.0
+
+WEBHOOK_DELIVERIES = METRICS.counter(
+  "ghv_webhook_deliveries_total",
+  "GitHub webhook deliveries by event (handled events, ping, other; rejected when the "
+  "signature failed) and outcome (queued, coalesced, ignored, duplicate, rejected).",
+  ["event", "outcome"],
+)
+WEBHOOK_RESCORES = METRICS.counter(
+  "ghv_webhook_rescores_total", "Repos re-evaluated from webhook deliveries, by result.", ["result"]
+)
+
+
+def _event_label(event: str) -> str:
+  """Metric label for a signed delivery's event: handled events and ping, else "other"."""
+  return event if event in HANDLED_EVENTS or event == "ping" else "other"
+
+
+def verify_signature(secret: str, body: bytes, header: Optional[str]) -> bool:
+  """True if header is the sha256 HMAC of body under secret, as GitHub sends it."""
+  if not secret or not header or not header.startswith("sha256="):
+    return False
+  expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+  return hmac.compare_digest(expected, header[len("sha256="):])
+
+
+@dataclass
+class RepoChange:
+  """A repo whose presentation may have changed, with the repository object GitHub sent."""
+
+  owner: str
+  full_name: str
+  repository: Dict[str, Any]
+  events: List[str] = field(default_factory=list)
+  removed: bool = False
+
+
+def parse_delivery(event: str, payload: Mapping[str, Any]) -> Optional[RepoChange]:
+  """
+  The repo change a delivery describes, or None if it cannot change how the repo
+  presents itself (other events, pushes to branches other than the default, branch
+  deletions). A deleted repository gives a change with removed=True.
+  """
+  if event not in HANDLED_EVENTS:
+    return None
+  repository = payload.get("repository")
+  if not isinstance(repository, dict) or not repository.get("full_name"):
+    return None
+  if event == "push":
+    default_ref = f"refs/heads/{repository.get('default_branch') or 'main'}"
+    if payload.get("ref") != default_ref or payload.get("deleted"):
+      return None
+  owner = (repository.get("owner") or {}).get("login") or repository["full_name"].split("/")[0]
+  label = f"{event}.{payload['action']}" if payload.get("action") else event
+  return RepoChange(
+    owner=owner,
+    full_name=repository["full_name"],
+    repository=dict(repository),
+    events=[label],
+    removed=event == "repository" and payload.get("action") == "deleted",
+  )
+
+
+def summary_from_payload(repository: Mapping[str, Any]) -> RepoSummary:
+  """RepoSummary from a webhook repository object (push payloads carry epoch timestamps)."""
+  pushed_at = repository.get("pushed_at")
+  if isinstance(pushed_at, (int, float)):
+    pushed_at = datetime.fromtimestamp(pushed_at, timezone.utc).isoformat().replace("+00:00", "Z")
+  return RepoSummary(
+    id=repository["id"],
+    name=repository["name"],
+    full_name=repository["full_name"],
+    html_url=repository.get("html_url") or f"https://github.com/{repository['full_name']}",
+    private=bool(repository.get("private")),
+    description=repository.get("description"),
+    topics=repository.get("topics") or [],
+    archived=bool(repository.get("archived")),
+    pushed_at=pushed_at,
+    default_branch=repository.get("default_branch") or "main",
+  )
+
+
+class RescoreQueue:
+  """
+  Debounced, coalescing queue of repo changes; see the module docstring.
+  handler(changes) runs on a worker thread with every change that came due together.
+  background=False leaves running due changes to flush() (used by tests).
+  """
+
+  def __init__(
+    self,
+    handler: Callable[[List[RepoChange]], None],
+    delay: float = DEFAULT_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    clock: Callable[[], float] = time.monotonic,
+    background: bool = True,
+    max_deliveries: int = 1024,
+  ) -> None:
+    self.handler = handler
+    self.delay = delay
+    self.max_delay = max(delay, max_delay)
+    self.clock = clock
+    self.background = background
+    self._max_deliveries = max_deliveries
+    # full_name -> (change, first queued at, due at)
+    self._pending: "OrderedDict[str, Tuple[RepoChange, float, float]]" = OrderedDict()
+    self._deliveries: "OrderedDict[str, None]" = OrderedDict()
+    self._cond = threading.Condition()
+    self._worker: Optional[threading.Thread] = None
+    self._stopped = False
+
+  def submit(self, change: RepoChange, delivery_id: Optional[str] = None) -> str:
+    """
+    Queue change; returns "queued", "coalesced", "removed" or "duplicate". A removal
+    replaces any pending change of the repo and reaches the handler like the others.
+    """
+    with self._cond:
+      if delivery_id:
+        if delivery_id in self._deliveries:
+          return "duplicate"
+        self._deliveries[delivery_id] = None
+        while len(self._deliveries) > self._max_deliveries:
+          self._deliveries.popitem(last=False)
+      now = self.clock()
+      current = self._pending.get(change.full_name)
+      if current is None or change.removed:
+        self._pending.pop(change.full_name, None)
+        self._pending[change.full_name] = (change, now, now + self.delay)
+        outcome = "removed" if change.removed else "queued"
+      else:
+        previous, first, _ = current
+        # The latest repository object wins; the event list keeps every trigger.
+        change.events = previous.events + [e for e in change.events if e not in previous.events]
+        self._pending[change.full_name] = (change, first, min(now + self.delay, first + self.max_delay))
+        outcome = "coalesced"
+      self._cond.notify()
+    if self.background:
+      self._ensure_worker()
+    return outcome
+
+  def pending(self) -> int:
+    with self._cond:
+      return len(self._pending)
+
+  def flush(self, force: bool = False) -> int:
+    """Run the handler on changes that are due (all of them with force); returns how many."""
+    due = self._take_due(force)
+    if due:
+      self._run(due)
+    return len(due)
+
+  def stop(self) -> None:
+    with self._cond:
+      self._stopped = True
+      self._cond.notify()
+
+  def _take_due(self, force: bool) -> List[RepoChange]:
+    with self._cond:
+      now = self.clock()
+      names = [n for n, (_, _, due) in self._pending.items() if force or due <= now]
+      return [self._pending.pop(n)[0] for n in names]
+
+  def _run(self, changes: List[RepoChange]) -> None:
+    try:
+      self.handler(changes)
+    except Exception as e:
+      WEBHOOK_RESCORES.inc(len(changes), result="failed")
+      sys.stderr.write(f"webhooks: rescoring {len(changes)} repo(s) failed: {e}\n")
+
+  def _ensure_worker(self) -> None:
+    with self._cond:
+      if self._worker is not None or self._stopped:
+        return
+      self._worker = threading.Thread(target=self._loop, name="webhook-rescore", daemon=True)
+      self._worker.start()
+
+  def _loop(self) -> None:
+    while True:
+      with self._cond:
+        while not self._stopped:
+          if self._pending:
+            wait = min(due for _, _, due in self._pending.values()) - self.clock()
+            if wait <= 0:
+              break
+            self._cond.wait(wait)
+          else:
+            self._cond.wait()
+        if self._stopped:
+          return
+      self.flush()
+
+
+def handle_delivery(
+  headers: Mapping[str, str],
+  body: bytes,
+  secret: str,
+  queue: RescoreQueue,
+) -> Tuple[int, Dict[str, Any]]:
+  """
+  Verify and route one delivery. Returns (HTTP status, JSON body): 401 for a bad or
+  missing signature, 400 for a malformed payload, 202 when a re-evaluation (or a
+  deleted repo's removal) was queued or merged into a pending one, 200 for pings, duplicates and events that are ignored.
+  """
+  # Headers of an unsigned delivery are attacker-chosen: none of them become labels.
+  if not verify_signature(secret, body, headers.get(SIGNATURE_HEADER)):
+    WEBHOOK_DELIVERIES.inc(event="rejected", outcome="rejected")
+    return 401, {"detail": "Invalid or missing webhook signature"}
+  event = headers.get(EVENT_HEADER) or ""
+  label = _event_label(event)
+  try:
+    payload = json.loads(body)
+  except ValueError:
+    WEBHOOK_DELIVERIES.inc(event=label, outcome="rejected")
+    return 400, {"detail": "Webhook body is not valid JSON"}
+  if not isinstance(payload, dict):
+    return 400, {"detail": "Webhook body must be a JSON object"}
+  if event == "ping":
+    return 200, {"status": "pong", "hookId": payload.get("hook_id")}
+  change = parse_delivery(event, payload)
+  if change is None:
+    WEBHOOK_DELIVERIES.inc(event=label, outcome="ignored")
+    return 200, {"status": "ignored", "event": event}
+  outcome = queue.submit(change, delivery_id=headers.get(DELIVERY_HEADER))
+  WEBHOOK_DELIVERIES.inc(event=label, outcome=outcome)
+  status = 202 if outcome in ("queued", "coalesced", "removed") else 200
+  return status, {"status": outcome, "repo": change.full_name}
@@ -0,0 +1,242 @@
+"""
+Throughput and peak-memory benchmarks for the scoring pipeline on synthetic corpora.
+
+  python benchmarks/bench.py                         # small + medium, compare to baseline.json
+  python benchmarks/bench.py --size large            # 100k repos
+  python benchmarks/bench.py --update-baseline       # record the current numbers
+
+Stages: normalize (Analyzer._normalize), score (Analyzer._score), suggestions
+(generate_suggestions), duplicates, topics (account topic recommendations), to_dict (RepoEvaluation.to_dict), diff
+(scan-to-scan merge join), render_table and render_markdown. Throughput is reported in repos/s and compared with the baseline
+after scaling by a fixed pure-Python calibration loop timed alongside each size, so
+a baseline recorded on one machine remains usable on another. Exit status is 1 when
+any stage is slower, or uses more memory, than the baseline allows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import io
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCH_DIR.parent
+sys.path.insert(0, str(REPO_ROOT / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from corpus import REFERENCE_NOW, SIZES, Corpus  # noqa: E402
+
+from gh_visibility.analyzer import Analyzer  # noqa: E402
+from gh_visibility.diff import ScanDiff, row_from_evaluation  # noqa: E402
+from gh_visibility.duplicates import find_duplicate_groups, readme_signature  # noqa: E402
+from gh_visibility.models import RepoEvaluation  # noqa: E402
+from gh_visibility.output import render_markdown  # noqa: E402
+from gh_visibility.presets import load_preset  # noqa: E402
+from gh_visibility.suggestions import generate_suggestions  # noqa: E402
+
+STAGES = ["normalize", "score", "suggestions", "duplicates", "topics", "to_dict", "diff", "render_table", "render_markdown"]
+BASELINE_PATH = BENCH_DIR / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+CHUNK = 1_000
+# Repeat tiny corpora so each timing covers enough work to be stable.
+MIN_REPOS_PER_ROUND = 2_000
+
+
+def calibrate() -> float:
+  """Seconds for a fixed pure-Python workload (best of 5); used to scale baselines."""
+  best = float("inf")
+  for _ in range(5):
+    start = time.perf_counter()
+    total = 0
+    for i in range(200_000):
+      total += len(str(i).split("0"))
+    best = min(best, time.perf_counter() - start)
+  return best
+
+
+class _Meter:
+  """Accumulates time, or tracemalloc peak above the starting level, per stage."""
+
+  def __init__(self, memory: bool) -> None:
+    self.memory = memory
+    self.seconds = {s: 0.0 for s in STAGES}
+    self.peak = {s: 0 for s in STAGES}
+
+  def run(self, stage: str, fn: Callable[[], Any]) -> Any:
+    if self.memory:
+      tracemalloc.reset_peak()
+      base, _ = tracemalloc.get_traced_memory()
+      result = fn()
+      _, peak = tracemalloc.get_traced_memory()
+      self.peak[stage] = max(self.peak[stage], peak - base)
+      return result
+    start = time.perf_counter()
+    result = fn()
+    self.seconds[stage] += time.perf_counter() - start
+    return result
+
+
+def _diff(dicts: List[Dict[str, Any]]) -> int:
+  """Diff the corpus against itself listed in reverse minus one repo (rows are sorted on both sides)."""
+  before = sorted((row_from_evaluation(e) for e in dicts), key=lambda r: r.key)
+  after = sorted((row_from_evaluation(e) for e in dicts[:0:-1]), key=lambda r: r.key)
+  return sum(1 for _ in ScanDiff(before, after))
+
+
+def _pipeline(corpus: Corpus, analyzer: Analyzer, preset: Dict[str, Any], meter: _Meter) -> None:
+  dicts: List[Dict[str, Any]] = []
+  signatures: List[Optional[bytes]] = []
+  all_evaluations: List[RepoEvaluation] = []
+  for chunk in corpus.chunks(CHUNK):
+    analyses = meter.run("normalize", lambda: [
+      analyzer._normalize(repo, readme, now=REFERENCE_NOW) for repo, readme in chunk
+    ])
+    scores = meter.run("score", lambda: [
+      analyzer._score(repo, analysis) for (repo, _), analysis in zip(chunk, analyses)
+    ])
+    suggestions = meter.run("suggestions", lambda: [
+      generate_suggestions(repo, analysis, sc, preset)
+      for (repo, _), analysis, sc in zip(chunk, analyses, scores)
+    ])
+    signatures.extend(meter.run("duplicates", lambda: [
+      readme_signature(readme) if readme else None for _, readme in chunk
+    ]))
+    evaluations = [
+      RepoEvaluation(repo=repo, analysis=analysis, scores=sc, suggestions=sg)
+      for (repo, _), analysis, sc, sg in zip(chunk, analyses, scores, suggestions)
+    ]
+    all_evaluations.extend(evaluations)
+    dicts.extend(meter.run("to_dict", lambda: [e.to_dict() for e in evaluations]))
+  meter.run("duplicates", lambda: find_duplicate_groups(signatures))
+  meter.run("topics", lambda: analyzer._apply_topic_recommendations(all_evaluations))
+  meter.run("diff", lambda: _diff(dicts))
+  meter.run("render_table", lambda: analyzer.render_table(dicts, io.StringIO(), show_suggestions=True))
+  meter.run("render_markdown", lambda: render_markdown(dicts, "bench", preset.get("id", "")))
+
+
+def run_size(size: str, seed: int, rounds: int, memory: bool) -> Dict[str, Dict[str, float]]:
+  n = SIZES[size]
+  corpus = Corpus(n, seed=seed)
+  preset = load_preset("indie-hacker")
+  analyzer = Analyzer(preset=preset)
+  repeats = max(1, MIN_REPOS_PER_ROUND // n)
+
+  best = {s: float("inf") for s in STAGES}
+  for _ in range(rounds):
+    meter = _Meter(memory=False)
+    gc.collect()
+    for _ in range(repeats):
+      _pipeline(corpus, analyzer, preset, meter)
+    for s in STAGES:
+      best[s] = min(best[s], meter.seconds[s] / repeats)
+
+  results: Dict[str, Dict[str, float]] = {
+    s: {"reposPerSec": round(n / best[s], 1) if best[s] > 0 else 0.0} for s in STAGES
+  }
+  if memory:
+    meter = _Meter(memory=True)
+    gc.collect()
+    tracemalloc.start()
+    try:
+      _pipeline(corpus, analyzer, preset, meter)
+    finally:
+      tracemalloc.stop()
+    for s in STAGES:
+      results[s]["peakKiB"] = round(meter.peak[s] / 1024, 1)
+  return results
+
+
+def compare(
+  current: Dict[str, Any],
+  baseline: Dict[str, Any],
+  tolerance: float,
+) -> List[str]:
+  """Regressions of current vs baseline beyond tolerance (fraction, e.g. 0.25)."""
+  problems: List[str] = []
+  for size, now_size in current["results"].items():
+    base_size = baseline.get("results", {}).get(size)
+    if not base_size:
+      continue
+    # A faster machine (smaller calibration time) is expected to have higher throughput.
+    speed = base_size["calibrationSeconds"] / now_size["calibrationSeconds"]
+    for stage, now in now_size["stages"].items():
+      base = base_size["stages"].get(stage)
+      if not base:
+        continue
+      expected = base["reposPerSec"] * speed * (1 - tolerance)
+      if now["reposPerSec"] < expected:
+        problems.append(f"{size}/{stage}: {now['reposPerSec']:.0f} repos/s, expected >= {expected:.0f}")
+      if "peakKiB" in now and "peakKiB" in base:
+        # Small absolute slack so tiny stages do not flap on allocator noise.
+        allowed = base["peakKiB"] * (1 + tolerance) + 64
+        if now["peakKiB"] > allowed:
+          problems.append(f"{size}/{stage}: peak {now['peakKiB']:.0f} KiB, allowed <= {allowed:.0f}")
+  return problems
+
+
+def _print_results(report: Dict[str, Any], stream=sys.stdout) -> None:
+  for size, result in report["results"].items():
+    calibration_ms = result["calibrationSeconds"] * 1000
+    stream.write(f"\n{size} ({SIZES[size]} repos, calibration {calibration_ms:.1f} ms)\n")
+    stream.write(f"  {'stage':<16} {'repos/s':>12} {'peak KiB':>10}\n")
+    for stage in STAGES:
+      r = result["stages"][stage]
+      peak = f"{r['peakKiB']:>10.1f}" if "peakKiB" in r else f"{'-':>10}"
+      stream.write(f"  {stage:<16} {r['reposPerSec']:>12.1f} {peak}\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description="Benchmark the gh-visibility scoring pipeline.")
+  parser.add_argument("--size", nargs="+", choices=list(SIZES), default=["small", "medium"])
+  parser.add_argument("--seed", type=int, default=42)
+  parser.add_argument("--rounds", type=int, default=3, help="Timing rounds; the best is reported.")
+  parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass.")
+  parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+  parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+  parser.add_argument("--update-baseline", action="store_true", help="Write results to --baseline.")
+  parser.add_argument("--json", dest="json_out", type=Path, help="Also write results as JSON here.")
+  args = parser.parse_args(argv)
+
+  report: Dict[str, Any] = {"seed": args.seed, "python": sys.version.split()[0], "results": {}}
+  for size in args.size:
+    report["results"][size] = {
+      "calibrationSeconds": calibrate(),
+      "stages": run_size(size, args.seed, args.rounds, memory=not args.no_memory),
+    }
+  _print_results(report)
+
+  if args.json_out:
+    args.json_out.write_text(json.dumps(report, indent=2) + "\n")
+
+  if args.update_baseline:
+    existing: Dict[str, Any] = {}
+    if args.baseline.exists():
+      existing = json.loads(args.baseline.read_text())
+    # Keep sizes not rerun now (each carries its own calibration).
+    for size, result in existing.get("results", {}).items():
+      report["results"].setdefault(size, result)
+    args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nBaseline written to {args.baseline}")
+    return 0
+
+  if not args.baseline.exists():
+    print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one.")
+    return 0
+  problems = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+  if problems:
+    print(f"\nRegressions (tolerance {args.tolerance:.0%}):")
+    for p in problems:
+      print(f"  {p}")
+    return 1
+  print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Seeded synthetic corpora for benchmarks.
+
+Repo metadata is generated up front (it is small); README markdown is generated on
+demand from (seed, index) so a 100k-repo corpus does not hold every README in memory.
+README sizes follow a log-normal distribution (median ~2.5 KB, long tail clipped at
+150 KB) and roughly 8% of repos have no README, which is close to what real accounts
+look like.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+SIZES = {"small": 10, "medium": 1_000, "large": 100_000}
+
+NO_README_RATE = 0.08
+README_MEDIAN_BYTES = 2_500
+README_SIGMA = 1.0
+README_MAX_BYTES = 150_000
+
+# Fixed reference time so recency scores do not drift between runs.
+REFERENCE_NOW = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+_WORDS = (
+  "the a to and of for with your this project tool library cli api python rust go "
+  "typescript react fast simple small lightweight config data build test deploy run "
+  "install usage example docs server client plugin extension github repo scan score "
+  "readme topic metadata release version support platform linux macos windows user "
+  "developer team open source license contributing issue feature bug fix performance"
+).split()
+_SECTIONS = [
+  "Installation", "Usage", "Features", "Quick Start", "Configuration", "Examples",
+  "API", "Contributing", "License", "FAQ", "Roadmap", "Development", "Testing",
+  "Changelog", "Acknowledgements", "Requirements",
+]
+_TOPICS = [
+  "python", "cli", "developer-tools", "github", "automation", "api", "react", "rust",
+  "typescript", "docs", "seo", "devops", "testing", "machine-learning", "web", "linux",
+]
+
+
+def _rng(seed: int, index: int) -> random.Random:
+  return random.Random(seed * 1_000_003 + index)
+
+
+def make_repo(seed: int, index: int) -> Dict[str, Any]:
+  """Repo dict in the shape produced by analyzer.repo_from_summary."""
+  rng = _rng(seed, index)
+  owner = f"user{index % 97}"
+  name = "-".join(rng.choice(_WORDS) for _ in range(rng.randint(1, 4)))[:60] + f"-{index}"
+  desc_words = rng.choice([0, 0, 4, 8, 12, 20, 30, 50])
+  pushed = REFERENCE_NOW - timedelta(days=int(rng.expovariate(1 / 200)))
+  return {
+    "id": index + 1,
+    "name": name,
+    "fullName": f"{owner}/{name}",
+    "htmlUrl": f"https://github.com/{owner}/{name}",
+    "private": False,
+    "description": " ".join(rng.choice(_WORDS) for _ in range(desc_words)) or None,
+    "topics": rng.sample(_TOPICS, rng.randint(0, 8)),
+    "archived": rng.random() < 0.05,
+    "pushedAt": pushed.isoformat().replace("+00:00", "Z"),
+    "defaultBranch": "main",
+  }
+
+
+def make_readme(seed: int, index: int) -> Optional[str]:
+  """Markdown README for repo index, or None (repo has no README)."""
+  rng = _rng(seed, ~index)
+  if rng.random() < NO_README_RATE:
+    return None
+  target = min(
+    README_MAX_BYTES,
+    int(rng.lognormvariate(math.log(README_MEDIAN_BYTES), README_SIGMA)),
+  )
+  parts: List[str] = [f"# project-{index}", ""]
+  if rng.random() < 0.5:
+    parts += ["[![CI](https://img.shields.io/badge/ci-passing-green)](#) [![License](https://img.shields.io/badge/license-MIT-blue)](#)", ""]
+  size = sum(len(p) + 1 for p in parts)
+  sections = rng.sample(_SECTIONS, rng.randint(1, len(_SECTIONS)))
+  while size < target:
+    if sections and rng.random() < 0.3:
+      block = [f"## {sections.pop()}", ""]
+    elif rng.random() < 0.15:
+      block = ["```bash", f"pip install project-{index}", "project --help", "```", ""]
+    elif rng.random() < 0.1:
+      block = [f"- {rng.choice(_WORDS)} {rng.choice(_WORDS)}" for _ in range(rng.randint(2, 6))] + [""]
+    else:
+      block = [" ".join(rng.choice(_WORDS) for _ in range(rng.randint(15, 60))), ""]
+    parts += block
+    size += sum(len(p) + 1 for p in block)
+  return "\n".join(parts)
+
+
+class Corpus:
+  """n repos generated deterministically from seed."""
+
+  def __init__(self, n: int, seed: int = 42) -> None:
+    self.n = n
+    self.seed = seed
+    self.repos = [make_repo(seed, i) for i in range(n)]
+
+  def readme(self, index: int) -> Optional[str]:
+    return make_readme(self.seed, index)
+
+  def chunks(self, size: int = 1_000) -> Iterator[List[Tuple[Dict[str, Any], Optional[str]]]]:
+    """(repo, readme) pairs in chunks, so READMEs are only held one chunk at a time."""
+    for start in range(0, self.n, size):
+      yield [(self.repos[i], self.readme(i)) for i in range(start, min(self.n, start + size))]
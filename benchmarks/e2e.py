@@ -0,0 +1,107 @@
+"""
+End-to-end scan benchmark against the local fake GitHub API (fake_github.py).
+
+Runs Analyzer.evaluate_account over HTTP twice with a shared ResponseCache: a cold
+pass (every request goes to the server) and a warm pass with the cache TTL at zero,
+so every request is revalidated with If-None-Match and answered 304. Reports wall
+time, repos/s and what the server saw. Injected faults (--error-rate,
+--secondary-limit-rate) show how a scan behaves when GitHub misbehaves, and a small
+--rate-limit with --tokens N shows a token pool multiplying the request budget.
+
+  python benchmarks/e2e.py --repos 500 --latency-ms 40 --jitter-ms 10
+  python benchmarks/e2e.py --repos 500 --rate-limit 300 --tokens 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+sys.path.insert(0, str(BENCH_DIR))
+
+from fake_github import FakeGitHubServer, FaultConfig  # noqa: E402
+
+from gh_visibility.analyzer import Analyzer  # noqa: E402
+from gh_visibility.github_client import GitHubClient  # noqa: E402
+from gh_visibility.http_cache import ResponseCache  # noqa: E402
+from gh_visibility.presets import load_preset  # noqa: E402
+
+
+def _pass(
+  server: FakeGitHubServer,
+  user: str,
+  cache: ResponseCache,
+  analyzer: Analyzer,
+  tokens: List[str],
+) -> Dict[str, Any]:
+  before = asdict(server.stats)
+  client = GitHubClient.from_tokens(tokens, api_root=server.url, cache=cache)
+  start = time.perf_counter()
+  error: Optional[str] = None
+  evaluations: List[Dict[str, Any]] = []
+  try:
+    evaluations = analyzer.evaluate_account(client, user)
+  except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+  seconds = time.perf_counter() - start
+  after = asdict(server.stats)
+  return {
+    "seconds": seconds,
+    "repos": len(evaluations),
+    "reposPerSec": len(evaluations) / seconds if seconds > 0 else 0.0,
+    "requests": after["requests"] - before["requests"],
+    "notModified": after["not_modified"] - before["not_modified"],
+    "errors": after["errors"] - before["errors"],
+    "secondaryLimited": after["secondary_limited"] - before["secondary_limited"],
+    "rateLimited": after["rate_limited"] - before["rate_limited"],
+    "error": error,
+  }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+  parser = argparse.ArgumentParser(description="End-to-end scan benchmark against a fake GitHub API.")
+  parser.add_argument("--repos", type=int, default=200)
+  parser.add_argument("--latency-ms", type=float, default=5.0)
+  parser.add_argument("--jitter-ms", type=float, default=0.0)
+  parser.add_argument("--error-rate", type=float, default=0.0)
+  parser.add_argument("--secondary-limit-rate", type=float, default=0.0)
+  parser.add_argument("--rate-limit", type=int, default=5000, help="Requests per token per window.")
+  parser.add_argument("--tokens", type=int, default=1, help="Size of the token pool.")
+  parser.add_argument("--seed", type=int, default=42)
+  args = parser.parse_args(argv)
+
+  faults = FaultConfig(
+    latency=args.latency_ms / 1000,
+    jitter=args.jitter_ms / 1000,
+    error_rate=args.error_rate,
+    secondary_limit_rate=args.secondary_limit_rate,
+    rate_limit=args.rate_limit,
+    seed=args.seed,
+  )
+  user = f"gen-{args.repos}"
+  tokens = [f"fake-token-{i}" for i in range(1, args.tokens + 1)]
+  analyzer = Analyzer(preset=load_preset("indie-hacker"))
+  cache = ResponseCache(ttl=0)
+  failed = False
+  with FakeGitHubServer(faults=faults) as server:
+    for label in ("cold", "warm (revalidated)"):
+      r = _pass(server, user, cache, analyzer, tokens)
+      print(
+        f"{label:<20} {r['repos']:>6} repos in {r['seconds']:7.2f}s  {r['reposPerSec']:8.1f} repos/s  "
+        f"requests {r['requests']} (304 {r['notModified']}, 5xx {r['errors']}, "
+        f"secondary 403 {r['secondaryLimited']}, rate-limited {r['rateLimited']})"
+      )
+      if r["error"]:
+        print(f"{'':<20} scan failed: {r['error']}")
+        failed = True
+  return 1 if failed else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,454 @@
+"""
+Local stand-in for the parts of the GitHub REST API used by GitHubClient.
+
+Serves generated accounts over HTTP so end-to-end runs (listing, README fetches,
+caching, concurrency, retries) are deterministic and work offline:
+
+  GET /users/{user}/repos?per_page=&page=   paginated, with a Link header
+  GET /repos/{owner}/{repo}                 one repo's metadata
+  GET /repos/{owner}/{repo}/readme          raw markdown when the Accept header asks
+                                            for it (as GitHub, ignoring ?accept=),
+                                            otherwise GitHub's base64 JSON envelope
+  GET /users/{user}/events, /orgs/{org}/events
+                                            newest first, with X-Poll-Interval; fed
+                                            by add_event() (update_repo() edits repos)
+
+Every 200 carries a strong ETag; a matching If-None-Match gets 304 and, like GitHub,
+does not count against the rate limit. X-RateLimit-* headers come from a fixed-window
+budget per token (Authorization header), as on GitHub, and an exhausted budget gets a
+primary-limit 403; revoke_token() makes a token get 401 Bad credentials. Latency, jitter, 5xx errors
+and secondary-limit 403s (with Retry-After) can be injected. Injected faults are drawn
+from (seed, request path, attempt number), so a run sees the same faults however its
+threads are interleaved.
+
+Account sizes: users named in FakeGitHubServer(accounts={...}) have that many repos;
+any user named "gen-<N>" has N repos; other users get 404.
+
+  python benchmarks/fake_github.py --port 8765 --latency-ms 40 --jitter-ms 20
+  GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_TOKEN=x gh-visibility scan --user gen-500
+  python benchmarks/e2e.py --repos 500 --latency-ms 40   # server started in-process
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from corpus import make_readme, make_repo  # noqa: E402
+
+MAX_PER_PAGE = 100
+
+
+@dataclass
+class FaultConfig:
+  """Latency and fault injection. Rates are probabilities per request (0..1)."""
+
+  latency: float = 0.0
+  jitter: float = 0.0
+  error_rate: float = 0.0
+  secondary_limit_rate: float = 0.0
+  retry_after: int = 1
+  rate_limit: int = 5000
+  rate_limit_window: float = 3600.0
+  seed: int = 42
+
+
+@dataclass
+class ServerStats:
+  requests: int = 0
+  not_modified: int = 0
+  errors: int = 0
+  secondary_limited: int = 0
+  rate_limited: int = 0
+  unauthorized: int = 0
+  by_endpoint: Dict[str, int] = field(default_factory=dict)
+
+
+class _Account:
+  """Repos for one user, built lazily and cached (metadata only; READMEs on demand)."""
+
+  def __init__(self, user: str, n: int, seed: int) -> None:
+    self.user = user
+    self.n = n
+    self.seed = seed
+    self._repos: Optional[list] = None
+    self._by_name: Dict[str, int] = {}
+    self.events: List[Dict[str, Any]] = []
+
+  def repos(self) -> list:
+    if self._repos is None:
+      repos = []
+      for i in range(self.n):
+        r = make_repo(self.seed, i)
+        name = r["name"]
+        self._by_name[name] = i
+        repos.append({
+          "id": r["id"],
+          "name": name,
+          "full_name": f"{self.user}/{name}",
+          "html_url": f"https://github.com/{self.user}/{name}",
+          "private": False,
+          "description": r["description"],
+          "topics": r["topics"],
+          "archived": r["archived"],
+          "pushed_at": r["pushedAt"],
+          "default_branch": r["defaultBranch"],
+        })
+      self._repos = repos
+    return self._repos
+
+  def repo(self, name: str) -> Optional[Dict[str, Any]]:
+    self.repos()
+    index = self._by_name.get(name)
+    return None if index is None else self._repos[index]
+
+  def readme(self, name: str) -> Optional[str]:
+    self.repos()
+    index = self._by_name.get(name)
+    return None if index is None else make_readme(self.seed, index)
+
+
+class FakeGitHubServer:
+  """Threaded fake GitHub API on 127.0.0.1. Use as a context manager or start()/stop()."""
+
+  def __init__(
+    self,
+    accounts: Optional[Dict[str, int]] = None,
+    faults: Optional[FaultConfig] = None,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    poll_interval: int = 60,
+  ) -> None:
+    self.faults = faults or FaultConfig()
+    self.poll_interval = poll_interval
+    self._next_event_id = 1
+    self.stats = ServerStats()
+    self._account_sizes = dict(accounts or {})
+    self._accounts: Dict[str, _Account] = {}
+    self._attempts: Dict[str, int] = {}
+    self._windows: Dict[str, Tuple[float, int]] = {}  # auth header -> (start, used)
+    self._revoked: set = set()
+    self._lock = threading.Lock()
+    self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+    self._httpd.daemon_threads = True
+    self._thread: Optional[threading.Thread] = None
+
+  @property
+  def url(self) -> str:
+    host, port = self._httpd.server_address[:2]
+    return f"http://{host}:{port}"
+
+  def start(self) -> "FakeGitHubServer":
+    self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-github", daemon=True)
+    self._thread.start()
+    return self
+
+  def stop(self) -> None:
+    self._httpd.shutdown()
+    self._httpd.server_close()
+    if self._thread is not None:
+      self._thread.join()
+      self._thread = None
+
+  def __enter__(self) -> "FakeGitHubServer":
+    return self.start()
+
+  def __exit__(self, *exc: Any) -> None:
+    self.stop()
+
+  def account(self, user: str) -> Optional[_Account]:
+    with self._lock:
+      acct = self._accounts.get(user)
+      if acct is None:
+        n = self._account_sizes.get(user)
+        if n is None and user.startswith("gen-") and user[4:].isdigit():
+          n = int(user[4:])
+        if n is None:
+          return None
+        acct = self._accounts[user] = _Account(user, n, self.faults.seed)
+      return acct
+
+  def add_event(
+    self,
+    user: str,
+    event_type: str,
+    repo_name: str,
+    payload: Optional[Dict[str, Any]] = None,
+  ) -> Dict[str, Any]:
+    """Append an event (e.g. "PushEvent") to user's feed, as served by /users/{user}/events."""
+    acct = self.account(user)
+    if acct is None:
+      raise KeyError(user)
+    with self._lock:
+      event = {
+        "id": str(self._next_event_id),
+        "type": event_type,
+        "actor": {"login": user},
+        "repo": {"name": f"{user}/{repo_name}"},
+        "payload": payload or {},
+        "public": True,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+      }
+      self._next_event_id += 1
+      acct.events.append(event)
+    return event
+
+  def update_repo(self, user: str, repo_name: str, **fields: Any) -> None:
+    """Change a served repo's metadata (e.g. description=..., topics=[...])."""
+    acct = self.account(user)
+    repo = acct.repo(repo_name) if acct is not None else None
+    if repo is None:
+      raise KeyError(f"{user}/{repo_name}")
+    with self._lock:
+      repo.update(fields)
+
+  def _draw(self, request_key: str) -> random.Random:
+    """RNG for this attempt at request_key: deterministic regardless of thread order."""
+    with self._lock:
+      attempt = self._attempts.get(request_key, 0)
+      self._attempts[request_key] = attempt + 1
+    return random.Random(f"{self.faults.seed}:{request_key}:{attempt}")
+
+  def revoke_token(self, token: str) -> None:
+    """Answer later requests made with token with 401 Bad credentials."""
+    with self._lock:
+      self._revoked.add(f"token {token}")
+
+  def _take_rate_limit(self, auth: str) -> Tuple[bool, int, int]:
+    """Spend one request from auth's window. Returns (allowed, remaining, reset epoch)."""
+    f = self.faults
+    with self._lock:
+      now = time.monotonic()
+      start, used = self._windows.get(auth, (now, 0))
+      if now - start >= f.rate_limit_window:
+        start, used = now, 0
+      reset = int(time.time() + f.rate_limit_window - (now - start))
+      if used >= f.rate_limit:
+        self._windows[auth] = (start, used)
+        return False, 0, reset
+      self._windows[auth] = (start, used + 1)
+      return True, f.rate_limit - used - 1, reset
+
+  def _count(self, endpoint: str, **flags: bool) -> None:
+    with self._lock:
+      self.stats.requests += 1
+      self.stats.by_endpoint[endpoint] = self.stats.by_endpoint.get(endpoint, 0) + 1
+      for name, hit in flags.items():
+        if hit:
+          setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+
+def _etag(body: bytes) -> str:
+  return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _make_handler(server: FakeGitHubServer) -> type:
+  class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Keep-alive responses are small; avoid Nagle + delayed-ACK stalls (~40 ms each).
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: Any) -> None:
+      pass
+
+    def _send(self, status: int, body: bytes, headers: Dict[str, str]) -> None:
+      self.send_response(status)
+      for k, v in headers.items():
+        self.send_header(k, v)
+      self.send_header("Content-Length", str(len(body)))
+      self.end_headers()
+      if body and self.command != "HEAD":
+        self.wfile.write(body)
+
+    def _json(self, status: int, data: Any, headers: Dict[str, str]) -> None:
+      headers = {"Content-Type": "application/json; charset=utf-8", **headers}
+      self._send(status, json.dumps(data).encode("utf-8"), headers)
+
+    def do_GET(self) -> None:
+      f = server.faults
+      split = urlsplit(self.path)
+      query = parse_qs(split.query)
+      parts = [p for p in split.path.split("/") if p]
+      endpoint = "other"
+      if len(parts) == 3 and parts[0] == "users" and parts[2] == "repos":
+        endpoint = "list_repos"
+      elif len(parts) == 4 and parts[0] == "repos" and parts[3] == "readme":
+        endpoint = "readme"
+      elif len(parts) == 3 and parts[0] in ("users", "orgs") and parts[2] == "events":
+        endpoint = "events"
+      elif len(parts) == 3 and parts[0] == "repos":
+        endpoint = "repo"
+
+      auth = self.headers.get("Authorization") or ""
+      with server._lock:
+        revoked = auth in server._revoked
+      if revoked:
+        server._count(endpoint, unauthorized=True)
+        self._json(401, {"message": "Bad credentials"}, {})
+        return
+
+      rng = server._draw(self.path)
+      delay = f.latency + (rng.uniform(-f.jitter, f.jitter) if f.jitter else 0.0)
+      if delay > 0:
+        time.sleep(delay)
+
+      if rng.random() < f.secondary_limit_rate:
+        server._count(endpoint, secondary_limited=True)
+        self._json(
+          403,
+          {"message": "You have exceeded a secondary rate limit. Please wait a few minutes before you try again."},
+          {"Retry-After": str(f.retry_after)},
+        )
+        return
+      if rng.random() < f.error_rate:
+        server._count(endpoint, errors=True)
+        self._json(502, {"message": "Server Error"}, {})
+        return
+
+      status, body, headers = self._route(endpoint, parts, query)
+      etag = _etag(body) if status == 200 else None
+      if etag and self.headers.get("If-None-Match") == etag:
+        # Conditional hits are free on GitHub: no rate-limit cost.
+        server._count(endpoint, not_modified=True)
+        self._send(304, b"", {"ETag": etag})
+        return
+
+      allowed, remaining, reset = server._take_rate_limit(auth)
+      limit_headers = {
+        "X-RateLimit-Limit": str(f.rate_limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Used": str(f.rate_limit - remaining),
+        "X-RateLimit-Resource": "core",
+      }
+      if not allowed:
+        server._count(endpoint, rate_limited=True)
+        self._json(403, {"message": "API rate limit exceeded"}, limit_headers)
+        return
+      server._count(endpoint)
+      if etag:
+        headers["ETag"] = etag
+      self._send(status, body, {**headers, **limit_headers})
+
+    def _route(self, endpoint: str, parts: list, query: Dict[str, list]) -> Tuple[int, bytes, Dict[str, str]]:
+      json_type = {"Content-Type": "application/json; charset=utf-8"}
+      not_found = (404, json.dumps({"message": "Not Found"}).encode(), json_type)
+
+      if endpoint == "list_repos":
+        acct = server.account(parts[1])
+        if acct is None:
+          return not_found
+        per_page = min(MAX_PER_PAGE, max(1, int((query.get("per_page") or ["30"])[0])))
+        page = max(1, int((query.get("page") or ["1"])[0]))
+        repos = acct.repos()
+        items = repos[(page - 1) * per_page: page * per_page]
+        headers = dict(json_type)
+        last = max(1, -(-len(repos) // per_page))
+        links = []
+        base = f"{server.url}/users/{acct.user}/repos?per_page={per_page}"
+        if page < last:
+          links.append(f'<{base}&page={page + 1}>; rel="next"')
+          links.append(f'<{base}&page={last}>; rel="last"')
+        if links:
+          headers["Link"] = ", ".join(links)
+        return 200, json.dumps(items).encode(), headers
+
+      if endpoint == "repo":
+        acct = server.account(parts[1])
+        repo = acct.repo(parts[2]) if acct is not None else None
+        return (200, json.dumps(repo).encode(), json_type) if repo else not_found
+
+      if endpoint == "events":
+        acct = server.account(parts[1])
+        if acct is None:
+          return not_found
+        per_page = min(MAX_PER_PAGE, max(1, int((query.get("per_page") or ["30"])[0])))
+        page = max(1, int((query.get("page") or ["1"])[0]))
+        newest_first = acct.events[::-1][:300]
+        items = newest_first[(page - 1) * per_page: page * per_page]
+        headers = dict(json_type)
+        headers["X-Poll-Interval"] = str(server.poll_interval)
+        return 200, json.dumps(items).encode(), headers
+
+      if endpoint == "readme":
+        acct = server.account(parts[1])
+        text = acct.readme(parts[2]) if acct is not None else None
+        if text is None:
+          return not_found
+        raw = text.encode("utf-8")
+        if "raw" in (self.headers.get("Accept") or ""):
+          return 200, raw, {"Content-Type": "text/plain; charset=utf-8"}
+        envelope = {
+          "type": "file",
+          "encoding": "base64",
+          "name": "README.md",
+          "path": "README.md",
+          "size": len(raw),
+          "content": base64.b64encode(raw).decode("ascii"),
+        }
+        return 200, json.dumps(envelope).encode(), json_type
+
+      return not_found
+
+  return Handler
+
+
+def main() -> int:
+  parser = argparse.ArgumentParser(description="Serve a fake GitHub API for offline end-to-end runs.")
+  parser.add_argument("--host", default="127.0.0.1")
+  parser.add_argument("--port", type=int, default=8765)
+  parser.add_argument("--account", action="append", default=[], metavar="USER=N",
+                      help="Serve USER with N repos (repeatable). gen-<N> users always work.")
+  parser.add_argument("--latency-ms", type=float, default=0.0)
+  parser.add_argument("--jitter-ms", type=float, default=0.0)
+  parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 502.")
+  parser.add_argument("--secondary-limit-rate", type=float, default=0.0,
+                      help="Fraction of requests answered with a secondary-limit 403 and Retry-After.")
+  parser.add_argument("--retry-after", type=int, default=1)
+  parser.add_argument("--rate-limit", type=int, default=5000, help="Requests per token per window before 403s.")
+  parser.add_argument("--rate-limit-window", type=float, default=3600.0, help="Window length in seconds.")
+  parser.add_argument("--seed", type=int, default=42)
+  args = parser.parse_args()
+
+  accounts = {}
+  for spec in args.account:
+    user, _, n = spec.partition("=")
+    accounts[user] = int(n)
+  faults = FaultConfig(
+    latency=args.latency_ms / 1000,
+    jitter=args.jitter_ms / 1000,
+    error_rate=args.error_rate,
+    secondary_limit_rate=args.secondary_limit_rate,
+    retry_after=args.retry_after,
+    rate_limit=args.rate_limit,
+    rate_limit_window=args.rate_limit_window,
+    seed=args.seed,
+  )
+  server = FakeGitHubServer(accounts=accounts, faults=faults, host=args.host, port=args.port)
+  print(f"Fake GitHub API at {server.url} (try {server.url}/users/gen-250/repos)")
+  server.start()
+  try:
+    while True:
+      time.sleep(3600)
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.stop()
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
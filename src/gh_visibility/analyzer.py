@@ -8,28 +8,80 @@ Phase 4: full implementation (ingestion, normalization, scoring).
 from __future__ import annotations
 
 import json
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, TextIO
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, TextIO, Tuple
 
-from .github_client import GitHubClient, RepoSummary
+from .duplicates import Signature, find_duplicate_groups
+from .metrics import timed
 from .models import RepoEvaluation
+from .readme import ReadmeAccumulator, analyze_readme
+from .sections import matcher_for
 from .suggestions import generate_suggestions
+from .topics import TopicIndex, repo_keywords
+
+if TYPE_CHECKING:
+  # Only for annotations: importing github_client pulls in requests, which offline
+  # paths (rescore, its worker processes) never need.
+  from .checkpoint import ScanJournal
+  from .github_client import GitHubClient, RepoSummary
 
 RUBRIC_PATH_DEFAULT = Path(__file__).resolve().parents[2] / "schema" / "rubric.json"
 
+# readmeStructure points taken off READMEs that are near-copies of others in the account.
+DUPLICATE_README_PENALTY = 30.0
+
+DIMENSIONS = ["nameClarity", "descriptionQuality", "topicCoverage", "readmeStructure", "activityRecency", "metadataHygiene"]
+
+# progress(phase, done, total): phase is "listing" or "evaluating"; total is None while listing.
+ProgressCallback = Callable[[str, int, Optional[int]], None]
+
+
+def repo_from_summary(summary: RepoSummary) -> Dict[str, Any]:
+  """Map a RepoSummary to the camelCase repo dict used in evaluations."""
+  return {
+    "id": summary.id,
+    "name": summary.name,
+    "fullName": summary.full_name,
+    "htmlUrl": summary.html_url,
+    "private": summary.private,
+    "description": summary.description,
+    "topics": summary.topics,
+    "archived": summary.archived,
+    "pushedAt": summary.pushed_at,
+    "defaultBranch": summary.default_branch,
+  }
+
 
 class Analyzer:
   def __init__(
     self,
     rubric_path: Optional[str | Path] = None,
-    preset: Optional[Dict[str, Any]] = None,
+    preset: Optional[Mapping[str, Any]] = None,
+    rubric: Optional[Mapping[str, Any]] = None,
+    readme_max_bytes: Optional[int] = None,
   ) -> None:
+    """
+    rubric: already-parsed rubric (e.g. from the preset registry); skips reading rubric_path.
+    readme_max_bytes: download budget per README (default: github_client.README_MAX_BYTES).
+    """
+    if readme_max_bytes is not None and readme_max_bytes <= 0:
+      raise ValueError(f"readme_max_bytes must be positive, got {readme_max_bytes}")
+    self.readme_max_bytes = readme_max_bytes
     self._rubric_path = Path(rubric_path) if rubric_path else RUBRIC_PATH_DEFAULT
     self._preset = preset or {}
-    self._rubric: Dict[str, Any] = {}
-    if self._rubric_path.is_file():
+    self._rubric: Mapping[str, Any] = rubric or {}
+    if rubric is None and self._rubric_path.is_file():
       with open(self._rubric_path, encoding="utf-8") as f:
         self._rubric = json.load(f)
+    # Weights are fixed per preset; missing dimensions default to 1.0.
+    self._weights: Dict[str, float] = {d: 1.0 for d in DIMENSIONS}
+    self._weights.update({d: w for d, w in (self._preset.get("weights") or {}).items() if d in self._weights})
+    self._topic_index: Optional[TopicIndex] = None  # built on first use (suggest mode)
+    rr = self._preset.get("readmeRequirements") or {}
+    self._required_sections = list(rr.get("requiredSections") or [])
+    self._recommended_sections = list(rr.get("recommendedSections") or [])
+    self._sections = matcher_for(self._preset)
 
   def evaluate_account(
     self,
@@ -38,53 +90,231 @@ class Analyzer:
     repo_filter: Optional[str] = None,
     benchmark_mode: str = "none",
     mode: str = "analyze",
+    record_raw: Optional[Callable[[Dict[str, Any], Optional[str], bool], None]] = None,
   ) -> List[Dict[str, Any]]:
     """
     List repos for the user, optionally filter by name, run scoring, return evaluations.
     mode: "analyze" (scores only) or "suggest" (scores + advisory suggestions).
+    record_raw: optional callback receiving (repo, readme_raw, readme_truncated) for each
+    fetched repo, e.g. to save raw inputs for offline rescoring.
+    """
+    evaluations = list(
+      self.iter_evaluations(
+        client,
+        username,
+        repo_filter=repo_filter,
+        mode=mode,
+        record_raw=record_raw,
+      )
+    )
+    return self.finalize(evaluations, benchmark_mode=benchmark_mode, mode=mode)
+
+  def iter_evaluations(
+    self,
+    client: GitHubClient,
+    username: str,
+    repo_filter: Optional[str] = None,
+    mode: str = "analyze",
+    record_raw: Optional[Callable[[Dict[str, Any], Optional[str], bool], None]] = None,
+    progress: Optional[ProgressCallback] = None,
+    journal: Optional[ScanJournal] = None,
+  ) -> Iterator[RepoEvaluation]:
+    """
+    Yield evaluations one repo at a time, before account-level passes (see finalize).
+    The repo listing is read first so progress can report a total. Callers may stop
+    iterating at any repo boundary to cancel.
+    journal: checkpoint (see checkpoint.py); repos it already holds are yielded from it
+    without refetching, new ones are recorded as they finish. All repos are scored
+    against one reference time (the journal's start when resuming).
     """
-    evaluations: List[RepoEvaluation] = []
-    for summary in client.list_repos_for_user(username):
+    now = journal.started_at if journal else datetime.now(timezone.utc)
+    if progress:
+      progress("listing", 0, None)
+    summaries: List[RepoSummary] = []
+    listing = journal.listing(client, username) if journal else client.list_repos_for_user(username)
+    for summary in listing:
       if repo_filter and summary.name != repo_filter:
         continue
-      ev = self._evaluate_one(client, summary)
+      summaries.append(summary)
+      if progress:
+        progress("listing", len(summaries), None)
+    total = len(summaries)
+    if progress:
+      progress("evaluating", 0, total)
+    for done, summary in enumerate(summaries, start=1):
+      ev = journal.completed(summary.full_name) if journal else None
+      if ev is None:
+        ev = self.evaluate_summary(client, summary, mode=mode, record_raw=record_raw, now=now)
+        if journal and ev:
+          journal.record(ev)
+      if progress:
+        progress("evaluating", done, total)
       if ev:
-        if mode == "suggest":
-          ev.suggestions = generate_suggestions(
-            ev.repo, ev.analysis, ev.scores, self._preset
-          )
-        evaluations.append(ev)
+        yield ev
+
+  def finalize(
+    self,
+    evaluations: List[RepoEvaluation],
+    benchmark_mode: str = "none",
+    mode: str = "analyze",
+  ) -> List[Dict[str, Any]]:
+    """
+    Apply account-level passes (near-duplicate READMEs, internal benchmark) and serialize.
+    mode: as for evaluate_repo; "suggest" also adds suggestions from these passes and
+    concrete topic recommendations.
+    """
+    with timed("duplicates"):
+      self._apply_duplicate_readmes(evaluations, mode)
+    if mode == "suggest":
+      with timed("topics"):
+        self._apply_topic_recommendations(evaluations)
     if benchmark_mode == "internal" and len(evaluations) > 1:
       self._apply_internal_benchmark(evaluations)
     return [e.to_dict() for e in evaluations]
 
-  def _evaluate_one(self, client: GitHubClient, summary: RepoSummary) -> Optional[RepoEvaluation]:
-    """Build RepoRaw, normalize to analysis, score, return RepoEvaluation."""
-    readme_raw = client.get_readme_markdown(summary.full_name)
-    repo = {
-      "id": summary.id,
-      "name": summary.name,
-      "fullName": summary.full_name,
-      "htmlUrl": summary.html_url,
-      "private": summary.private,
-      "description": summary.description,
-      "topics": summary.topics,
-      "archived": summary.archived,
-      "pushedAt": summary.pushed_at,
-      "defaultBranch": summary.default_branch,
-    }
-    analysis = self._normalize(repo, readme_raw)
-    scores = self._score(repo, analysis)
-    return RepoEvaluation(repo=repo, analysis=analysis, scores=scores)
+  def refresh(
+    self,
+    evaluations: List[RepoEvaluation],
+    account: Sequence[Mapping[str, Any]],
+    mode: str = "analyze",
+    account_signatures: Optional[Sequence[Optional[Signature]]] = None,
+  ) -> List[Dict[str, Any]]:
+    """
+    finalize for a few repos re-evaluated on their own (e.g. after a webhook), given
+    account: the evaluations of the account's latest full scan, and account_signatures:
+    their README signatures (None where unknown). Each repo's new README is checked for
+    duplicates against the stored signatures, so a rewritten README loses its group and
+    penalty, and one copied from a sibling joins that sibling's group; the siblings'
+    stored evaluations are left as they are until the next account scan. Topic
+    recommendations use the whole account's topics.
+    """
+    def key(repo: Mapping[str, Any]) -> Any:
+      return repo.get("id") if repo.get("id") is not None else repo.get("fullName")
+
+    changed = {key(e.repo) for e in evaluations}
+    topics: List[List[str]] = [e.repo.get("topics") or [] for e in evaluations]
+    # Unchanged repos of the account: (name, duplicate group label, README signature).
+    others: List[Tuple[str, Optional[str], Optional[Signature]]] = []
+    labels = set()
+    for i, prior in enumerate(account):
+      repo = prior.get("repo") or {}
+      label = (prior.get("analysis") or {}).get("readmeDuplicateGroup")
+      if label:
+        labels.add(label)
+      if key(repo) in changed:
+        continue
+      topics.append(repo.get("topics") or [])
+      signature = account_signatures[i] if account_signatures and i < len(account_signatures) else None
+      others.append((repo.get("name") or "?", label, signature))
+    with timed("duplicates"):
+      groups = find_duplicate_groups([s for _, _, s in others] + [e.readme_signature for e in evaluations])
+      members: Dict[int, List[int]] = {}
+      for i, group in enumerate(groups):
+        if group is not None:
+          members.setdefault(group, []).append(i)
+      names = [name for name, _, _ in others] + [e.repo.get("name") or "?" for e in evaluations]
+      new_labels: Dict[int, str] = {}
+      for own, ev in enumerate(evaluations, start=len(others)):
+        group = groups[own]
+        if group is None:
+          continue
+        # The group's stored label when a member already had one, else a fresh label.
+        label = next((others[i][1] for i in members[group] if i < len(others) and others[i][1]), None)
+        label = label or new_labels.get(group)
+        if label is None:
+          n = len(labels) + 1
+          while f"readme-dup-{n}" in labels:
+            n += 1
+          label = new_labels[group] = f"readme-dup-{n}"
+          labels.add(label)
+        self._mark_duplicate(ev, label, [names[i] for i in members[group] if i != own], mode)
+    if mode == "suggest":
+      with timed("topics"):
+        self._apply_topic_recommendations(evaluations, account_topics=topics)
+    return [e.to_dict() for e in evaluations]
 
-  def _normalize(self, repo: Dict[str, Any], readme_raw: Optional[str]) -> Dict[str, Any]:
-    """Derive analysis fields from repo + readme."""
+  def evaluate_repo(
+    self,
+    repo: Dict[str, Any],
+    readme_raw: Optional[str],
+    mode: str = "analyze",
+    now: Optional[datetime] = None,
+    known_analysis: Optional[Dict[str, Any]] = None,
+    readme_signature: Optional[Signature] = None,
+    readme_truncated: bool = False,
+  ) -> RepoEvaluation:
+    """
+    Normalize, score and (in suggest mode) add suggestions for one repo. No network access.
+    known_analysis: analysis fields the caller already derived, e.g. README fields from
+    a stream (see readme.py) or file-presence flags from git; readme_raw is then ignored.
+    readme_signature: the streamed README's MinHash, for duplicate detection in finalize.
+    readme_truncated: readme_raw is only the first part of a README cut at the byte budget.
+    """
+    with timed("normalize"):
+      if known_analysis is None and readme_raw:
+        acc = ReadmeAccumulator()
+        acc.feed(readme_raw)
+        known_analysis = acc.finish(truncated=readme_truncated)
+        readme_signature = acc.signature()
+      analysis = self._normalize(repo, readme_raw, now=now, known_analysis=known_analysis)
+    with timed("score"):
+      scores = self._score(repo, analysis)
+    ev = RepoEvaluation(repo=repo, analysis=analysis, scores=scores, readme_signature=readme_signature)
+    if mode == "suggest":
+      with timed("suggestions"):
+        ev.suggestions = generate_suggestions(ev.repo, ev.analysis, ev.scores, self._preset)
+    return ev
+
+  def evaluate_summary(
+    self,
+    client: GitHubClient,
+    summary: RepoSummary,
+    mode: str = "analyze",
+    record_raw: Optional[Callable[[Dict[str, Any], Optional[str], bool], None]] = None,
+    now: Optional[datetime] = None,
+  ) -> Optional[RepoEvaluation]:
+    """
+    Fetch the README as a stream and analyze it as chunks arrive (memory per repo is
+    bounded by the download budget), then score. The text is only kept for record_raw.
+    """
+    from .github_client import README_MAX_BYTES
+
+    repo = repo_from_summary(summary)
+    readme_analysis = None
+    signature = None
+    kept: Optional[List[str]] = [] if record_raw is not None else None
+    with timed("readme_fetch"):
+      max_bytes = README_MAX_BYTES if self.readme_max_bytes is None else self.readme_max_bytes
+      stream = client.get_readme_stream(summary.full_name, max_bytes=max_bytes)
+      if stream is not None:
+        acc = ReadmeAccumulator()
+        for chunk in stream:
+          acc.feed(chunk)
+          if kept is not None:
+            kept.append(chunk)
+        readme_analysis = acc.finish(truncated=stream.truncated)
+        signature = acc.signature()
+    if record_raw is not None:
+      record_raw(repo, "".join(kept) if stream is not None else None, stream is not None and stream.truncated)
+    return self.evaluate_repo(
+      repo, None, mode=mode, now=now, known_analysis=readme_analysis, readme_signature=signature
+    )
+
+  def _normalize(
+    self,
+    repo: Dict[str, Any],
+    readme_raw: Optional[str],
+    now: Optional[datetime] = None,
+    known_analysis: Optional[Dict[str, Any]] = None,
+  ) -> Dict[str, Any]:
+    """Derive analysis fields from repo + readme. now defaults to the current UTC time."""
     analysis: Dict[str, Any] = {
-      "hasReadme": readme_raw is not None and len((readme_raw or "").strip()) > 0,
+      "hasReadme": False,
       "readmeHeadingCount": 0,
       "readmeWords": 0,
       "readmeSections": [],
       "introHasWhatWhoPlatform": False,
+      "readmeTruncated": False,
       "nameLength": len((repo.get("name") or "")),
       "descriptionLength": len((repo.get("description") or "") or ""),
       "topicCount": len(repo.get("topics") or []),
@@ -93,37 +323,26 @@ class Analyzer:
       "hasContributing": False,
       "hasIssueTemplates": False,
       "hasPrTemplate": False,
+      "readmeDuplicateGroup": None,
+      "readmeSectionCoverage": None,
+      "readmeMissingSections": [],
+      "readmeMissingRecommendedSections": [],
     }
-    if readme_raw:
-      lines = readme_raw.splitlines()
-      words = sum(len(l.split()) for l in lines)
-      analysis["readmeWords"] = words
-      sections = []
-      for line in lines:
-        s = line.strip()
-        if s.startswith("# "):
-          analysis["readmeHeadingCount"] += 1
-          sections.append(s.lstrip("# ").strip())
-        elif s.startswith("## "):
-          analysis["readmeHeadingCount"] += 1
-          sections.append(s.lstrip("# ").strip())
-      analysis["readmeSections"] = sections
-      first_para = ""
-      for line in lines:
-        if line.strip().startswith("#"):
-          continue
-        if line.strip():
-          first_para = line.strip()
-          break
-      analysis["introHasWhatWhoPlatform"] = (
-        "what" in first_para.lower() or "who" in first_para.lower() or len(first_para) > 80
-      )
+    if known_analysis is not None:
+      analysis.update(known_analysis)
+    elif readme_raw:
+      analysis.update(analyze_readme(readme_raw))
+    if self._required_sections or self._recommended_sections:
+      found = self._sections.match(analysis["readmeSections"]) if analysis["readmeSections"] else set()
+      missing = self._sections.missing(found, self._required_sections)
+      analysis["readmeMissingSections"] = missing
+      analysis["readmeMissingRecommendedSections"] = self._sections.missing(found, self._recommended_sections)
+      if self._required_sections:
+        analysis["readmeSectionCoverage"] = 1.0 - len(missing) / len(self._required_sections)
     if repo.get("pushedAt"):
       try:
-        from datetime import datetime, timezone
         pushed = datetime.fromisoformat(repo["pushedAt"].replace("Z", "+00:00"))
-        now = datetime.now(timezone.utc)
-        delta = now - pushed
+        delta = (now or datetime.now(timezone.utc)) - pushed
         analysis["daysSinceLastPush"] = max(0, delta.days)
       except Exception:
         pass
@@ -131,12 +350,6 @@ class Analyzer:
 
   def _score(self, repo: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
     """Compute per-dimension scores and overall. Returns dict of dimension id -> {score, band, explanation}."""
-    weights = (self._preset.get("weights") or {}).copy()
-    dims = ["nameClarity", "descriptionQuality", "topicCoverage", "readmeStructure", "activityRecency", "metadataHygiene"]
-    for d in dims:
-      if d not in weights:
-        weights[d] = 1.0
-
     def clamp_score(s: float) -> float:
       return max(0.0, min(100.0, s))
 
@@ -157,9 +370,15 @@ class Analyzer:
     topic_score = clamp_score(
       min(100.0, topic_count * 15.0 + (20.0 if topic_count else 0.0))
     )
+    # The preset's required sections, when it lists any, stand in for a bare heading count.
+    coverage = analysis.get("readmeSectionCoverage")
+    if coverage is not None:
+      structure_points = 20.0 * coverage if analysis["hasReadme"] else 0.0
+    else:
+      structure_points = 20.0 if analysis.get("readmeHeadingCount", 0) >= 2 else 0.0
     readme_score = clamp_score(
       (50.0 if analysis["hasReadme"] else 0.0)
-      + (20.0 if analysis.get("readmeHeadingCount", 0) >= 2 else 0.0)
+      + structure_points
       + (15.0 if analysis.get("readmeWords", 0) >= 200 else 0.0)
       + (15.0 if analysis.get("introHasWhatWhoPlatform") else 0.0)
     )
@@ -175,24 +394,107 @@ class Analyzer:
       "nameClarity": {"score": name_score, "band": "Partial" if name_score < 70 else "Clear", "explanation": f"Name length {analysis['nameLength']} chars."},
       "descriptionQuality": {"score": desc_score, "band": "Basic" if desc_score < 70 else "Strong", "explanation": f"Description length {desc_len} chars."},
       "topicCoverage": {"score": topic_score, "band": "Moderate" if topic_score < 70 else "Comprehensive", "explanation": f"{analysis['topicCount']} topics set."},
-      "readmeStructure": {"score": readme_score, "band": "Basic" if readme_score < 70 else "Well-Structured", "explanation": f"README: {analysis['readmeWords']} words, {analysis.get('readmeHeadingCount', 0)} headings."},
+      "readmeStructure": {"score": readme_score, "band": "Basic" if readme_score < 70 else "Well-Structured", "explanation": self._readme_explanation(analysis)},
       "activityRecency": {"score": activity_score, "band": "Aging" if activity_score < 70 else "Recently Active", "explanation": f"Last push {days} days ago."},
       "metadataHygiene": {"score": meta_score, "band": "Okay" if meta_score < 70 else "Clean", "explanation": "Metadata completeness."},
     }
-    w = weights
-    total = (
-      name_score * w.get("nameClarity", 1.0)
-      + desc_score * w.get("descriptionQuality", 1.0)
-      + topic_score * w.get("topicCoverage", 1.0)
-      + readme_score * w.get("readmeStructure", 1.0)
-      + activity_score * w.get("activityRecency", 1.0)
-      + meta_score * w.get("metadataHygiene", 1.0)
-    )
-    denom = sum(w.get(d, 1.0) for d in dims)
-    overall = total / denom if denom else 0.0
-    scores["overall"] = {"score": clamp_score(overall), "explanation": "Weighted average of dimensions."}
+    scores["overall"] = {"score": self._overall(scores), "explanation": "Weighted average of dimensions."}
     return scores
 
+  def _readme_explanation(self, analysis: Dict[str, Any]) -> str:
+    text = f"README: {analysis['readmeWords']} words, {analysis.get('readmeHeadingCount', 0)} headings"
+    if analysis.get("readmeSectionCoverage") is not None:
+      required = len(self._required_sections)
+      found = required - len(analysis.get("readmeMissingSections") or [])
+      text += f", {found}/{required} required sections"
+    return text + "."
+
+  def _overall(self, scores: Dict[str, Any]) -> float:
+    """Weighted average of the dimension scores, clamped to 0..100."""
+    w = self._weights
+    total = sum(scores[d]["score"] * w.get(d, 1.0) for d in DIMENSIONS)
+    denom = sum(w.get(d, 1.0) for d in DIMENSIONS)
+    overall = total / denom if denom else 0.0
+    return max(0.0, min(100.0, overall))
+
+  def _apply_duplicate_readmes(self, evaluations: List[RepoEvaluation], mode: str) -> None:
+    """
+    Group repos whose READMEs are near-identical (e.g. untouched template boilerplate),
+    record the group in analysis.readmeDuplicateGroup and lower readmeStructure, which
+    otherwise rewards the boilerplate's headings and length.
+    """
+    groups = find_duplicate_groups([e.readme_signature for e in evaluations])
+    members: Dict[int, List[RepoEvaluation]] = {}
+    for ev, group in zip(evaluations, groups):
+      if group is not None:
+        members.setdefault(group, []).append(ev)
+    for group, evs in members.items():
+      label = f"readme-dup-{group + 1}"
+      for ev in evs:
+        self._mark_duplicate(ev, label, [o.repo.get("name") or "?" for o in evs if o is not ev], mode)
+
+  def _mark_duplicate(self, ev: RepoEvaluation, label: str, others: List[str], mode: str) -> None:
+    """Record ev's duplicate group, apply the readmeStructure penalty and (suggest) say so."""
+    ev.analysis["readmeDuplicateGroup"] = label
+    readme = ev.scores["readmeStructure"]
+    readme["score"] = max(0.0, readme["score"] - DUPLICATE_README_PENALTY)
+    readme["band"] = "Basic" if readme["score"] < 70 else "Well-Structured"
+    readme["explanation"] += f" Nearly identical to {len(others)} other README(s) in this account."
+    ev.scores["overall"]["score"] = self._overall(ev.scores)
+    if mode == "suggest":
+      shown = ", ".join(others[:5]) + (f" and {len(others) - 5} more" if len(others) > 5 else "")
+      ev.suggestions.append({
+        "dimension": "readmeStructure",
+        "severity": "important",
+        "message": (
+          f"README is nearly identical to {shown}. Replace the shared boilerplate with what "
+          "this repo does, who it is for and how to use it."
+        ),
+        "proposedChange": {"kind": "readme", "duplicateGroup": label},
+      })
+
+  def _apply_topic_recommendations(
+    self,
+    evaluations: List[RepoEvaluation],
+    account_topics: Optional[Iterable[List[str]]] = None,
+  ) -> None:
+    """
+    Name concrete topics in each repo's topicCoverage suggestion (see topics.py), using
+    the preset's topic profile and which topics this account sets together (from
+    account_topics, default: the evaluated repos). Repos missing a required topic get
+    the suggestion even when coverage scores well.
+    """
+    if self._topic_index is None:
+      self._topic_index = TopicIndex.for_preset(self._preset)
+    if account_topics is None:
+      account_topics = (e.repo.get("topics") or [] for e in evaluations)
+    index = self._topic_index.with_account(account_topics)
+    tp = self._preset.get("topicProfile") or {}
+    min_count = tp.get("minCount", 5)
+    max_count = tp.get("maxCount", 20)
+    for ev in evaluations:
+      current = ev.repo.get("topics") or []
+      limit = min(max(min_count - len(current), 3), max_count - len(current))
+      if limit <= 0:
+        continue
+      recs = index.recommend(repo_keywords(ev.repo, ev.analysis), current, limit=limit)
+      if not recs:
+        continue
+      entry = next((s for s in ev.suggestions if s.get("dimension") == "topicCoverage"), None)
+      if entry is None:
+        have = {t.lower() for t in current}
+        missing = [t for t in index.required if t not in have]
+        if not missing:
+          continue
+        entry = {
+          "dimension": "topicCoverage",
+          "severity": "important",
+          "message": f"This preset requires the topic(s) {', '.join(missing)}.",
+        }
+        ev.suggestions.append(entry)
+      entry["message"] += f" Suggested topics: {', '.join(recs)}."
+      entry["proposedChange"] = {"kind": "topics", "topics": recs}
+
   def _apply_internal_benchmark(self, evaluations: List[RepoEvaluation]) -> None:
     """Optional: annotate evaluations with internal ranking (e.g. top 20% in account)."""
     if len(evaluations) < 2:
@@ -0,0 +1,151 @@
+"""
+Checkpoint journal for `gh-visibility scan --checkpoint / --resume`.
+
+A journal is an append-only JSON Lines file:
+
+  {"type": "scan", "version": 1, "params": {...}, "startedAt": "..."}
+  {"type": "page", "page": 1, "repos": [...]}           one per repo listing page
+  {"type": "evaluation", "evaluation": {...}, "readmeSignature": "<hex>"}
+                                                         one per finished repo
+
+Every record is flushed and fsynced before the scan moves on, so a crash loses at
+most the repo in flight (a torn last line is dropped on resume). Resuming replays
+the recorded listing pages, continues listing at the next page, reuses finished
+evaluations and scores the rest against the original startedAt, so the output is the
+same as an uninterrupted run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from .github_client import GitHubClient, RepoSummary
+from .models import RepoEvaluation
+
+JOURNAL_VERSION = 1
+
+
+class JournalError(ValueError):
+  """The journal is unreadable or was written for a different scan."""
+
+
+class ScanJournal:
+  """Durable record of one account scan's listing and finished evaluations."""
+
+  def __init__(self, path: Path, params: Dict[str, Any], started_at: datetime, fh: BinaryIO) -> None:
+    self.path = path
+    self.params = params
+    self.started_at = started_at
+    self.pages: List[List[RepoSummary]] = []
+    self.listing_done = False
+    self.evaluations: Dict[str, RepoEvaluation] = {}
+    self._fh = fh
+
+  @classmethod
+  def create(cls, path: str | Path, params: Dict[str, Any]) -> "ScanJournal":
+    """Start a new journal; refuses to overwrite an existing file."""
+    path = Path(path)
+    try:
+      fh = open(path, "xb")
+    except FileExistsError:
+      raise JournalError(f"{path} already exists; pass it to --resume to continue that scan") from None
+    started_at = datetime.now(timezone.utc)
+    journal = cls(path, params, started_at, fh)
+    journal._append({
+      "type": "scan",
+      "version": JOURNAL_VERSION,
+      "params": params,
+      "startedAt": started_at.isoformat(),
+    })
+    return journal
+
+  @classmethod
+  def resume(cls, path: str | Path, params: Dict[str, Any]) -> "ScanJournal":
+    """Load an existing journal written for the same scan parameters."""
+    path = Path(path)
+    try:
+      data = path.read_bytes()
+    except OSError as e:
+      raise JournalError(f"cannot read journal {path}: {e}") from None
+
+    records: List[Dict[str, Any]] = []
+    good = 0
+    for line in data.splitlines(keepends=True):
+      try:
+        if not line.endswith(b"\n"):
+          raise ValueError("torn write")
+        records.append(json.loads(line))
+      except ValueError:
+        # Only the last record can be incomplete (the process died mid-write).
+        if good + len(line) < len(data):
+          raise JournalError(f"{path}: corrupt record at byte {good}") from None
+        break
+      good += len(line)
+
+    if not records or records[0].get("type") != "scan" or records[0].get("version") != JOURNAL_VERSION:
+      raise JournalError(f"{path} is not a scan journal")
+    header = records[0]
+    if header.get("params") != params:
+      raise JournalError(
+        f"{path} was written for a different scan: {json.dumps(header.get('params'), sort_keys=True)}"
+      )
+
+    fh = open(path, "r+b")
+    fh.truncate(good)
+    fh.seek(good)
+    journal = cls(path, params, datetime.fromisoformat(header["startedAt"]), fh)
+    for record in records[1:]:
+      if record["type"] == "page":
+        repos = [RepoSummary(**r) for r in record["repos"]]
+        journal.pages.append(repos)
+        journal.listing_done = journal.listing_done or not repos
+      elif record["type"] == "evaluation":
+        ev = RepoEvaluation(**record["evaluation"])
+        signature = record.get("readmeSignature")
+        ev.readme_signature = bytes.fromhex(signature) if signature else None
+        journal.evaluations[ev.repo["fullName"]] = ev
+    return journal
+
+  def _append(self, record: Dict[str, Any]) -> None:
+    self._fh.write(json.dumps(record).encode("utf-8") + b"\n")
+    self._fh.flush()
+    os.fsync(self._fh.fileno())
+
+  def listing(self, client: GitHubClient, username: str) -> Iterator[RepoSummary]:
+    """
+    Recorded listing pages, then the rest of the listing from the API (recording each
+    page). Repos that moved between pages since the journal was started appear once.
+    """
+    seen = set()
+    for summaries in self.pages:
+      for s in summaries:
+        if s.full_name not in seen:
+          seen.add(s.full_name)
+          yield s
+    if self.listing_done:
+      return
+    for page, summaries in client.list_repo_pages(username, start_page=len(self.pages) + 1):
+      self._append({"type": "page", "page": page, "repos": [asdict(s) for s in summaries]})
+      self.pages.append(summaries)
+      for s in summaries:
+        if s.full_name not in seen:
+          seen.add(s.full_name)
+          yield s
+    self.listing_done = True
+
+  def completed(self, full_name: str) -> Optional[RepoEvaluation]:
+    """The recorded evaluation for a repo finished in an earlier run, if any."""
+    return self.evaluations.get(full_name)
+
+  def record(self, ev: RepoEvaluation) -> None:
+    signature = ev.readme_signature.hex() if ev.readme_signature else None
+    self._append({"type": "evaluation", "evaluation": ev.to_dict(), "readmeSignature": signature})
+    self.evaluations[ev.repo["fullName"]] = ev
+
+  def close(self) -> None:
+    self._fh.close()
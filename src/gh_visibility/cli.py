@@ -4,6 +4,27 @@ Command-line entrypoint for the GitHub Account Presentation Optimizer.
 Intended primary command:
 
     gh-visibility scan --user <username> [--preset <id>] [--output json|table] [--repo <name>] [--benchmark ...]
+
+Long scans can journal progress and pick up where a failed run stopped:
+
+    gh-visibility scan --user <username> --checkpoint scan.journal
+    gh-visibility scan --user <username> --resume scan.journal
+
+Offline rescoring of raw inputs saved with `scan --save-raw`:
+
+    gh-visibility rescore --from <raw.jsonl> [--preset <id>] [--rubric <path>] [--jobs N]
+
+Scoring local clones or bare mirrors without the API (e.g. air-gapped CI):
+
+    gh-visibility scan-local <dir> [--preset <id>] [--jobs N]
+
+Long-running re-evaluation of repos as their events arrive:
+
+    gh-visibility watch --user <username> [--interval 60] [--outfile updates.jsonl]
+
+What got better or worse between two saved scans (exit status 1 with --fail-on-regression):
+
+    gh-visibility diff <before.json> <after.json> [--threshold 5] [--dimension <id>] [--output table|json]
 """
 
 from __future__ import annotations
@@ -12,16 +33,29 @@ import argparse
 import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from .github_client import GitHubClient
-from .analyzer import Analyzer
-from .presets import load_preset
-from .output import render_markdown
+# Keep module load cheap: --help, argument errors and every scheduled invocation pay
+# for it. Heavy modules (requests via github_client, analyzer, output, rescore) are
+# imported inside the command that needs them; tests/test_cli_startup.py enforces this.
+if TYPE_CHECKING:
+  from .analyzer import Analyzer
+  from .registry import PresetRegistry
 
 _REPO_ROOT = Path(__file__).resolve().parents[2]
 
 
+def _positive_int(value: str) -> int:
+  """argparse type for sizes and counts that must be at least 1."""
+  try:
+    number = int(value)
+  except ValueError:
+    raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+  if number < 1:
+    raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+  return number
+
+
 def build_parser() -> argparse.ArgumentParser:
   parser = argparse.ArgumentParser(
     prog="gh-visibility",
@@ -31,7 +65,9 @@ def build_parser() -> argparse.ArgumentParser:
   parser.add_argument(
     "--token",
     dest="token",
-    help="GitHub Personal Access Token. If omitted, GITHUB_TOKEN environment variable is used."
+    action="append",
+    help="GitHub Personal Access Token; repeat (or comma-separate) to scan with a pool of tokens. "
+    "If omitted, GITHUB_TOKENS (comma-separated) or GITHUB_TOKEN environment variable is used."
   )
 
   subparsers = parser.add_subparsers(dest="command", required=True)
@@ -82,48 +118,497 @@ def build_parser() -> argparse.ArgumentParser:
     action="store_true",
     help="When used with --mode suggest, add optional LLM-generated suggestions (requires FRONTIER_LLM_API_KEY or OPENAI_API_KEY)."
   )
+  scan.add_argument(
+    "--metrics",
+    action="store_true",
+    help="Print stage timings, GitHub request counts, bytes, cache use and rate-limit remaining to stderr after the run."
+  )
+  scan.add_argument(
+    "--profile",
+    action="store_true",
+    help="Print a breakdown after the run: wall time per stage, requests, bytes, p50/p95 request latency and the slowest repos."
+  )
+  scan.add_argument(
+    "--profile-out",
+    dest="profile_out",
+    help="With --profile, also write a cProfile dump (.prof) or sampled collapsed stacks for flame graphs (.folded)."
+  )
+  scan.add_argument(
+    "--readme-max-kb",
+    dest="readme_max_kb",
+    type=_positive_int,
+    default=512,
+    help="Download at most this many KiB of each README; larger ones are analyzed up to the cut and marked readmeTruncated (default: 512)."
+  )
+  scan.add_argument(
+    "--save-raw",
+    dest="save_raw",
+    help="Also write raw repo metadata and READMEs (JSON lines) to this path for offline `rescore`."
+  )
+  checkpoint = scan.add_mutually_exclusive_group()
+  checkpoint.add_argument(
+    "--checkpoint",
+    help="Journal the listing and each finished repo to this new file, so an interrupted scan can be resumed."
+  )
+  checkpoint.add_argument(
+    "--resume",
+    help="Continue the scan journaled in this file (same --user/--repo/--mode/--preset), skipping finished repos."
+  )
+
+  rescore = subparsers.add_parser(
+    "rescore",
+    help="Rescore raw inputs saved with `scan --save-raw`, without network access."
+  )
+  rescore.add_argument(
+    "--from",
+    dest="raw_path",
+    required=True,
+    help="Raw inputs file written by `scan --save-raw`."
+  )
+  rescore.add_argument(
+    "--preset",
+    default="indie-hacker",
+    help="Presentation preset id to use (default: indie-hacker)."
+  )
+  rescore.add_argument(
+    "--preset-file",
+    dest="preset_file",
+    help="Path to a preset JSON file to use instead of --preset (e.g. a draft being tuned)."
+  )
+  rescore.add_argument(
+    "--rubric",
+    dest="rubric_path",
+    help="Path to a rubric JSON file (default: schema/rubric.json)."
+  )
+  rescore.add_argument(
+    "--user",
+    help="Account name for report titles (default: owner of the first saved repo)."
+  )
+  rescore.add_argument(
+    "--output",
+    choices=["table", "json", "markdown"],
+    default="table",
+    help="Output format (default: table)."
+  )
+  rescore.add_argument(
+    "--outfile",
+    help="Write output to this path (for markdown: default is stdout if omitted)."
+  )
+  rescore.add_argument(
+    "--benchmark",
+    choices=["none", "internal"],
+    default="none",
+    help="Optional benchmarking mode (default: none, 'internal' compares repos within the account)."
+  )
+  rescore.add_argument(
+    "--mode",
+    choices=["analyze", "suggest"],
+    default="analyze",
+    help="analyze = scores only; suggest = scores + advisory suggestions (default: analyze)."
+  )
+  rescore.add_argument(
+    "--jobs",
+    type=int,
+    default=None,
+    help="Worker processes to use (default: number of CPUs; 1 disables multiprocessing)."
+  )
+
+  local = subparsers.add_parser(
+    "scan-local",
+    help="Score git clones or bare mirrors under a directory, without the GitHub API."
+  )
+  local.add_argument("path", help="Directory holding clones and/or bare repositories (searched recursively).")
+  local.add_argument(
+    "--preset",
+    default="indie-hacker",
+    help="Presentation preset id to use (default: indie-hacker)."
+  )
+  local.add_argument(
+    "--output",
+    choices=["table", "json", "markdown"],
+    default="table",
+    help="Output format (default: table)."
+  )
+  local.add_argument(
+    "--outfile",
+    help="Write output to this path (for markdown: default is stdout if omitted)."
+  )
+  local.add_argument(
+    "--benchmark",
+    choices=["none", "internal"],
+    default="none",
+    help="Optional benchmarking mode (default: none, 'internal' compares repos within the account)."
+  )
+  local.add_argument(
+    "--mode",
+    choices=["analyze", "suggest"],
+    default="analyze",
+    help="analyze = scores only; suggest = scores + advisory suggestions (default: analyze)."
+  )
+  local.add_argument(
+    "--jobs",
+    type=int,
+    default=None,
+    help="Worker processes to use (default: number of CPUs; 1 disables multiprocessing)."
+  )
+  local.add_argument(
+    "--readme-max-kb",
+    dest="readme_max_kb",
+    type=_positive_int,
+    default=512,
+    help="Read at most this many KiB of each README (default: 512)."
+  )
+
+  watch = subparsers.add_parser(
+    "watch",
+    help="Poll an account's events and re-evaluate only repos that changed (long-running)."
+  )
+  owner = watch.add_mutually_exclusive_group(required=True)
+  owner.add_argument("--user", help="GitHub username whose public events to watch.")
+  owner.add_argument("--org", help="GitHub organization whose public events to watch.")
+  watch.add_argument(
+    "--preset",
+    default="indie-hacker",
+    help="Presentation preset id to use (default: indie-hacker)."
+  )
+  watch.add_argument(
+    "--mode",
+    choices=["analyze", "suggest"],
+    default="analyze",
+    help="analyze = scores only; suggest = scores + advisory suggestions (default: analyze)."
+  )
+  watch.add_argument(
+    "--interval",
+    type=int,
+    default=60,
+    help="Seconds between polls (default: 60; GitHub's X-Poll-Interval is honoured if longer)."
+  )
+  watch.add_argument(
+    "--outfile",
+    help="Append updated evaluations as JSON lines to this file (default: stdout)."
+  )
+  watch.add_argument(
+    "--backfill",
+    action="store_true",
+    help="On startup, also re-evaluate repos named in events already in the feed."
+  )
+  watch.add_argument(
+    "--once",
+    action="store_true",
+    help="Poll once and exit (e.g. from cron); combine with --backfill to evaluate recent activity."
+  )
+
+  diff = subparsers.add_parser(
+    "diff",
+    help="Compare two saved scans: added and removed repos, and scores that moved."
+  )
+  diff.add_argument("before", help="Earlier scan: JSON from `--output json`, or JSON lines from `watch --outfile`.")
+  diff.add_argument("after", help="Later scan, in either format.")
+  diff.add_argument(
+    "--threshold",
+    type=float,
+    default=5.0,
+    help="Report a dimension when its score moved by at least this many points (default: 5)."
+  )
+  diff.add_argument(
+    "--dimension",
+    action="append",
+    help="Only report moves in this dimension; repeat or comma-separate (default: all)."
+  )
+  diff.add_argument(
+    "--output",
+    choices=["table", "json"],
+    default="table",
+    help="Output format (default: table)."
+  )
+  diff.add_argument(
+    "--outfile",
+    help="Write output to this path instead of stdout."
+  )
+  diff.add_argument(
+    "--fail-on-regression",
+    dest="fail_on_regression",
+    action="store_true",
+    help="Exit with status 1 if any repo's score dropped by at least the threshold (e.g. after a scheduled scan)."
+  )
 
   return parser
 
 
-def resolve_token(explicit: Optional[str]) -> str:
-  token = explicit or os.environ.get("GITHUB_TOKEN") or ""
-  if not token:
+def resolve_tokens(explicit: Optional[List[str]]) -> List[str]:
+  """Tokens from --token (repeatable, comma-separated), else GITHUB_TOKENS, else GITHUB_TOKEN."""
+  values = explicit or [os.environ.get("GITHUB_TOKENS") or os.environ.get("GITHUB_TOKEN") or ""]
+  tokens = [t.strip() for v in values for t in v.split(",") if t.strip()]
+  if not tokens:
     raise SystemExit(
       "No GitHub token provided. Set GITHUB_TOKEN env var or pass --token."
     )
-  return token
+  return tokens
+
+
+def load_registry() -> PresetRegistry:
+  """The shared preset registry; invalid presets abort with a readable error."""
+  from .registry import PresetValidationError, default_registry
+
+  try:
+    return default_registry()
+  except PresetValidationError as e:
+    raise SystemExit(str(e))
 
 
 def cmd_scan(args: argparse.Namespace) -> int:
-  token = resolve_token(args.token)
-  client = GitHubClient(token=token)
-  preset = load_preset(args.preset)
+  from .analyzer import Analyzer
+  from .github_client import API_ROOT, GitHubClient
+  from .metrics import summary_lines
+  from .profiling import ScanProfile
+  from .rescore import write_raw_input
+  from .token_pool import TokenPoolExhausted
+
+  tokens = resolve_tokens(args.token)
+  # GITHUB_API_URL (as set by GitHub Actions) points at GHES or a local fake API.
+  client = GitHubClient.from_tokens(tokens, api_root=os.environ.get("GITHUB_API_URL") or API_ROOT)
+  registry = load_registry()
+  preset = registry.get(args.preset)
   rubric_path = _REPO_ROOT / "schema" / "rubric.json"
-  analyzer = Analyzer(rubric_path=rubric_path, preset=preset)
+  analyzer = Analyzer(
+    rubric_path=rubric_path,
+    preset=preset,
+    rubric=registry.rubric,
+    readme_max_bytes=args.readme_max_kb * 1024,
+  )
+
+  profile = None
+  if getattr(args, "profile", False) or getattr(args, "profile_out", None):
+    try:
+      profile = ScanProfile(out_path=args.profile_out)
+    except ValueError as e:
+      raise SystemExit(str(e))
+    profile.start()
+
+  # The profile hooks the request observers and may run a sampler thread: always
+  # unhook, also when the scan fails.
+  try:
+    journal = None
+    if getattr(args, "checkpoint", None) or getattr(args, "resume", None):
+      from .checkpoint import JournalError, ScanJournal
+
+      params = {
+        "user": args.user,
+        "repoFilter": args.repo_filter,
+        "mode": getattr(args, "mode", "analyze"),
+        "preset": args.preset,
+        "readmeMaxBytes": args.readme_max_kb * 1024,
+      }
+      try:
+        journal = ScanJournal.resume(args.resume, params) if args.resume else ScanJournal.create(args.checkpoint, params)
+      except JournalError as e:
+        raise SystemExit(str(e))
+
+    # A resumed scan only fetches the remaining repos, so their raw inputs are appended.
+    raw_mode = "a" if journal is not None and args.resume else "w"
+    raw_file = open(args.save_raw, raw_mode, encoding="utf-8") if getattr(args, "save_raw", None) else None
+    try:
+      repo_evaluations = []
+      for ev in analyzer.iter_evaluations(
+        client=client,
+        username=args.user,
+        repo_filter=args.repo_filter,
+        mode=getattr(args, "mode", "analyze"),
+        record_raw=(
+          lambda repo, readme, truncated: write_raw_input(raw_file, repo, readme, truncated=truncated)
+        ) if raw_file else None,
+        progress=profile.on_progress if profile else None,
+        journal=journal,
+      ):
+        repo_evaluations.append(ev)
+        if profile:
+          profile.repo_done(ev.repo.get("fullName") or ev.repo.get("name") or "?")
+      evaluations = analyzer.finalize(
+        repo_evaluations, benchmark_mode=args.benchmark, mode=getattr(args, "mode", "analyze")
+      )
+    finally:
+      if raw_file:
+        raw_file.close()
+      if journal:
+        journal.close()
 
-  evaluations = analyzer.evaluate_account(
-    client=client,
-    username=args.user,
-    repo_filter=args.repo_filter,
+    if getattr(args, "llm", False) and getattr(args, "mode", "analyze") == "suggest":
+      from .llm_suggestions import generate_llm_suggestions
+      api_key = os.environ.get("FRONTIER_LLM_API_KEY") or os.environ.get("OPENAI_API_KEY")
+      if api_key:
+        for ev in evaluations:
+          ev["suggestions"] = list(ev.get("suggestions") or [])
+          extra = generate_llm_suggestions(
+            ev.get("repo", {}),
+            ev["suggestions"],
+            preset,
+            api_key=api_key,
+          )
+          ev["suggestions"].extend(extra)
+
+    write_output(args, evaluations, analyzer, username=args.user, preset_id=args.preset)
+  except TokenPoolExhausted as e:
+    hint = f" (continue later with --resume {args.resume or args.checkpoint})" if journal is not None else ""
+    raise SystemExit(f"scan stopped: {e.describe()}{hint}")
+  finally:
+    if profile:
+      profile.stop()
+  if profile:
+    profile.report(sys.stderr)
+  if getattr(args, "metrics", False):
+    sys.stderr.write("\n".join(summary_lines()) + "\n")
+  return 0
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+  from .analyzer import Analyzer
+  from .github_client import API_ROOT, GitHubClient
+  from .token_pool import TokenPoolExhausted
+  from .watch import EventWatcher, jsonl_sink
+
+  tokens = resolve_tokens(args.token)
+  client = GitHubClient.from_tokens(tokens, api_root=os.environ.get("GITHUB_API_URL") or API_ROOT)
+  registry = load_registry()
+  analyzer = Analyzer(preset=registry.get(args.preset), rubric=registry.rubric)
+
+  out = open(args.outfile, "a", encoding="utf-8") if args.outfile else sys.stdout
+  watcher = EventWatcher(
+    client,
+    analyzer,
+    owner=args.org or args.user,
+    sink=jsonl_sink(out),
+    org=bool(args.org),
+    mode=args.mode,
+    backfill=args.backfill,
+  )
+  try:
+    watcher.run(interval=args.interval, max_polls=1 if args.once else None)
+  except KeyboardInterrupt:
+    pass
+  except TokenPoolExhausted as e:
+    raise SystemExit(f"watch stopped: {e.describe()}")
+  finally:
+    if out is not sys.stdout:
+      out.close()
+  return 0
+
+
+def cmd_scan_local(args: argparse.Namespace) -> int:
+  from .analyzer import Analyzer
+  from .local_git import scan_local
+
+  if not Path(args.path).is_dir():
+    raise SystemExit(f"Not a directory: {args.path}")
+  registry = load_registry()
+  preset = registry.get(args.preset)
+  rubric_path = _REPO_ROOT / "schema" / "rubric.json"
+  evaluations, errors = scan_local(
+    args.path,
+    preset=preset,
+    rubric_path=rubric_path,
+    mode=args.mode,
     benchmark_mode=args.benchmark,
-    mode=getattr(args, "mode", "analyze"),
-  )
-
-  if getattr(args, "llm", False) and getattr(args, "mode", "analyze") == "suggest":
-    from .llm_suggestions import generate_llm_suggestions
-    api_key = os.environ.get("FRONTIER_LLM_API_KEY") or os.environ.get("OPENAI_API_KEY")
-    if api_key:
-      for ev in evaluations:
-        ev["suggestions"] = list(ev.get("suggestions") or [])
-        extra = generate_llm_suggestions(
-          ev.get("repo", {}),
-          ev["suggestions"],
-          preset,
-          api_key=api_key,
-        )
-        ev["suggestions"].extend(extra)
+    jobs=args.jobs,
+    readme_max_bytes=args.readme_max_kb * 1024,
+  )
+  for path, error in errors:
+    sys.stderr.write(f"skipped {path}: {error}\n")
+  analyzer = Analyzer(rubric_path=rubric_path, preset=preset, rubric=registry.rubric)
+  write_output(args, evaluations, analyzer, username=Path(args.path).resolve().name, preset_id=args.preset)
+  return 0
+
 
+def cmd_rescore(args: argparse.Namespace) -> int:
+  from .analyzer import Analyzer
+  from .rescore import rescore
+
+  if getattr(args, "preset_file", None):
+    from .registry import PresetValidationError
+
+    try:
+      preset = load_registry().load_file(Path(args.preset_file))
+    except PresetValidationError as e:
+      raise SystemExit(str(e))
+    preset_id = preset["id"]
+  else:
+    preset = load_registry().get(args.preset)
+    preset_id = args.preset
+  rubric_path = Path(args.rubric_path) if args.rubric_path else _REPO_ROOT / "schema" / "rubric.json"
+
+  evaluations = rescore(
+    args.raw_path,
+    preset=preset,
+    rubric_path=rubric_path,
+    mode=args.mode,
+    benchmark_mode=args.benchmark,
+    jobs=args.jobs,
+  )
+
+  username = args.user
+  if not username:
+    first = ((evaluations[0].get("repo") or {}).get("fullName") or "") if evaluations else ""
+    username = first.split("/")[0] if "/" in first else "offline"
+  analyzer = Analyzer(rubric_path=rubric_path, preset=preset)
+  write_output(args, evaluations, analyzer, username=username, preset_id=preset_id)
+  return 0
+
+
+def cmd_diff(args: argparse.Namespace) -> int:
+  from .diff import diff_scan_files, format_entry
+
+  dimensions = [d.strip() for v in args.dimension or [] for d in v.split(",") if d.strip()]
+  try:
+    diff = diff_scan_files(args.before, args.after, threshold=args.threshold, dimensions=dimensions or None)
+  except (OSError, ValueError) as e:
+    raise SystemExit(str(e))
+
+  out = open(args.outfile, "w", encoding="utf-8") if args.outfile else sys.stdout
+  try:
+    if args.output == "json":
+      import json
+
+      # Entries are written as the merge join produces them; the summary comes last.
+      out.write(f'{{"before": {json.dumps(args.before)}, "after": {json.dumps(args.after)}, '
+                f'"threshold": {json.dumps(args.threshold)}, "repos": [')
+      for i, entry in enumerate(diff):
+        out.write(("," if i else "") + "\n  " + json.dumps(entry.to_dict()))
+      out.write(f'\n], "summary": {json.dumps(diff.summary.to_dict())}}}\n')
+    else:
+      for entry in diff:
+        out.write(format_entry(entry) + "\n")
+      summary = diff.summary
+      out.write(
+        f"{summary.compared} repos compared: {summary.added} added, {summary.removed} removed, "
+        f"{summary.changed} changed ({summary.improved} improved, {summary.regressed} regressed) "
+        f"by >= {args.threshold:g} points\n"
+      )
+  finally:
+    if out is not sys.stdout:
+      out.close()
+  return 1 if args.fail_on_regression and diff.summary.regressed else 0
+
+
+def write_output(
+  args: argparse.Namespace,
+  evaluations: list,
+  analyzer: Analyzer,
+  username: str,
+  preset_id: str,
+) -> None:
+  """Write evaluations as table, JSON or markdown according to --output / --outfile."""
+  from .metrics import timed
+
+  with timed("render"):
+    _write_output(args, evaluations, analyzer, username, preset_id)
+
+
+def _write_output(
+  args: argparse.Namespace,
+  evaluations: list,
+  analyzer: Analyzer,
+  username: str,
+  preset_id: str,
+) -> None:
   if args.output == "json":
     import json
 
@@ -135,22 +620,24 @@ def cmd_scan(args: argparse.Namespace) -> int:
       json.dump(evaluations, sys.stdout, indent=2)
       sys.stdout.write("\n")
   elif args.output == "markdown":
+    from .output import render_markdown
+
     outfile = getattr(args, "outfile", None)
     if outfile:
       path = Path(outfile)
       with open(path, "w", encoding="utf-8") as f:
         render_markdown(
           evaluations,
-          username=args.user,
-          preset_id=args.preset,
+          username=username,
+          preset_id=preset_id,
           stream=f,
         )
       sys.stderr.write(f"Wrote markdown report to {path}\n")
     else:
       render_markdown(
         evaluations,
-        username=args.user,
-        preset_id=args.preset,
+        username=username,
+        preset_id=preset_id,
         stream=sys.stdout,
       )
   else:
@@ -160,8 +647,6 @@ def cmd_scan(args: argparse.Namespace) -> int:
       show_suggestions=(getattr(args, "mode", "analyze") == "suggest"),
     )
 
-  return 0
-
 
 def main(argv: Optional[list[str]] = None) -> int:
   parser = build_parser()
@@ -169,6 +654,14 @@ def main(argv: Optional[list[str]] = None) -> int:
 
   if args.command == "scan":
     return cmd_scan(args)
+  if args.command == "rescore":
+    return cmd_rescore(args)
+  if args.command == "scan-local":
+    return cmd_scan_local(args)
+  if args.command == "watch":
+    return cmd_watch(args)
+  if args.command == "diff":
+    return cmd_diff(args)
 
   parser.error(f"Unknown command: {args.command}")
   return 1
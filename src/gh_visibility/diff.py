@@ -0,0 +1,263 @@
+"""
+Scan-to-scan diffs: which repos were added or removed between two scans of an
+account, and which dimension scores moved by at least a threshold.
+
+Both scans are reduced to ScoreRows (repo key, name, one score per dimension) and
+lined up by repo id with a sorted merge join, so the join itself holds one row per
+side. Scan files (JSON arrays from `--output json`, or JSON lines from `watch`) are
+decoded one evaluation at a time and only the row is kept; rows are sorted only if
+the file is not already in id order. The backend reads rows in id order from a
+covering SQLite index, so a stored diff never loads evaluation payloads.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+DIMENSIONS = (
+  "overall",
+  "nameClarity",
+  "descriptionQuality",
+  "topicCoverage",
+  "readmeStructure",
+  "activityRecency",
+  "metadataHygiene",
+)
+
+# Score points a dimension must move by to be reported.
+DEFAULT_THRESHOLD = 5.0
+
+_CHUNK = 1 << 16
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+class ScoreRow(NamedTuple):
+  """One repo of a scan: join key, repo id, full name and scores in DIMENSIONS order."""
+
+  key: Tuple[Any, ...]
+  repo_id: Optional[int]
+  full_name: str
+  scores: Tuple[Optional[float], ...]
+
+
+def row_key(repo_id: Optional[int], full_name: str) -> Tuple[Any, ...]:
+  """Join key: repos with an id sort by id, then repos without one by name."""
+  if isinstance(repo_id, int):
+    return (0, repo_id)
+  return (1, full_name)
+
+
+def row_from_evaluation(evaluation: Mapping[str, Any]) -> ScoreRow:
+  repo = evaluation.get("repo") or {}
+  if not isinstance(repo, dict):
+    raise ValueError(f"expected an evaluation, found a record with repo {repo!r}")
+  scores = evaluation.get("scores") or {}
+  full_name = repo.get("fullName") or repo.get("name") or "?"
+  values = []
+  for dim in DIMENSIONS:
+    v = scores.get(dim)
+    values.append(float(v["score"]) if isinstance(v, dict) and v.get("score") is not None else None)
+  return ScoreRow(row_key(repo.get("id"), full_name), repo.get("id"), full_name, tuple(values))
+
+
+def iter_scan_file(path: str | Path) -> Iterator[Dict[str, Any]]:
+  """
+  Objects from a scan file, decoded one at a time: evaluations in a JSON array
+  (`--output json`), or JSON lines of evaluations or watch records (`watch --outfile`;
+  see read_rows).
+  """
+  decoder = json.JSONDecoder()
+  with open(path, encoding="utf-8") as f:
+    buf = f.read(_CHUNK)
+    pos = _SEPARATORS.match(buf).end()
+    if buf.startswith("[", pos):
+      pos += 1
+    eof = not buf
+    while True:
+      pos = _SEPARATORS.match(buf, pos).end()
+      if buf.startswith("]", pos) or (eof and pos == len(buf)):
+        return
+      if pos < len(buf):
+        try:
+          value, pos = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError as e:
+          if eof:
+            raise ValueError(f"{path}: not a scan file ({e})") from None
+        else:
+          if not isinstance(value, dict):
+            raise ValueError(f"{path}: expected evaluation objects, found {type(value).__name__}")
+          yield value
+          continue
+      # Out of input mid-value or at the end of the buffer: read on, at least
+      # doubling the buffer so one very large evaluation is not re-parsed per chunk.
+      chunk = f.read(max(_CHUNK, len(buf) - pos))
+      eof = not chunk
+      buf = buf[pos:] + chunk
+      pos = 0
+
+
+def read_rows(path: str | Path) -> List[ScoreRow]:
+  """
+  A scan file's rows in key order (stable, so later lines for a repo stay later).
+  Watch records are unwrapped to their evaluation; a repo whose last record says
+  "removed" is left out, as if the scan had not listed it.
+  """
+  rows: List[ScoreRow] = []
+  removed: Dict[str, int] = {}  # full name -> rows read when its last removal was logged
+  for value in iter_scan_file(path):
+    kind = value.get("type")
+    if kind == "removed":
+      removed[str(value.get("repo"))] = len(rows)
+      continue
+    rows.append(row_from_evaluation(value.get("evaluation") or {} if kind == "evaluation" else value))
+  if removed:
+    rows = [r for i, r in enumerate(rows) if i >= removed.get(r.full_name, 0)]
+  if any(a.key > b.key for a, b in zip(rows, rows[1:])):
+    rows.sort(key=lambda r: r.key)
+  return rows
+
+
+def _latest(rows: Iterable[ScoreRow]) -> Iterator[ScoreRow]:
+  """Last row of each run of equal keys (a watch log lists a repo once per update)."""
+  prev: Optional[ScoreRow] = None
+  for row in rows:
+    if prev is not None and row.key != prev.key:
+      yield prev
+    prev = row
+  if prev is not None:
+    yield prev
+
+
+@dataclass
+class RepoDiff:
+  """A repo added, removed, or with at least one dimension moved by the threshold."""
+
+  status: str  # added | removed | changed
+  repo_id: Optional[int]
+  full_name: str
+  before: Optional[float] = None  # overall score
+  after: Optional[float] = None
+  deltas: Dict[str, float] = field(default_factory=dict)  # dimension -> after - before
+
+  @property
+  def regressed(self) -> bool:
+    return any(d < 0 for d in self.deltas.values())
+
+  @property
+  def improved(self) -> bool:
+    return any(d > 0 for d in self.deltas.values())
+
+  def to_dict(self) -> Dict[str, Any]:
+    return {
+      "status": self.status,
+      "repo": {"id": self.repo_id, "fullName": self.full_name},
+      "overall": {"before": self.before, "after": self.after},
+      "deltas": self.deltas,
+    }
+
+
+@dataclass
+class DiffSummary:
+  compared: int = 0
+  added: int = 0
+  removed: int = 0
+  changed: int = 0
+  improved: int = 0
+  regressed: int = 0
+
+  def to_dict(self) -> Dict[str, int]:
+    return {
+      "compared": self.compared,
+      "added": self.added,
+      "removed": self.removed,
+      "changed": self.changed,
+      "improved": self.improved,
+      "regressed": self.regressed,
+    }
+
+
+class ScanDiff:
+  """
+  Merge join of two scans' rows, each in key order. Iterating yields RepoDiffs in key
+  order; summary is complete once iteration finishes.
+  dimensions: the dimensions whose moves are reported (default: all).
+  """
+
+  def __init__(
+    self,
+    before: Iterable[ScoreRow],
+    after: Iterable[ScoreRow],
+    threshold: float = DEFAULT_THRESHOLD,
+    dimensions: Optional[Sequence[str]] = None,
+  ) -> None:
+    unknown = [d for d in dimensions or () if d not in DIMENSIONS]
+    if unknown:
+      raise ValueError(f"Unknown dimension(s): {', '.join(unknown)} (expected {', '.join(DIMENSIONS)})")
+    self.before = before
+    self.after = after
+    self.threshold = threshold
+    self.dimensions = tuple(dimensions or DIMENSIONS)
+    self._columns = [(dim, DIMENSIONS.index(dim)) for dim in self.dimensions]
+    self.summary = DiffSummary()
+
+  def __iter__(self) -> Iterator[RepoDiff]:
+    summary = self.summary
+    before, after = _latest(self.before), _latest(self.after)
+    a, b = next(before, None), next(after, None)
+    while a is not None or b is not None:
+      if b is None or (a is not None and a.key < b.key):
+        summary.removed += 1
+        yield RepoDiff("removed", a.repo_id, a.full_name, before=a.scores[0])
+        a = next(before, None)
+      elif a is None or b.key < a.key:
+        summary.added += 1
+        yield RepoDiff("added", b.repo_id, b.full_name, after=b.scores[0])
+        b = next(after, None)
+      else:
+        summary.compared += 1
+        deltas = self._deltas(a.scores, b.scores)
+        if deltas:
+          entry = RepoDiff("changed", b.repo_id, b.full_name, a.scores[0], b.scores[0], deltas)
+          summary.changed += 1
+          summary.improved += entry.improved
+          summary.regressed += entry.regressed
+          yield entry
+        a, b = next(before, None), next(after, None)
+
+  def _deltas(self, old: Tuple[Optional[float], ...], new: Tuple[Optional[float], ...]) -> Dict[str, float]:
+    deltas = {}
+    for dim, i in self._columns:
+      if old[i] is None or new[i] is None:
+        continue
+      delta = new[i] - old[i]
+      if delta and abs(delta) >= self.threshold:
+        deltas[dim] = round(delta, 2)
+    return deltas
+
+
+def diff_scan_files(
+  before: str | Path,
+  after: str | Path,
+  threshold: float = DEFAULT_THRESHOLD,
+  dimensions: Optional[Sequence[str]] = None,
+) -> ScanDiff:
+  """ScanDiff of two scan files (see iter_scan_file for the formats read)."""
+  return ScanDiff(read_rows(before), read_rows(after), threshold=threshold, dimensions=dimensions)
+
+
+def format_entry(entry: RepoDiff) -> str:
+  """One table line: +/- for added/removed repos, ~ with overall and per-dimension moves."""
+  def points(v: Optional[float]) -> str:
+    return "–" if v is None else f"{v:.0f}"
+
+  if entry.status == "added":
+    return f"+ {entry.full_name:<40} overall {points(entry.after)}"
+  if entry.status == "removed":
+    return f"- {entry.full_name:<40} overall {points(entry.before)}"
+  moves = ", ".join(f"{dim} {delta:+.0f}" for dim, delta in entry.deltas.items() if dim != "overall")
+  line = f"~ {entry.full_name:<40} overall {points(entry.before)} -> {points(entry.after)}"
+  return f"{line}  {moves}" if moves else line
@@ -6,14 +6,110 @@ This client is intentionally minimal and read-only.
 
 from __future__ import annotations
 
+import codecs
+import time
 from dataclasses import dataclass
-from typing import Iterable, List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .http_cache import CachedResponse, ResponseCache, make_key, token_fingerprint
+from .metrics import GITHUB_CACHE, record_request, timed
+from .token_pool import PooledToken, TokenPool
 
 
 API_ROOT = "https://api.github.com"
 
+# Response headers kept on cached entries (the body is kept verbatim).
+_CACHED_HEADERS = ("Content-Type", "ETag", "Link", "Last-Modified")
+
+# README bodies beyond this are not downloaded; analysis records readmeTruncated.
+README_MAX_BYTES = 512 * 1024
+README_CHUNK_BYTES = 16 * 1024
+# Media type for a README's raw markdown; GitHub reads it only from the Accept header.
+README_MEDIA_TYPE = "application/vnd.github.raw"
+
+
+class ReadmeStream:
+  """
+  README body decoded as UTF-8 text while it downloads, cut off after max_bytes.
+  Iterate once; `truncated` and `bytes_read` are final after iteration. The connection
+  is released as soon as iteration stops.
+  """
+
+  def __init__(
+    self,
+    chunks: Iterator[bytes],
+    max_bytes: int,
+    on_close: Optional[Callable[[int, Optional[bytes]], None]] = None,
+    close: Optional[Callable[[], None]] = None,
+    keep_body: bool = False,
+  ) -> None:
+    """
+    on_close(bytes_read, body): called once when done; body is the complete raw body
+    if keep_body was set and the README was not truncated, else None.
+    """
+    self._chunks = chunks
+    self.max_bytes = max_bytes
+    self.truncated = False
+    self.bytes_read = 0
+    self._on_close = on_close
+    self._close = close
+    self._keep: Optional[List[bytes]] = [] if keep_body else None
+
+  @classmethod
+  def from_bytes(cls, body: bytes, max_bytes: int, chunk_size: int = README_CHUNK_BYTES) -> "ReadmeStream":
+    return cls((body[i:i + chunk_size] for i in range(0, len(body), chunk_size)), max_bytes)
+
+  def __iter__(self) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    try:
+      for raw in self._chunks:
+        if not raw:
+          continue
+        remaining = self.max_bytes - self.bytes_read
+        if len(raw) > remaining:
+          raw = raw[:remaining]
+          self.truncated = True
+        self.bytes_read += len(raw)
+        if self._keep is not None:
+          self._keep.append(raw)
+        text = decoder.decode(raw)
+        if text:
+          yield text
+        if self.truncated:
+          break
+      if not self.truncated:
+        # Flush a trailing partial character; a cut-off one is simply dropped.
+        text = decoder.decode(b"", final=True)
+        if text:
+          yield text
+    finally:
+      if self._close is not None:
+        self._close()
+      if self._on_close is not None:
+        body = b"".join(self._keep) if self._keep is not None and not self.truncated else None
+        self._on_close(self.bytes_read, body)
+        self._on_close = None
+
+
+def make_session(token: str, pool_maxsize: int = 10) -> requests.Session:
+  """Session with auth headers and a keep-alive connection pool, for one token."""
+  session = requests.Session()
+  session.headers.update(
+    {
+      "Authorization": f"token {token}",
+      "Accept": "application/vnd.github+json",
+      "User-Agent": "github-account-presentation-optimizer",
+    }
+  )
+  adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize)
+  session.mount("https://", adapter)
+  session.mount("http://", adapter)
+  return session
+
 
 @dataclass
 class RepoSummary:
@@ -29,61 +125,334 @@ class RepoSummary:
   default_branch: str
 
 
+@dataclass
+class EventsPage:
+  events: List[dict]
+  etag: Optional[str]
+  poll_interval: Optional[int]  # seconds, from X-Poll-Interval
+  not_modified: bool
+
+
+def _summary_from_item(item: dict) -> RepoSummary:
+  return RepoSummary(
+    id=item["id"],
+    name=item["name"],
+    full_name=item["full_name"],
+    html_url=item["html_url"],
+    private=bool(item.get("private")),
+    description=item.get("description"),
+    topics=item.get("topics") or [],
+    archived=bool(item.get("archived")),
+    pushed_at=item.get("pushed_at"),
+    default_branch=item.get("default_branch") or "main",
+  )
+
+
 class GitHubClient:
-  def __init__(self, token: str, api_root: str = API_ROOT) -> None:
+  def __init__(
+    self,
+    token: str,
+    api_root: str = API_ROOT,
+    session: Optional[requests.Session] = None,
+    cache: Optional[ResponseCache] = None,
+    pool: Optional[TokenPool] = None,
+  ) -> None:
+    """
+    session: optional pre-built session for this token (see make_session), e.g. from a
+    process-wide pool so connections are reused across requests.
+    cache: optional shared ResponseCache; entries are keyed by a token fingerprint.
+    pool: schedule requests over several tokens instead (token and session are ignored).
+    """
     self._api_root = api_root.rstrip("/")
-    self._session = requests.Session()
-    self._session.headers.update(
-      {
-        "Authorization": f"token {token}",
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "github-account-presentation-optimizer",
-      }
+    self._pool = pool
+    self._session = session or (pool.tokens[0].session if pool else make_session(token))
+    self._cache = cache
+    self._token_fp = pool.fingerprint if pool else token_fingerprint(token)
+    self._last_token: Optional[PooledToken] = None
+
+  @classmethod
+  def from_tokens(
+    cls,
+    tokens: Sequence[str],
+    api_root: str = API_ROOT,
+    cache: Optional[ResponseCache] = None,
+  ) -> "GitHubClient":
+    """Client for one token, or a TokenPool over several."""
+    tokens = list(dict.fromkeys(t for t in tokens if t))
+    if len(tokens) == 1:
+      return cls(tokens[0], api_root=api_root, cache=cache)
+    return cls("", api_root=api_root, cache=cache, pool=TokenPool(tokens, make_session))
+
+  def _send(
+    self,
+    url: str,
+    params: Optional[dict],
+    headers: dict,
+    endpoint: str,
+    stream: bool = False,
+    repo: Optional[str] = None,
+  ) -> requests.Response:
+    """
+    One HTTP round trip, recorded in request metrics (status, latency, bytes, rate limit).
+    With stream=True the body is not read here; the caller records the request once the
+    body has been consumed (see ReadmeStream).
+    With a token pool, a response from a revoked or rate-limited token is retried on the
+    next one; repo routes requests for a pinned (private) repo to its token.
+    """
+    if self._pool is None:
+      return self._round_trip(self._session, url, params, headers, endpoint, stream)
+    tried: List[PooledToken] = []
+    while True:
+      token = self._pool.pick(repo, exclude=tried)
+      resp = self._round_trip(token.session, url, params, headers, endpoint, stream)
+      self._last_token = token
+      if not self._pool.observe(token, resp.status_code, resp.headers):
+        return resp
+      if stream:
+        resp.close()
+        self._record_stream(resp, endpoint, 0)
+      tried.append(token)
+
+  def _round_trip(
+    self,
+    session: requests.Session,
+    url: str,
+    params: Optional[dict],
+    headers: dict,
+    endpoint: str,
+    stream: bool,
+  ) -> requests.Response:
+    start = time.perf_counter()
+    try:
+      if stream:
+        resp = session.get(url, params=params or {}, headers=headers, stream=True)
+      else:
+        resp = session.get(url, params=params or {}, headers=headers)
+    except requests.RequestException:
+      record_request(endpoint, 0, time.perf_counter() - start, 0)
+      raise
+    if stream:
+      resp._ghv_started = start  # type: ignore[attr-defined]
+      return resp
+    record_request(
+      endpoint,
+      resp.status_code,
+      time.perf_counter() - start,
+      len(resp.content),
+      self._rate_limit_remaining(resp),
     )
+    return resp
 
-  def _get(self, path: str, params: Optional[dict] = None) -> requests.Response:
+  def _rate_limit_remaining(self, resp: requests.Response) -> Optional[str]:
+    """X-RateLimit-Remaining, or the quota left across a token pool."""
+    if self._pool is not None:
+      remaining = self._pool.remaining()
+      return str(remaining) if remaining is not None else None
+    return resp.headers.get("X-RateLimit-Remaining")
+
+  def _get(
+    self,
+    path: str,
+    params: Optional[dict] = None,
+    endpoint: str = "other",
+    repo: Optional[str] = None,
+  ) -> requests.Response:
+    """
+    GET an API path. endpoint is a low-cardinality label for metrics (e.g. "readme");
+    repo names the repository the path belongs to, for token pinning.
+    """
     url = f"{self._api_root}/{path.lstrip('/')}"
-    resp = self._session.get(url, params=params or {})
+    self._last_token = None
+    if self._cache is None:
+      resp = self._send(url, params, {}, endpoint, repo=repo)
+      resp.raise_for_status()
+      return resp
+
+    key = make_key(self._token_fp, url, params)
+    entry, fresh = self._cache.lookup(key)
+    if entry is not None and fresh:
+      GITHUB_CACHE.inc(result="hit")
+      return self._cached_response(entry, url)
+    headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+    resp = self._send(url, params, headers, endpoint, repo=repo)
+    if resp.status_code == 304 and entry is not None:
+      GITHUB_CACHE.inc(result="revalidated")
+      self._cache.mark_revalidated(key)
+      return self._cached_response(entry, url)
+    GITHUB_CACHE.inc(result="miss")
     resp.raise_for_status()
+    if resp.status_code == 200:
+      self._cache.store(
+        key,
+        CachedResponse(
+          status_code=resp.status_code,
+          content=resp.content,
+          headers={h: resp.headers[h] for h in _CACHED_HEADERS if h in resp.headers},
+          etag=resp.headers.get("ETag"),
+          stored_at=time.monotonic(),
+        ),
+      )
+    return resp
+
+  @staticmethod
+  def _cached_response(entry: CachedResponse, url: str) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = entry.status_code
+    resp._content = entry.content
+    resp.headers = CaseInsensitiveDict(entry.headers)
+    resp.url = url
+    resp.encoding = "utf-8"
     return resp
 
   def list_repos_for_user(self, username: str) -> Iterable[RepoSummary]:
-    page = 1
+    for _, summaries in self.list_repo_pages(username):
+      yield from summaries
+
+  def list_repo_pages(self, username: str, start_page: int = 1) -> Iterator[Tuple[int, List[RepoSummary]]]:
+    """
+    (page number, repos) for each listing page from start_page on, so a caller can
+    record how far the listing got. The last page yielded is empty.
+    """
+    page = start_page
     per_page = 100
     while True:
-      resp = self._get(
-        f"users/{username}/repos",
-        params={"per_page": per_page, "page": page, "sort": "pushed"},
-      )
-      data = resp.json()
-      if not data:
-        break
-      for item in data:
-        yield RepoSummary(
-          id=item["id"],
-          name=item["name"],
-          full_name=item["full_name"],
-          html_url=item["html_url"],
-          private=bool(item.get("private")),
-          description=item.get("description"),
-          topics=item.get("topics") or [],
-          archived=bool(item.get("archived")),
-          pushed_at=item.get("pushed_at"),
-          default_branch=item.get("default_branch") or "main",
+      with timed("list_repos_page"):
+        resp = self._get(
+          f"users/{username}/repos",
+          params={"per_page": per_page, "page": page, "sort": "pushed"},
+          endpoint="list_repos",
         )
+        data = resp.json()
+      summaries = [_summary_from_item(item) for item in data]
+      if self._pool is not None and self._last_token is not None:
+        # Other tokens in the pool cannot see this token's private repos.
+        for summary in summaries:
+          if summary.private:
+            self._pool.pin(summary.full_name, self._last_token)
+      yield page, summaries
+      if not data:
+        return
       page += 1
 
-  def get_readme_markdown(self, repo_full_name: str) -> Optional[str]:
-    """
-    Fetch README as raw markdown. Returns None if not present.
-    """
+  def get_authenticated_login(self) -> Optional[str]:
+    """Login of the account the token belongs to, or None if GitHub rejects the token."""
     try:
-      resp = self._get(
-        f"repos/{repo_full_name}/readme",
-        params={"accept": "application/vnd.github.raw"},
-      )
+      resp = self._get("user", endpoint="user")
+    except requests.HTTPError as exc:
+      if exc.response is not None and exc.response.status_code in (401, 403):
+        return None
+      raise
+    return resp.json().get("login")
+
+  def get_repo(self, repo_full_name: str) -> Optional[RepoSummary]:
+    """Metadata for one repository, or None if it no longer exists (or is not visible)."""
+    try:
+      resp = self._get(f"repos/{repo_full_name}", endpoint="repo", repo=repo_full_name)
     except requests.HTTPError as exc:
       if exc.response is not None and exc.response.status_code == 404:
         return None
       raise
-    return resp.text
+    return _summary_from_item(resp.json())
+
+  def get_events(self, owner: str, org: bool = False, etag: Optional[str] = None, page: int = 1) -> EventsPage:
+    """
+    One page of a user's (or org's) public events, newest first. Bypasses the response
+    cache: a 304 for the given etag is reported as not_modified so pollers can skip work.
+    """
+    path = f"orgs/{owner}/events" if org else f"users/{owner}/events"
+    url = f"{self._api_root}/{path}"
+    headers = {"If-None-Match": etag} if etag else {}
+    resp = self._send(url, {"per_page": 100, "page": page}, headers, "events")
+    poll_interval = None
+    if resp.headers.get("X-Poll-Interval", "").isdigit():
+      poll_interval = int(resp.headers["X-Poll-Interval"])
+    if resp.status_code == 304:
+      return EventsPage(events=[], etag=etag, poll_interval=poll_interval, not_modified=True)
+    resp.raise_for_status()
+    return EventsPage(
+      events=resp.json(),
+      etag=resp.headers.get("ETag"),
+      poll_interval=poll_interval,
+      not_modified=False,
+    )
+
+  def get_readme_stream(
+    self,
+    repo_full_name: str,
+    max_bytes: int = README_MAX_BYTES,
+    chunk_size: int = README_CHUNK_BYTES,
+  ) -> Optional[ReadmeStream]:
+    """
+    Open the README as raw markdown for incremental reading, or None if there is none.
+    At most max_bytes of the body are downloaded; the rest is never read.
+    """
+    url = f"{self._api_root}/repos/{repo_full_name}/readme"
+    key = entry = None
+    headers = {"Accept": README_MEDIA_TYPE}
+    if self._cache is not None:
+      # The media type is part of the key: the JSON envelope is a different body.
+      key = make_key(self._token_fp, url, {"accept": README_MEDIA_TYPE})
+      entry, fresh = self._cache.lookup(key)
+      if entry is not None and fresh:
+        GITHUB_CACHE.inc(result="hit")
+        return ReadmeStream.from_bytes(entry.content, max_bytes, chunk_size)
+      if entry is not None and entry.etag:
+        headers["If-None-Match"] = entry.etag
+
+    resp = self._send(url, None, headers, "readme", stream=True, repo=repo_full_name)
+    if resp.status_code == 304 and entry is not None:
+      resp.close()
+      self._record_stream(resp, "readme", 0)
+      GITHUB_CACHE.inc(result="revalidated")
+      self._cache.mark_revalidated(key)
+      return ReadmeStream.from_bytes(entry.content, max_bytes, chunk_size)
+    if self._cache is not None:
+      GITHUB_CACHE.inc(result="miss")
+    if resp.status_code >= 400:
+      resp.close()
+      self._record_stream(resp, "readme", 0)
+      if resp.status_code == 404:
+        return None
+      resp.raise_for_status()
+
+    def on_close(nbytes: int, body: Optional[bytes]) -> None:
+      self._record_stream(resp, "readme", nbytes)
+      # Only complete bodies are cached, so a cache hit is never silently truncated.
+      if body is not None and key is not None and resp.status_code == 200:
+        self._cache.store(
+          key,
+          CachedResponse(
+            status_code=resp.status_code,
+            content=body,
+            headers={h: resp.headers[h] for h in _CACHED_HEADERS if h in resp.headers},
+            etag=resp.headers.get("ETag"),
+            stored_at=time.monotonic(),
+          ),
+        )
+
+    return ReadmeStream(
+      resp.iter_content(chunk_size),
+      max_bytes,
+      on_close=on_close,
+      close=resp.close,
+      keep_body=key is not None,
+    )
+
+  def _record_stream(self, resp: requests.Response, endpoint: str, nbytes: int) -> None:
+    started = getattr(resp, "_ghv_started", time.perf_counter())
+    record_request(
+      endpoint,
+      resp.status_code,
+      time.perf_counter() - started,
+      nbytes,
+      self._rate_limit_remaining(resp),
+    )
+
+  def get_readme_markdown(self, repo_full_name: str, max_bytes: int = README_MAX_BYTES) -> Optional[str]:
+    """
+    Fetch README as raw markdown. Returns None if not present. Bodies over max_bytes
+    are cut off (see ReadmeStream.truncated for callers that need to know).
+    """
+    with timed("readme_fetch"):
+      stream = self.get_readme_stream(repo_full_name, max_bytes=max_bytes)
+      return None if stream is None else "".join(stream)
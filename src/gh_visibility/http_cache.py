@@ -0,0 +1,124 @@
+"""
+In-memory GitHub response cache with ETag revalidation.
+
+Entries are keyed by (token fingerprint, URL, query params) so a response fetched
+with one token is never served to another. The raw token is never stored.
+Fresh entries (younger than ttl) are served without a request; older entries are
+revalidated with If-None-Match, and a 304 does not count against the rate limit.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+CacheKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+# Rough per-entry bookkeeping cost on top of body and header bytes.
+_ENTRY_OVERHEAD = 256
+
+
+def token_fingerprint(token: str) -> str:
+  """Stable, non-reversible identifier for a token (for cache keys and pool lookups)."""
+  return hashlib.sha256(("gh-visibility:" + token).encode("utf-8")).hexdigest()[:32]
+
+
+def make_key(token_fp: str, url: str, params: Optional[dict]) -> CacheKey:
+  items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+  return (token_fp, url, items)
+
+
+@dataclass
+class CachedResponse:
+  status_code: int
+  content: bytes
+  headers: Dict[str, str]
+  etag: Optional[str]
+  stored_at: float
+
+  @property
+  def size(self) -> int:
+    return len(self.content) + sum(len(k) + len(v) for k, v in self.headers.items()) + _ENTRY_OVERHEAD
+
+
+class ResponseCache:
+  """
+  Thread-safe LRU cache bounded by total bytes.
+  ttl: seconds an entry is served without contacting GitHub.
+  stale_ttl: seconds an entry is kept for ETag revalidation before being dropped.
+  """
+
+  def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 60.0, stale_ttl: float = 3600.0) -> None:
+    self.max_bytes = max_bytes
+    self.ttl = ttl
+    self.stale_ttl = max(stale_ttl, ttl)
+    self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+    self._bytes = 0
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.revalidations = 0
+    self.misses = 0
+
+  def lookup(self, key: CacheKey) -> Tuple[Optional[CachedResponse], bool]:
+    """Return (entry, is_fresh). Expired entries are dropped and reported as a miss."""
+    now = time.monotonic()
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None:
+        self.misses += 1
+        return None, False
+      age = now - entry.stored_at
+      if age > self.stale_ttl:
+        self._remove(key)
+        self.misses += 1
+        return None, False
+      self._entries.move_to_end(key)
+      if age <= self.ttl:
+        self.hits += 1
+        return entry, True
+      return entry, False
+
+  def store(self, key: CacheKey, entry: CachedResponse) -> None:
+    size = entry.size
+    if size > self.max_bytes:
+      return
+    with self._lock:
+      if key in self._entries:
+        self._remove(key)
+      self._entries[key] = entry
+      self._bytes += size
+      while self._bytes > self.max_bytes and self._entries:
+        self._remove(next(iter(self._entries)))
+
+  def mark_revalidated(self, key: CacheKey) -> None:
+    """Reset an entry's age after a 304 Not Modified."""
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is not None:
+        entry.stored_at = time.monotonic()
+        self._entries.move_to_end(key)
+        self.revalidations += 1
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
+      self._bytes = 0
+
+  def stats(self) -> Dict[str, int]:
+    with self._lock:
+      return {
+        "entries": len(self._entries),
+        "bytes": self._bytes,
+        "maxBytes": self.max_bytes,
+        "hits": self.hits,
+        "revalidations": self.revalidations,
+        "misses": self.misses,
+      }
+
+  def _remove(self, key: CacheKey) -> None:
+    entry = self._entries.pop(key)
+    self._bytes -= entry.size
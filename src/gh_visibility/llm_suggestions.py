@@ -9,6 +9,8 @@ import os
 import re
 from typing import Any, Dict, List
 
+from .metrics import LLM_REQUESTS, timed
+
 try:
   import requests
 except ImportError:
@@ -48,9 +50,11 @@ def generate_llm_suggestions(
   If API key is missing or request fails, returns [].
   """
   if requests is None:
+    LLM_REQUESTS.inc(outcome="skipped")
     return []
   key = _get_api_key(api_key)
   if not key:
+    LLM_REQUESTS.inc(outcome="skipped")
     return []
 
   name = repo.get("name") or repo.get("fullName") or "?"
@@ -72,21 +76,23 @@ In 1-3 short bullet points, suggest concrete improvements (e.g. a better repo de
   try:
     base = _get_api_base()
     url = f"{base}/chat/completions"
-    resp = requests.post(
-      url,
-      headers={
-        "Authorization": f"Bearer {key}",
-        "Content-Type": "application/json",
-      },
-      json={
-        "model": model,
-        "messages": [{"role": "user", "content": prompt}],
-        "max_tokens": 400,
-      },
-      timeout=30,
-    )
-    resp.raise_for_status()
-    data = resp.json()
+    with timed("llm"):
+      resp = requests.post(
+        url,
+        headers={
+          "Authorization": f"Bearer {key}",
+          "Content-Type": "application/json",
+        },
+        json={
+          "model": model,
+          "messages": [{"role": "user", "content": prompt}],
+          "max_tokens": 400,
+        },
+        timeout=30,
+      )
+      resp.raise_for_status()
+      data = resp.json()
+    LLM_REQUESTS.inc(outcome="ok")
     content = (
       (data.get("choices") or [{}])[0]
       .get("message", {})
@@ -109,4 +115,5 @@ In 1-3 short bullet points, suggest concrete improvements (e.g. a better repo de
       })
     return out[:5]
   except Exception:
+    LLM_REQUESTS.inc(outcome="error")
     return []
@@ -0,0 +1,280 @@
+"""
+Local git engine for `gh-visibility scan-local`: score clones and bare mirrors on disk
+without the GitHub API.
+
+Everything is read from git objects at the default branch (origin/HEAD for clones,
+HEAD for bare repos), so working-tree edits and checkouts do not matter: the README
+is streamed from `git cat-file` under the same byte budget as API scans, LICENSE /
+CONTRIBUTING / issue and PR templates fill the hasLicense, hasContributing,
+hasIssueTemplates and hasPrTemplate analysis fields, and the branch head's commit
+time stands in for pushedAt. Repos are scored across a process pool.
+"""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import os
+import re
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .analyzer import Analyzer
+from .duplicates import Signature
+from .models import RepoEvaluation
+from .readme import ReadmeAccumulator
+from .registry import thaw
+
+README_MAX_BYTES = 512 * 1024
+# Below this many repos, process startup costs more than it saves.
+PARALLEL_MIN_REPOS = 32
+
+# GitHub looks for community files in the root, docs/ and .github/.
+_README_RE = re.compile(r"^readme(\.[a-z0-9]+)?$", re.IGNORECASE)
+_LICENSE_RE = re.compile(r"^(licen[cs]e|copying)([.-].*)?$", re.IGNORECASE)
+_CONTRIBUTING_RE = re.compile(r"^contributing(\.[a-z0-9]+)?$", re.IGNORECASE)
+_ISSUE_TEMPLATE_RE = re.compile(r"^(issue_template(\.[a-z0-9]+)?|issue_template/.+)$", re.IGNORECASE)
+_PR_TEMPLATE_RE = re.compile(
+  r"^(pull_request_template(\.[a-z0-9]+)?|pull_request_template/.+)$", re.IGNORECASE
+)
+_GITHUB_REMOTE_RE = re.compile(r"github\.com[:/]([^/]+)/(.+?)(?:\.git)?/?$")
+_DEFAULT_BARE_DESCRIPTION = "Unnamed repository;"
+
+
+class LocalRepoError(RuntimeError):
+  """A directory looked like a git repository but could not be read."""
+
+
+def _git(repo: Path, *args: str) -> str:
+  proc = subprocess.run(
+    ["git", *args],
+    cwd=repo,
+    capture_output=True,
+    text=True,
+    encoding="utf-8",
+    errors="replace",
+  )
+  if proc.returncode != 0:
+    raise LocalRepoError(f"{repo}: git {' '.join(args)}: {proc.stderr.strip()}")
+  return proc.stdout
+
+
+def _is_bare(path: Path) -> bool:
+  return (path / "HEAD").is_file() and (path / "objects").is_dir() and (path / "refs").is_dir()
+
+
+def find_repositories(root: str | Path) -> Iterator[Path]:
+  """Clones (with .git) and bare repos under root, without descending into either."""
+  root = Path(root)
+  if (root / ".git").exists() or _is_bare(root):
+    yield root
+    return
+  for dirpath, dirnames, _ in os.walk(root):
+    here = Path(dirpath)
+    found = []
+    for d in sorted(dirnames):
+      candidate = here / d
+      if (candidate / ".git").exists() or _is_bare(candidate):
+        found.append(d)
+        yield candidate
+    dirnames[:] = sorted(d for d in dirnames if d not in found and not d.startswith("."))
+
+
+def _default_ref(repo: Path, bare: bool) -> Tuple[str, str]:
+  """(ref to read, branch name) for the repo's default branch."""
+  if not bare:
+    try:
+      ref = _git(repo, "symbolic-ref", "-q", "--short", "refs/remotes/origin/HEAD").strip()
+      if ref:
+        return ref, ref.split("/", 1)[-1]
+    except LocalRepoError:
+      pass
+  branch = _git(repo, "symbolic-ref", "-q", "--short", "HEAD").strip()
+  return branch, branch
+
+
+def _identity(repo: Path, bare: bool) -> Tuple[str, str, str]:
+  """(owner, name, html url) from a github.com origin, else from the directory."""
+  name = repo.name[:-4] if bare and repo.name.endswith(".git") else repo.name
+  try:
+    url = _git(repo, "config", "--get", "remote.origin.url").strip()
+  except LocalRepoError:
+    url = ""
+  m = _GITHUB_REMOTE_RE.search(url)
+  if m:
+    return m.group(1), m.group(2), f"https://github.com/{m.group(1)}/{m.group(2)}"
+  return repo.resolve().parent.name, name, repo.resolve().as_uri()
+
+
+def local_repo_id(full_name: str) -> int:
+  """
+  Stable stand-in for a GitHub repo id: 63 bits of a hash of the full name, so ids of
+  different repos practically never collide (scan diffs join on id) and still fit a
+  signed 64-bit SQLite INTEGER.
+  """
+  digest = hashlib.blake2b(full_name.encode("utf-8"), digest_size=8).digest()
+  return int.from_bytes(digest, "big") >> 1
+
+
+def _description(repo: Path, bare: bool) -> Optional[str]:
+  path = repo / "description" if bare else repo / ".git" / "description"
+  try:
+    text = path.read_text(encoding="utf-8").strip()
+  except OSError:
+    return None
+  return None if not text or text.startswith(_DEFAULT_BARE_DESCRIPTION) else text
+
+
+def _community_files(paths: List[str]) -> Tuple[Dict[str, bool], Optional[str]]:
+  """(presence flags, README path) from a listing of root, docs/ and .github/."""
+  facts = {"hasLicense": False, "hasContributing": False, "hasIssueTemplates": False, "hasPrTemplate": False}
+  readmes: Dict[str, str] = {}
+  for path in paths:
+    prefix = next((p for p in (".github/", "docs/") if path.startswith(p)), "")
+    rel = path[len(prefix):]
+    if "/" not in rel:
+      if _README_RE.match(rel) and prefix not in readmes:
+        readmes[prefix] = path
+      if _LICENSE_RE.match(rel) and prefix == "":
+        facts["hasLicense"] = True
+      if _CONTRIBUTING_RE.match(rel):
+        facts["hasContributing"] = True
+    if _ISSUE_TEMPLATE_RE.match(rel):
+      facts["hasIssueTemplates"] = True
+    if _PR_TEMPLATE_RE.match(rel):
+      facts["hasPrTemplate"] = True
+  # Same precedence as github.com: .github/, then root, then docs/.
+  return facts, readmes.get(".github/") or readmes.get("") or readmes.get("docs/")
+
+
+def _read_readme(repo: Path, ref: str, path: str, max_bytes: int) -> Tuple[Dict[str, Any], Optional[Signature]]:
+  """Stream a blob through ReadmeAccumulator, reading at most max_bytes: (fields, MinHash)."""
+  acc = ReadmeAccumulator()
+  decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+  read = 0
+  truncated = False
+  with subprocess.Popen(
+    ["git", "cat-file", "blob", f"{ref}:{path}"],
+    cwd=repo,
+    stdout=subprocess.PIPE,
+    stderr=subprocess.DEVNULL,
+  ) as proc:
+    assert proc.stdout is not None
+    while True:
+      chunk = proc.stdout.read(min(16 * 1024, max_bytes - read + 1))
+      if not chunk:
+        break
+      if read + len(chunk) > max_bytes:
+        chunk = chunk[: max_bytes - read]
+        truncated = True
+      read += len(chunk)
+      acc.feed(decoder.decode(chunk))
+      if truncated:
+        proc.kill()
+        break
+    if not truncated:
+      acc.feed(decoder.decode(b"", final=True))
+  return acc.finish(truncated=truncated), acc.signature()
+
+
+def read_local_repo(
+  path: str | Path,
+  max_bytes: int = README_MAX_BYTES,
+) -> Tuple[Dict[str, Any], Dict[str, Any], Optional[Signature]]:
+  """
+  (repo dict in the shape of analyzer.repo_from_summary, known analysis fields, README
+  MinHash) for one clone or bare repo. Raises LocalRepoError for repos without commits.
+  """
+  repo_path = Path(path)
+  bare = _is_bare(repo_path) and not (repo_path / ".git").exists()
+  ref, branch = _default_ref(repo_path, bare)
+  try:
+    _git(repo_path, "rev-parse", "--verify", "-q", f"{ref}^{{commit}}")
+  except LocalRepoError:
+    raise LocalRepoError(f"{repo_path}: no commits on {branch or 'HEAD'}") from None
+  committed_at = _git(repo_path, "show", "-s", "--format=%cI", ref).strip()
+  listing = _git(
+    repo_path, "ls-tree", "--name-only", ref, "--",
+    ".", ".github/", "docs/", ".github/ISSUE_TEMPLATE/", ".github/PULL_REQUEST_TEMPLATE/",
+  ).splitlines()
+  facts, readme_path = _community_files(listing)
+
+  owner, name, html_url = _identity(repo_path, bare)
+  full_name = f"{owner}/{name}"
+  repo = {
+    "id": local_repo_id(full_name),
+    "name": name,
+    "fullName": full_name,
+    "htmlUrl": html_url,
+    "private": False,
+    "description": _description(repo_path, bare),
+    "topics": [],
+    "archived": False,
+    "pushedAt": committed_at,
+    "defaultBranch": branch,
+  }
+  analysis: Dict[str, Any] = dict(facts)
+  signature = None
+  if readme_path:
+    readme, signature = _read_readme(repo_path, ref, readme_path, max_bytes)
+    analysis.update(readme)
+  return repo, analysis, signature
+
+
+_worker_analyzer: Optional[Analyzer] = None
+
+
+def _init_worker(preset: Dict[str, Any], rubric_path: Optional[str]) -> None:
+  global _worker_analyzer
+  _worker_analyzer = Analyzer(rubric_path=rubric_path, preset=preset)
+
+
+def _score_one(path: str, mode: str, max_bytes: int) -> Tuple[str, Optional[RepoEvaluation], Optional[str]]:
+  """Worker entrypoint: (path, evaluation, error)."""
+  try:
+    repo, facts, signature = read_local_repo(path, max_bytes=max_bytes)
+  except (LocalRepoError, OSError) as e:
+    return path, None, str(e)
+  assert _worker_analyzer is not None
+  ev = _worker_analyzer.evaluate_repo(repo, None, mode=mode, known_analysis=facts, readme_signature=signature)
+  return path, ev, None
+
+
+def scan_local(
+  root: str | Path,
+  preset: Mapping[str, Any],
+  rubric_path: Optional[str | Path] = None,
+  mode: str = "analyze",
+  benchmark_mode: str = "none",
+  jobs: Optional[int] = None,
+  readme_max_bytes: int = README_MAX_BYTES,
+) -> Tuple[List[Dict[str, Any]], List[Tuple[str, str]]]:
+  """
+  Score every repository under root. Returns (evaluations in path order, [(path, error)]
+  for directories that could not be read, e.g. empty repos).
+  jobs: worker processes (default: CPU count); 1 disables multiprocessing.
+  """
+  paths = [str(p) for p in find_repositories(root)]
+  preset = thaw(preset)
+  rubric = str(rubric_path) if rubric_path else None
+  workers = jobs or os.cpu_count() or 1
+
+  if workers <= 1 or len(paths) < PARALLEL_MIN_REPOS:
+    _init_worker(preset, rubric)
+    results = [_score_one(p, mode, readme_max_bytes) for p in paths]
+  else:
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(preset, rubric)) as pool:
+      results = list(pool.map(
+        _score_one,
+        paths,
+        [mode] * len(paths),
+        [readme_max_bytes] * len(paths),
+        chunksize=max(1, len(paths) // (workers * 4)),
+      ))
+
+  evaluations = [ev for _, ev, _ in results if ev is not None]
+  errors = [(p, err) for p, _, err in results if err is not None]
+  analyzer = Analyzer(rubric_path=rubric_path, preset=preset)
+  return analyzer.finalize(evaluations, benchmark_mode=benchmark_mode, mode=mode), errors
@@ -0,0 +1,281 @@
+"""
+Lightweight in-process metrics: counters, gauges and latency histograms per scan stage
+and per GitHub request, rendered in the Prometheus text format (backend /metrics)
+or as a short summary (CLI --metrics). No external dependency.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+# (endpoint, status, seconds, bytes) for each GitHub round trip.
+RequestObserver = Callable[[str, int, float, int], None]
+
+
+def _escape(value: str) -> str:
+  return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+  parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+  if extra:
+    parts.append(extra)
+  return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(v: float) -> str:
+  return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+class _Metric:
+  kind = ""
+
+  def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+    self.name = name
+    self.help = help_text
+    self.labelnames = tuple(labelnames)
+    self._lock = threading.Lock()
+
+  def _key(self, labels: Dict[str, str]) -> LabelValues:
+    return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+  def render(self) -> List[str]:
+    raise NotImplementedError
+
+  def reset(self) -> None:
+    raise NotImplementedError
+
+
+class Counter(_Metric):
+  kind = "counter"
+
+  def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+    super().__init__(name, help_text, labelnames)
+    self._values: Dict[LabelValues, float] = {}
+
+  def inc(self, amount: float = 1.0, **labels: str) -> None:
+    key = self._key(labels)
+    with self._lock:
+      self._values[key] = self._values.get(key, 0.0) + amount
+
+  def values(self) -> Dict[LabelValues, float]:
+    with self._lock:
+      return dict(self._values)
+
+  def render(self) -> List[str]:
+    return [
+      f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+      for k, v in sorted(self.values().items())
+    ]
+
+  def reset(self) -> None:
+    with self._lock:
+      self._values.clear()
+
+
+class Gauge(Counter):
+  kind = "gauge"
+
+  def set(self, value: float, **labels: str) -> None:
+    key = self._key(labels)
+    with self._lock:
+      self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+  kind = "histogram"
+
+  def __init__(
+    self,
+    name: str,
+    help_text: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+  ) -> None:
+    super().__init__(name, help_text, labelnames)
+    self.buckets = tuple(sorted(buckets))
+    # label values -> [per-bucket counts..., +Inf count], sum
+    self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+  def observe(self, value: float, **labels: str) -> None:
+    key = self._key(labels)
+    with self._lock:
+      counts, total = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+      for i, bound in enumerate(self.buckets):
+        if value <= bound:
+          counts[i] += 1
+          break
+      else:
+        counts[-1] += 1
+      total[0] += value
+
+  def stats(self) -> Dict[LabelValues, Tuple[int, float]]:
+    """label values -> (count, sum)."""
+    with self._lock:
+      return {k: (sum(c), t[0]) for k, (c, t) in self._series.items()}
+
+  def render(self) -> List[str]:
+    with self._lock:
+      series = {k: (list(c), t[0]) for k, (c, t) in self._series.items()}
+    lines = []
+    for key, (counts, total) in sorted(series.items()):
+      cumulative = 0
+      for bound, n in zip(self.buckets, counts):
+        cumulative += n
+        le = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+        lines.append(f"{self.name}_bucket{le} {cumulative}")
+      cumulative += counts[-1]
+      inf = _format_labels(self.labelnames, key, 'le="+Inf"')
+      lines.append(f"{self.name}_bucket{inf} {cumulative}")
+      lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+      lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+    return lines
+
+  def reset(self) -> None:
+    with self._lock:
+      self._series.clear()
+
+
+class MetricsRegistry:
+  def __init__(self) -> None:
+    self._metrics: Dict[str, _Metric] = {}
+
+  def _register(self, metric: _Metric) -> _Metric:
+    self._metrics[metric.name] = metric
+    return metric
+
+  def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+    return self._register(Counter(name, help_text, labelnames))  # type: ignore[return-value]
+
+  def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return self._register(Gauge(name, help_text, labelnames))  # type: ignore[return-value]
+
+  def histogram(
+    self,
+    name: str,
+    help_text: str,
+    labelnames: Sequence[str] = (),
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+  ) -> Histogram:
+    return self._register(Histogram(name, help_text, labelnames, buckets))  # type: ignore[return-value]
+
+  def render_prometheus(self) -> str:
+    lines: List[str] = []
+    for metric in self._metrics.values():
+      lines.append(f"# HELP {metric.name} {metric.help}")
+      lines.append(f"# TYPE {metric.name} {metric.kind}")
+      lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+  def reset(self) -> None:
+    for metric in self._metrics.values():
+      metric.reset()
+
+
+METRICS = MetricsRegistry()
+
+STAGE_SECONDS = METRICS.histogram(
+  "ghv_stage_duration_seconds",
+  "Time spent per scan stage (list_repos_page, readme_fetch, normalize, score, suggestions, llm, render, store_write).",
+  ["stage"],
+)
+GITHUB_REQUESTS = METRICS.counter(
+  "ghv_github_requests_total",
+  "GitHub API requests by endpoint and HTTP status.",
+  ["endpoint", "status"],
+)
+GITHUB_REQUEST_SECONDS = METRICS.histogram(
+  "ghv_github_request_duration_seconds",
+  "GitHub API request latency by endpoint.",
+  ["endpoint"],
+)
+GITHUB_RESPONSE_BYTES = METRICS.counter(
+  "ghv_github_response_bytes_total",
+  "Response body bytes received from the GitHub API by endpoint.",
+  ["endpoint"],
+)
+GITHUB_CACHE = METRICS.counter(
+  "ghv_github_cache_total",
+  "Response cache lookups by result (hit, revalidated, miss).",
+  ["result"],
+)
+GITHUB_RATE_LIMIT_REMAINING = METRICS.gauge(
+  "ghv_github_rate_limit_remaining",
+  "Last X-RateLimit-Remaining value seen from the GitHub API.",
+)
+LLM_REQUESTS = METRICS.counter(
+  "ghv_llm_requests_total",
+  "LLM suggestion requests by outcome (ok, error, skipped).",
+  ["outcome"],
+)
+
+
+_request_observers: List[RequestObserver] = []
+
+
+def add_request_observer(fn: RequestObserver) -> None:
+  """Also pass every recorded request to fn (e.g. to keep raw latencies for percentiles)."""
+  _request_observers.append(fn)
+
+
+def remove_request_observer(fn: RequestObserver) -> None:
+  if fn in _request_observers:
+    _request_observers.remove(fn)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+  """Record the duration of the wrapped block under ghv_stage_duration_seconds{stage}."""
+  start = time.perf_counter()
+  try:
+    yield
+  finally:
+    STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def record_request(
+  endpoint: str,
+  status: int,
+  seconds: float,
+  nbytes: int,
+  rate_limit_remaining: Optional[str] = None,
+) -> None:
+  """Record one GitHub API round trip (including 304 revalidations)."""
+  GITHUB_REQUESTS.inc(endpoint=endpoint, status=str(status))
+  GITHUB_REQUEST_SECONDS.observe(seconds, endpoint=endpoint)
+  GITHUB_RESPONSE_BYTES.inc(nbytes, endpoint=endpoint)
+  for observer in list(_request_observers):
+    observer(endpoint, status, seconds, nbytes)
+  if rate_limit_remaining is not None:
+    try:
+      GITHUB_RATE_LIMIT_REMAINING.set(float(rate_limit_remaining))
+    except ValueError:
+      pass
+
+
+def summary_lines() -> List[str]:
+  """Human-readable summary of stage timings, requests and cache use (CLI --metrics)."""
+  lines = ["Stage timings:"]
+  for (stage,), (count, total) in sorted(STAGE_SECONDS.stats().items()):
+    avg_ms = total / count * 1000 if count else 0.0
+    lines.append(f"  {stage:<16} {count:>7}x  total {total:8.3f}s  avg {avg_ms:8.2f}ms")
+  requests = GITHUB_REQUESTS.values()
+  if requests:
+    lines.append("GitHub requests:")
+    for (endpoint, status), n in sorted(requests.items()):
+      lines.append(f"  {endpoint:<16} {status:>4}  {int(n):>7}")
+    total_bytes = sum(GITHUB_RESPONSE_BYTES.values().values())
+    lines.append(f"  bytes received   {int(total_bytes)}")
+  cache = GITHUB_CACHE.values()
+  if cache:
+    lines.append("Cache: " + ", ".join(f"{r} {int(n)}" for (r,), n in sorted(cache.items())))
+  remaining = GITHUB_RATE_LIMIT_REMAINING.values().get(())
+  if remaining is not None:
+    lines.append(f"Rate limit remaining: {int(remaining)}")
+  return lines
@@ -21,6 +21,8 @@ class RepoEvaluation:
   analysis: Dict[str, Any]
   scores: Dict[str, Any]  # dimension id -> DimensionScore or overall
   suggestions: List[Dict[str, Any]] = field(default_factory=list)
+  # MinHash of the README (duplicates.py); used by account-level passes, not serialized.
+  readme_signature: Optional[bytes] = None
 
   def to_dict(self) -> Dict[str, Any]:
     def serialize_score(v: Any) -> Any:
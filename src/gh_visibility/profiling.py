@@ -0,0 +1,173 @@
+"""
+Scan profiling for `gh-visibility scan --profile`.
+
+ScanProfile measures wall time per stage (from the stage histograms in metrics),
+GitHub request count, bytes and p50/p95 latency, and the slowest repos, then prints
+a breakdown to stderr. With --profile-out it also writes a cProfile dump (.prof /
+.pstats, for snakeviz or pstats) or a sampled collapsed-stack file (.folded /
+.collapsed / .txt, for flamegraph.pl or speedscope).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import sys
+import threading
+import time
+from collections import Counter as _Tally
+from pathlib import Path
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from .metrics import STAGE_SECONDS, add_request_observer, remove_request_observer
+
+CPROFILE_SUFFIXES = (".prof", ".pstats")
+COLLAPSED_SUFFIXES = (".folded", ".collapsed", ".txt")
+SLOWEST_REPOS = 5
+
+
+def percentile(values: List[float], pct: float) -> float:
+  """Nearest-rank percentile of values (0 for an empty list)."""
+  if not values:
+    return 0.0
+  ordered = sorted(values)
+  rank = max(1, -(-len(ordered) * pct // 100))
+  return ordered[int(rank) - 1]
+
+
+class StackSampler:
+  """
+  Samples one thread's Python stack every interval seconds and counts identical
+  stacks, for flame graphs. Collapsed format: "frame;frame;frame count" per line.
+  """
+
+  def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005) -> None:
+    self.thread_id = thread_id or threading.get_ident()
+    self.interval = interval
+    self.samples: _Tally = _Tally()
+    self._stop = threading.Event()
+    self._thread: Optional[threading.Thread] = None
+
+  def start(self) -> None:
+    self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+    self._thread.start()
+
+  def stop(self) -> None:
+    self._stop.set()
+    if self._thread is not None:
+      self._thread.join()
+
+  def _run(self) -> None:
+    while not self._stop.wait(self.interval):
+      frame = sys._current_frames().get(self.thread_id)
+      stack = []
+      while frame is not None:
+        code = frame.f_code
+        stack.append(f"{Path(code.co_filename).name}:{code.co_name}")
+        frame = frame.f_back
+      if stack:
+        self.samples[";".join(reversed(stack))] += 1
+
+  def write_collapsed(self, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+      for stack, count in self.samples.most_common():
+        f.write(f"{stack} {count}\n")
+
+
+class ScanProfile:
+  """Collects one scan's timings; use start(), repo_done() per repo, stop(), report()."""
+
+  def __init__(self, out_path: Optional[str] = None) -> None:
+    self.out_path = out_path
+    self.wall = 0.0
+    self.requests: List[Tuple[str, int, float, int]] = []
+    self.repo_seconds: List[Tuple[str, float]] = []
+    self._start = 0.0
+    self._mark: Optional[float] = None
+    self._stages_before: Dict[Tuple[str, ...], Tuple[int, float]] = {}
+    self._stages: Dict[str, Tuple[int, float]] = {}
+    self._lock = threading.Lock()
+    self._cprofile: Optional[cProfile.Profile] = None
+    self._sampler: Optional[StackSampler] = None
+    if out_path:
+      suffix = Path(out_path).suffix.lower()
+      if suffix in CPROFILE_SUFFIXES:
+        self._cprofile = cProfile.Profile()
+      elif suffix in COLLAPSED_SUFFIXES:
+        self._sampler = StackSampler()
+      else:
+        raise ValueError(
+          f"--profile-out must end in one of {', '.join(CPROFILE_SUFFIXES + COLLAPSED_SUFFIXES)}"
+        )
+
+  def _on_request(self, endpoint: str, status: int, seconds: float, nbytes: int) -> None:
+    with self._lock:
+      self.requests.append((endpoint, status, seconds, nbytes))
+
+  def on_progress(self, phase: str, done: int, total: Optional[int]) -> None:
+    """Analyzer progress callback; starts the per-repo clock when evaluation begins."""
+    if phase == "evaluating" and done == 0:
+      self._mark = time.perf_counter()
+
+  def repo_done(self, full_name: str) -> None:
+    now = time.perf_counter()
+    if self._mark is not None:
+      self.repo_seconds.append((full_name, now - self._mark))
+    self._mark = now
+
+  def start(self) -> None:
+    self._stages_before = STAGE_SECONDS.stats()
+    add_request_observer(self._on_request)
+    if self._sampler is not None:
+      self._sampler.start()
+    if self._cprofile is not None:
+      self._cprofile.enable()
+    self._start = time.perf_counter()
+
+  def stop(self) -> None:
+    self.wall = time.perf_counter() - self._start
+    if self._cprofile is not None:
+      self._cprofile.disable()
+      self._cprofile.dump_stats(self.out_path)
+    if self._sampler is not None:
+      self._sampler.stop()
+      self._sampler.write_collapsed(self.out_path)
+    remove_request_observer(self._on_request)
+    for key, (count, total) in STAGE_SECONDS.stats().items():
+      prev_count, prev_total = self._stages_before.get(key, (0, 0.0))
+      if count > prev_count:
+        self._stages[key[0]] = (count - prev_count, total - prev_total)
+
+  def report(self, stream: TextIO = sys.stderr) -> None:
+    w = stream.write
+    wall = self.wall or 1e-9
+    w(f"\nProfile: wall {self.wall:.3f}s\n")
+    w(f"  {'stage':<16} {'calls':>7} {'total s':>9} {'% wall':>7} {'avg ms':>9}\n")
+    for stage, (count, total) in sorted(self._stages.items(), key=lambda kv: -kv[1][1]):
+      w(f"  {stage:<16} {count:>7} {total:>9.3f} {total / wall * 100:>6.1f}% {total / count * 1000:>9.2f}\n")
+
+    latencies = [r[2] for r in self.requests]
+    nbytes = sum(r[3] for r in self.requests)
+    w(f"GitHub requests: {len(self.requests)}, {nbytes / 1024:.1f} KiB")
+    if latencies:
+      w(
+        f", latency p50 {percentile(latencies, 50) * 1000:.1f} ms"
+        f" / p95 {percentile(latencies, 95) * 1000:.1f} ms"
+        f" / max {max(latencies) * 1000:.1f} ms"
+      )
+    w("\n")
+    by_endpoint: Dict[str, List[float]] = {}
+    for endpoint, _, seconds, _ in self.requests:
+      by_endpoint.setdefault(endpoint, []).append(seconds)
+    for endpoint, values in sorted(by_endpoint.items()):
+      w(
+        f"  {endpoint:<16} {len(values):>7}  p50 {percentile(values, 50) * 1000:8.1f} ms"
+        f"  p95 {percentile(values, 95) * 1000:8.1f} ms\n"
+      )
+
+    if self.repo_seconds:
+      w("Slowest repos:\n")
+      for name, seconds in sorted(self.repo_seconds, key=lambda r: -r[1])[:SLOWEST_REPOS]:
+        w(f"  {seconds * 1000:9.1f} ms  {name}\n")
+    if self.out_path:
+      kind = "cProfile stats" if self._cprofile is not None else "collapsed stacks"
+      w(f"Wrote {kind} to {self.out_path}\n")
@@ -0,0 +1,85 @@
+"""
+Incremental README analysis.
+
+ReadmeAccumulator derives the README fields of `analysis` (word and heading counts,
+sections, intro check) from markdown fed in arbitrary chunks, so a README can be
+analyzed while it downloads without holding the whole body. Feeding the full text
+in one call gives the same result. It also builds the README's MinHash signature for
+near-duplicate detection (see duplicates.py).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .duplicates import MinHashSketch, Signature
+
+# Everything str.splitlines() treats as a line boundary.
+_LINE_BREAKS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+class ReadmeAccumulator:
+  def __init__(self, sketch: bool = True) -> None:
+    """sketch: also build the MinHash signature (skip it when only the fields are needed)."""
+    self.words = 0
+    self.heading_count = 0
+    self.sections: List[str] = []
+    self.first_para = ""
+    self.has_content = False
+    self.chars = 0
+    self.sketch: Optional[MinHashSketch] = MinHashSketch() if sketch else None
+    self._partial = ""
+
+  def feed(self, chunk: str) -> None:
+    """Consume the next piece of markdown. Lines split across chunks are handled."""
+    if not chunk:
+      return
+    self.chars += len(chunk)
+    lines = (self._partial + chunk).splitlines(keepends=True)
+    # A line is only complete once its terminator has arrived.
+    if lines and lines[-1][-1] not in _LINE_BREAKS:
+      self._partial = lines.pop()
+    else:
+      self._partial = ""
+    for line in lines:
+      self._line(line)
+
+  def _line(self, line: str) -> None:
+    self.words += len(line.split())
+    s = line.strip()
+    if not s:
+      return
+    self.has_content = True
+    if self.sketch is not None:
+      self.sketch.update(s)
+    if s.startswith("# ") or s.startswith("## "):
+      self.heading_count += 1
+      self.sections.append(s.lstrip("# ").strip())
+    if not self.first_para and not s.startswith("#"):
+      self.first_para = s
+
+  def finish(self, truncated: bool = False) -> Dict[str, Any]:
+    """README fields for `analysis`. truncated: the body was cut at a byte budget."""
+    if self._partial:
+      self._line(self._partial)
+      self._partial = ""
+    intro = self.first_para.lower()
+    return {
+      "hasReadme": self.has_content,
+      "readmeHeadingCount": self.heading_count,
+      "readmeWords": self.words,
+      "readmeSections": list(self.sections),
+      "introHasWhatWhoPlatform": "what" in intro or "who" in intro or len(self.first_para) > 80,
+      "readmeTruncated": truncated,
+    }
+
+  def signature(self) -> Optional[Signature]:
+    """MinHash signature of the text fed so far (call after finish); None if not sketched."""
+    return self.sketch.signature() if self.sketch is not None else None
+
+
+def analyze_readme(text: str, truncated: bool = False) -> Dict[str, Any]:
+  """README fields for `analysis` from complete markdown."""
+  acc = ReadmeAccumulator(sketch=False)
+  acc.feed(text)
+  return acc.finish(truncated=truncated)
@@ -0,0 +1,285 @@
+"""
+In-process registry of presets and the scoring rubric.
+
+Every preset in presets/ is loaded and validated against schema/preset.schema.json
+once, then handed out as an immutable mapping shared by the CLI and backend. The
+registry can watch the presets directory and swap in a new snapshot atomically when
+files change; a reload that fails validation keeps the previous snapshot.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from .presets import PRESETS_DIR
+
+_SCHEMA_DIR = Path(__file__).resolve().parents[2] / "schema"
+PRESET_SCHEMA_PATH = _SCHEMA_DIR / "preset.schema.json"
+RUBRIC_PATH = _SCHEMA_DIR / "rubric.json"
+
+try:
+  import jsonschema
+except ImportError:
+  jsonschema = None
+
+
+class PresetValidationError(ValueError):
+  """One or more presets do not match the preset schema."""
+
+  def __init__(self, errors: Dict[str, List[str]]) -> None:
+    self.errors = errors
+    lines = [f"{pid}: {msg}" for pid, msgs in sorted(errors.items()) for msg in msgs]
+    super().__init__("Invalid preset(s):\n  " + "\n  ".join(lines))
+
+
+_JSON_TYPES = {
+  "object": dict,
+  "array": list,
+  "string": str,
+  "boolean": bool,
+  "integer": int,
+  "number": (int, float),
+}
+
+
+def _check(value: Any, schema: Mapping[str, Any], path: str, errors: List[str]) -> None:
+  """Validate the JSON Schema subset used by schema/preset.schema.json."""
+  expected = schema.get("type")
+  if expected:
+    py_type = _JSON_TYPES.get(expected)
+    ok = isinstance(value, py_type) if py_type else True
+    if expected in ("integer", "number") and isinstance(value, bool):
+      ok = False
+    if not ok:
+      errors.append(f"{path or '/'}: expected {expected}, got {type(value).__name__}")
+      return
+  if "minimum" in schema and isinstance(value, (int, float)) and value < schema["minimum"]:
+    errors.append(f"{path}: {value} is less than minimum {schema['minimum']}")
+  if isinstance(value, dict):
+    for key in schema.get("required", []):
+      if key not in value:
+        errors.append(f"{path or '/'}: missing required property '{key}'")
+    props = schema.get("properties", {})
+    for key, item in value.items():
+      if key in props:
+        _check(item, props[key], f"{path}/{key}", errors)
+      elif schema.get("additionalProperties") is False:
+        errors.append(f"{path or '/'}: unexpected property '{key}'")
+  if isinstance(value, list) and "items" in schema:
+    for i, item in enumerate(value):
+      _check(item, schema["items"], f"{path}/{i}", errors)
+
+
+def validate_preset(data: Any, schema: Mapping[str, Any]) -> List[str]:
+  """Return a list of validation errors (empty if valid). Uses jsonschema when installed."""
+  if jsonschema is not None:
+    validator = jsonschema.Draft202012Validator(schema)
+    return [
+      f"/{'/'.join(str(p) for p in err.absolute_path)}: {err.message}"
+      for err in validator.iter_errors(data)
+    ]
+  errors: List[str] = []
+  _check(data, schema, "", errors)
+  return errors
+
+
+def freeze(value: Any) -> Any:
+  """Deep-freeze parsed JSON: dicts become read-only mappings, lists become tuples."""
+  if isinstance(value, dict):
+    return MappingProxyType({k: freeze(v) for k, v in value.items()})
+  if isinstance(value, list):
+    return tuple(freeze(v) for v in value)
+  return value
+
+
+def thaw(value: Any) -> Any:
+  """Mutable copy of a frozen value (e.g. for JSON responses or editing)."""
+  if isinstance(value, Mapping):
+    return {k: thaw(v) for k, v in value.items()}
+  if isinstance(value, tuple):
+    return [thaw(v) for v in value]
+  return value
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+  presets: Mapping[str, Mapping[str, Any]]
+  rubric: Mapping[str, Any]
+  signature: Tuple[Tuple[str, int, int], ...]
+  errors: Mapping[str, List[str]] = field(default_factory=dict)
+
+
+def _read_preset(
+  path: Path, schema: Mapping[str, Any], default_id: Optional[str] = None
+) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+  """Parsed preset file and its validation errors (no data when there are errors)."""
+  try:
+    with open(path, encoding="utf-8") as f:
+      data = json.load(f)
+  except (OSError, ValueError) as e:
+    return None, [f"cannot read {path.name}: {e}"]
+  if not isinstance(data, dict):
+    return None, [f"/: expected object, got {type(data).__name__}"]
+  if default_id is not None:
+    data.setdefault("id", default_id)
+  problems = validate_preset(data, schema) if schema else []
+  if problems:
+    return None, problems
+  return data, []
+
+
+def _dir_signature(paths: List[Path]) -> Tuple[Tuple[str, int, int], ...]:
+  sig = []
+  for p in paths:
+    try:
+      st = p.stat()
+    except FileNotFoundError:
+      continue
+    sig.append((str(p), st.st_mtime_ns, st.st_size))
+  return tuple(sorted(sig))
+
+
+class PresetRegistry:
+  def __init__(
+    self,
+    presets_dir: Optional[Path] = None,
+    schema_path: Optional[Path] = None,
+    rubric_path: Optional[Path] = None,
+  ) -> None:
+    self.presets_dir = Path(presets_dir or PRESETS_DIR)
+    self.schema_path = Path(schema_path or PRESET_SCHEMA_PATH)
+    self.rubric_path = Path(rubric_path or RUBRIC_PATH)
+    self.last_reload_error: Optional[str] = None
+    self._failed_signature: Optional[Tuple[Tuple[str, int, int], ...]] = None
+    self._lock = threading.Lock()
+    self._watcher: Optional[threading.Thread] = None
+    self._stop = threading.Event()
+    self._snapshot = self._build()
+    if self._snapshot.errors:
+      raise PresetValidationError(dict(self._snapshot.errors))
+
+  def _watched_paths(self) -> List[Path]:
+    presets = sorted(self.presets_dir.glob("*.json")) if self.presets_dir.is_dir() else []
+    return presets + [self.schema_path, self.rubric_path]
+
+  def _schema(self) -> Dict[str, Any]:
+    if not self.schema_path.is_file():
+      return {}
+    with open(self.schema_path, encoding="utf-8") as f:
+      return json.load(f)
+
+  def _build(self) -> RegistrySnapshot:
+    paths = self._watched_paths()
+    signature = _dir_signature(paths)
+    schema = self._schema()
+    rubric: Dict[str, Any] = {}
+    if self.rubric_path.is_file():
+      with open(self.rubric_path, encoding="utf-8") as f:
+        rubric = json.load(f)
+
+    presets: Dict[str, Mapping[str, Any]] = {}
+    errors: Dict[str, List[str]] = {}
+    for path in paths:
+      if path.parent != self.presets_dir:
+        continue
+      preset_id = path.stem
+      data, problems = _read_preset(path, schema)
+      if data is None:
+        errors[preset_id] = problems
+        continue
+      if data.get("id") != preset_id:
+        data["id"] = preset_id
+      presets[preset_id] = freeze(data)
+    return RegistrySnapshot(
+      presets=MappingProxyType(presets),
+      rubric=freeze(rubric),
+      signature=signature,
+      errors=MappingProxyType(errors),
+    )
+
+  @property
+  def snapshot(self) -> RegistrySnapshot:
+    return self._snapshot
+
+  @property
+  def rubric(self) -> Mapping[str, Any]:
+    return self._snapshot.rubric
+
+  def ids(self) -> List[str]:
+    return sorted(self._snapshot.presets)
+
+  def get(self, preset_id: str) -> Mapping[str, Any]:
+    """Frozen preset by id. Raises FileNotFoundError like load_preset for unknown ids."""
+    preset = self._snapshot.presets.get(preset_id)
+    if preset is None:
+      raise FileNotFoundError(
+        f"Preset not found: {preset_id} (looked for {self.presets_dir / (preset_id + '.json')})"
+      )
+    return preset
+
+  def load_file(self, path: Path) -> Mapping[str, Any]:
+    """
+    A preset file from outside presets/, validated like the registry's own and frozen.
+    Its id defaults to the file name. Raises PresetValidationError.
+    """
+    path = Path(path)
+    data, problems = _read_preset(path, self._schema(), default_id=path.stem)
+    if data is None:
+      raise PresetValidationError({path.stem: problems})
+    return freeze(data)
+
+  def reload_if_changed(self) -> bool:
+    """Rebuild the snapshot if any preset, the schema or the rubric changed on disk."""
+    with self._lock:
+      signature = _dir_signature(self._watched_paths())
+      if signature in (self._snapshot.signature, self._failed_signature):
+        return False
+      snapshot = self._build()
+      if snapshot.errors:
+        self._failed_signature = snapshot.signature
+        self.last_reload_error = str(PresetValidationError(dict(snapshot.errors)))
+        return False
+      self._failed_signature = None
+      self.last_reload_error = None
+      self._snapshot = snapshot
+      return True
+
+  def start_watching(self, interval: float = 2.0) -> None:
+    """Poll the presets directory every interval seconds in a daemon thread."""
+    if self._watcher is not None:
+      return
+    self._stop.clear()
+
+    def loop() -> None:
+      while not self._stop.wait(interval):
+        try:
+          self.reload_if_changed()
+        except Exception as e:
+          self.last_reload_error = str(e)
+
+    self._watcher = threading.Thread(target=loop, name="preset-registry-watch", daemon=True)
+    self._watcher.start()
+
+  def stop_watching(self) -> None:
+    self._stop.set()
+    if self._watcher is not None:
+      self._watcher.join()
+      self._watcher = None
+
+
+_default: Optional[PresetRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> PresetRegistry:
+  """Process-wide registry for the repo's presets/ directory, loaded on first use."""
+  global _default
+  with _default_lock:
+    if _default is None:
+      _default = PresetRegistry()
+    return _default
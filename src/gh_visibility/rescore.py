@@ -0,0 +1,127 @@
+"""
+Offline rescoring from saved raw inputs.
+
+`gh-visibility scan --save-raw <path>` writes one JSON line per repo with the raw
+repo metadata and README markdown (as far as it was downloaded, with a flag when the
+byte budget cut it off). `gh-visibility rescore --from <path>` reruns
+normalization, scoring and suggestions on those inputs under any preset or rubric,
+without network access, so preset weights can be tuned in seconds.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, TextIO
+
+from .analyzer import Analyzer
+from .models import RepoEvaluation
+from .registry import thaw
+
+# Below this many repos, process startup costs more than it saves.
+PARALLEL_MIN_REPOS = 200
+
+
+def write_raw_input(
+  stream: TextIO,
+  repo: Dict[str, Any],
+  readme_raw: Optional[str],
+  fetched_at: Optional[datetime] = None,
+  truncated: bool = False,
+) -> None:
+  """Append one raw input record (repo metadata + README) as a JSON line."""
+  record = {
+    "repo": repo,
+    "readme": readme_raw,
+    "readmeTruncated": truncated,
+    "fetchedAt": (fetched_at or datetime.now(timezone.utc)).isoformat(),
+  }
+  stream.write(json.dumps(record) + "\n")
+
+
+def read_raw_inputs(path: str | Path) -> Iterator[Dict[str, Any]]:
+  """Yield raw input records from a file written by write_raw_input."""
+  with open(path, encoding="utf-8") as f:
+    for line_no, line in enumerate(f, start=1):
+      line = line.strip()
+      if not line:
+        continue
+      record = json.loads(line)
+      if not isinstance(record, dict) or "repo" not in record:
+        raise ValueError(f"{path}:{line_no}: not a raw input record")
+      yield record
+
+
+def _parse_fetched_at(value: Optional[str]) -> Optional[datetime]:
+  if not value:
+    return None
+  try:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+  except ValueError:
+    return None
+
+
+def _rescore_chunk(
+  rubric_path: Optional[str],
+  preset: Dict[str, Any],
+  mode: str,
+  records: List[Dict[str, Any]],
+) -> List[RepoEvaluation]:
+  """Worker entrypoint: score a chunk of raw records with one Analyzer instance."""
+  analyzer = Analyzer(rubric_path=rubric_path, preset=preset)
+  return [
+    analyzer.evaluate_repo(
+      r["repo"],
+      r.get("readme"),
+      mode=mode,
+      now=_parse_fetched_at(r.get("fetchedAt")),
+      readme_truncated=bool(r.get("readmeTruncated")),
+    )
+    for r in records
+  ]
+
+
+def rescore(
+  path: str | Path,
+  preset: Mapping[str, Any],
+  rubric_path: Optional[str | Path] = None,
+  mode: str = "analyze",
+  benchmark_mode: str = "none",
+  jobs: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+  """
+  Rescore saved raw inputs. Recency is computed relative to each record's fetch time,
+  so an unchanged preset reproduces the original scan's scores.
+  jobs: worker processes (default: CPU count); 1 disables multiprocessing.
+  Output order matches the input file.
+  """
+  records = list(read_raw_inputs(path))
+  # Registry presets are read-only mappings, which cannot be sent to worker processes.
+  preset = thaw(preset)
+  rubric = str(rubric_path) if rubric_path else None
+  workers = jobs or os.cpu_count() or 1
+
+  if workers <= 1 or len(records) < PARALLEL_MIN_REPOS:
+    evaluations = _rescore_chunk(rubric, preset, mode, records)
+  else:
+    # A few chunks per worker keeps cores busy when README sizes are uneven.
+    n_chunks = workers * 4
+    size = max(1, -(-len(records) // n_chunks))
+    chunks = [records[i:i + size] for i in range(0, len(records), size)]
+    evaluations = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+      for part in pool.map(
+        _rescore_chunk,
+        [rubric] * len(chunks),
+        [preset] * len(chunks),
+        [mode] * len(chunks),
+        chunks,
+      ):
+        evaluations.extend(part)
+
+  return Analyzer(rubric_path=rubric_path, preset=preset).finalize(
+    evaluations, benchmark_mode=benchmark_mode, mode=mode
+  )
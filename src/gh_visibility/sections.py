@@ -0,0 +1,161 @@
+"""
+README section matching against preset readmeRequirements.
+
+Heading text and preset section names are normalized the same way (case, markdown,
+punctuation, leading numbering), and known synonyms collapse into one section key
+("Getting Started" and "Quickstart" both count as "Quick Start"). A heading names a
+section when it starts with one of its phrases (after any emoji or numbering), so
+"Why the build fails" is not "Why I Built This" through its last words; single-word
+synonyms ("why", "about", "changes") are too common in ordinary headings and must be
+the whole heading. A SectionMatcher precompiles every phrase of every preset's
+requiredSections / recommendedSections, plus the synonyms, into one table keyed by
+word sequence, so a single pass over a README's headings (a few dict lookups per
+heading) finds every section any preset asks for; checking a particular preset is
+then a set lookup.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .registry import PresetRegistry, RegistrySnapshot, default_registry
+
+# Section key (a normalized preset section name) -> other ways READMEs title it.
+SYNONYMS: Dict[str, Tuple[str, ...]] = {
+  "what this is": ("what is this", "what is it", "what it does", "about", "overview", "introduction", "intro"),
+  "who this is for": ("who is this for", "who it is for", "who its for", "audience", "target audience"),
+  "why i built this": ("why", "motivation", "background", "why i made this"),
+  "quick start": ("quickstart", "getting started", "get started", "start here"),
+  "installation": ("install", "installing", "setup", "set up"),
+  "usage": ("how to use", "using"),
+  "how to run it": ("how to run", "running locally", "run locally", "running it", "local development"),
+  "configuration": ("config", "configuring", "settings", "options"),
+  "key features": ("features", "feature", "highlights"),
+  "tech stack": ("stack", "built with", "technologies", "technology"),
+  "examples": ("example", "samples", "demo", "demos"),
+  "api or reference": ("api", "reference", "api reference", "api docs"),
+  "contributing": ("contribute", "contributions", "how to contribute", "contribution guidelines"),
+  "license": ("licence", "licensing"),
+  "changelog": ("change log", "changes", "release notes", "history"),
+  "faq": ("frequently asked questions", "questions"),
+  "code of conduct": ("conduct",),
+  "sponsors": ("sponsor", "sponsorship", "funding", "backers"),
+  "deployment": ("deploy", "deploying"),
+  "architecture": ("design", "how it works"),
+  "operational notes": ("operations", "runbook", "ops"),
+  "slos and alerts": ("slos", "slo", "alerts", "alerting", "monitoring"),
+  "ownership": ("owners", "owner", "maintainers", "contacts"),
+  "what i would improve next": ("roadmap", "next steps", "future work", "future improvements", "todo"),
+  "related projects": ("related", "see also", "alternatives"),
+}
+
+# Link and image targets and HTML tags; other markdown goes with the punctuation.
+_MARKUP = re.compile(r"!?\[([^\]]*)\]\([^)]*\)|<[^>]+>")
+_NON_WORD = re.compile(r"[^a-z0-9\n]+")
+_NUMBERING = re.compile(r"^ ?(?:\d+ )+", re.MULTILINE)
+
+
+def normalize_heading(text: str) -> str:
+  """
+  Lowercase words of a heading without markdown, punctuation or leading numbers.
+  Newlines are kept, so several headings can be normalized as one string.
+  """
+  if "](" in text or "<" in text:
+    text = _MARKUP.sub(r"\1", text)
+  text = text.lower().replace("'", "")
+  return _NUMBERING.sub("", _NON_WORD.sub(" ", text)).strip()
+
+
+def _phrase_keys() -> Dict[str, str]:
+  keys = {}
+  for key, phrases in SYNONYMS.items():
+    keys[key] = key
+    keys.update(dict.fromkeys(phrases, key))
+  return keys
+
+
+_PHRASE_KEYS = _phrase_keys()
+
+
+@lru_cache(maxsize=1024)
+def section_key(name: str) -> str:
+  """Key a preset section name matches under (its synonym group, or its normalized text)."""
+  norm = normalize_heading(name)
+  return _PHRASE_KEYS.get(norm, norm)
+
+
+class SectionMatcher:
+  """Every known section phrase in one table; see the module docstring."""
+
+  def __init__(self, section_names: Iterable[str] = ()) -> None:
+    phrases: Dict[str, str] = {}
+    whole: Dict[str, str] = {}
+    for phrase, key in _PHRASE_KEYS.items():
+      (whole if phrase != key and " " not in phrase else phrases)[phrase] = key
+    # A section a preset names itself also matches as a heading's first words.
+    for name in section_names:
+      norm = normalize_heading(name)
+      phrases.setdefault(norm, whole.pop(norm, None) or section_key(name))
+    phrases.pop("", None)
+    self._keys = phrases
+    self._whole = whole
+    # Every leading run of words of a phrase ("api", "api reference"), to stop early.
+    self._prefixes = {" ".join(p.split()[:n]) for p in phrases for n in range(1, len(p.split()) + 1)}
+
+  def match(self, headings: Sequence[str]) -> Set[str]:
+    """Section keys of every phrase that starts a heading (whole words), or is all of it."""
+    keys, prefixes, whole = self._keys, self._prefixes, self._whole
+    found = set()
+    for line in normalize_heading("\n".join(headings)).split("\n"):
+      words = line.split()
+      if not words:
+        continue
+      key = whole.get(" ".join(words))
+      if key is not None:
+        found.add(key)
+        continue
+      phrase, j = words[0], 1
+      while phrase in prefixes:
+        key = keys.get(phrase)
+        if key is not None:
+          found.add(key)
+        if j == len(words):
+          break
+        phrase = f"{phrase} {words[j]}"
+        j += 1
+    return found
+
+  @staticmethod
+  def missing(found: Set[str], sections: Sequence[str]) -> List[str]:
+    """Names from sections (as the preset spells them) whose key is not in found."""
+    return [s for s in sections if section_key(s) not in found]
+
+
+def preset_section_names(preset: Mapping[str, Any]) -> Tuple[str, ...]:
+  rr = preset.get("readmeRequirements") or {}
+  return tuple(rr.get("requiredSections") or []) + tuple(rr.get("recommendedSections") or [])
+
+
+def _registry_section_names(snapshot: RegistrySnapshot) -> Tuple[str, ...]:
+  names: List[str] = []
+  for preset_id in sorted(snapshot.presets):
+    names.extend(preset_section_names(snapshot.presets[preset_id]))
+  return tuple(names)
+
+
+@lru_cache(maxsize=16)
+def _matcher(names: Tuple[str, ...]) -> SectionMatcher:
+  return SectionMatcher(names)
+
+
+def matcher_for(preset: Optional[Mapping[str, Any]] = None, registry: Optional[PresetRegistry] = None) -> SectionMatcher:
+  """
+  Shared matcher over every section of the registry's current snapshot (default: the
+  process-wide registry, so hot-reloaded presets are picked up), plus preset's own
+  (e.g. a draft preset file).
+  """
+  names = _registry_section_names((registry or default_registry()).snapshot)
+  extra = tuple(n for n in preset_section_names(preset or {}) if n not in names)
+  return _matcher(names + extra)
@@ -125,6 +125,15 @@ def generate_suggestions(
       )
 
   # README structure
+  missing = analysis.get("readmeMissingSections") or []
+
+  def add_missing_sections() -> None:
+    message = f"README is missing sections this preset expects: {', '.join(missing)}."
+    also = analysis.get("readmeMissingRecommendedSections") or []
+    if also:
+      message += f" Also consider: {', '.join(also)}."
+    add("readmeStructure", "suggestion", message, {"kind": "readme", "sections": missing})
+
   if get_score("readmeStructure") < SUGGEST_THRESHOLD:
     rr = preset.get("readmeRequirements") or {}
     required = rr.get("requiredSections") or []
@@ -142,9 +151,11 @@ def generate_suggestions(
         add(
           "readmeStructure",
           "suggestion",
-          f"README is short ({words} words). Expand with clear sections (e.g. {', '.join(required[:4])}).",
-          None,
+          f"README is short ({words} words). Expand with clear sections (e.g. {', '.join((missing or required)[:4])}).",
+          {"kind": "readme", "sections": missing} if missing else None,
         )
+      elif missing:
+        add_missing_sections()
       elif headings < 2:
         add(
           "readmeStructure",
@@ -159,6 +170,9 @@ def generate_suggestions(
           "Ensure the first paragraph answers what the project is, who it's for, and which platform it targets.",
           None,
         )
+  elif missing and analysis.get("hasReadme"):
+    # Required sections are the preset's call even when the README otherwise scores well.
+    add_missing_sections()
 
   # Activity recency (informational only)
   if get_score("activityRecency") < SUGGEST_THRESHOLD:
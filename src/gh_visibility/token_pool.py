@@ -0,0 +1,154 @@
+"""
+Token pools for fleet-scale scans.
+
+One token gets 5,000 core API requests per hour. A TokenPool spreads requests over
+several: each request goes to the usable token with the most quota left (from the
+X-RateLimit-Remaining / X-RateLimit-Reset headers of its last response). A token that
+runs out rests until its window resets and a revoked one (401) is dropped; either way
+the request fails over to the next token. Private repos are pinned to the token that
+listed them, since other tokens cannot see them. With N tokens the hourly budget is N
+times larger.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Collection, Dict, List, Mapping, Optional, Sequence
+
+from .http_cache import token_fingerprint
+
+
+def pool_fingerprint(tokens: Sequence[str]) -> str:
+  """
+  Identity of a set of tokens (order and duplicates ignored), for cache keys and pool
+  lookups. A single token's is its own token_fingerprint, so it shares cache entries.
+  """
+  fps = sorted({token_fingerprint(t) for t in tokens if t})
+  return fps[0] if len(fps) == 1 else token_fingerprint(",".join(fps))
+
+
+class TokenPoolExhausted(RuntimeError):
+  """No token in the pool can serve the request right now."""
+
+  def __init__(self, message: str, reset_at: Optional[float] = None) -> None:
+    super().__init__(message)
+    self.reset_at = reset_at  # epoch seconds when the first token becomes usable again
+
+  def retry_after(self, now: Optional[float] = None) -> Optional[int]:
+    """Whole seconds until reset_at (at least 1), or None if no token will recover."""
+    if self.reset_at is None:
+      return None
+    return max(1, math.ceil(self.reset_at - (time.time() if now is None else now)))
+
+  def describe(self, now: Optional[float] = None) -> str:
+    """The message plus when a token is usable again, for people."""
+    if self.reset_at is None:
+      return str(self)
+    at = datetime.fromtimestamp(self.reset_at, timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+    return f"{self}; a token is usable again at {at} (in {self.retry_after(now)}s)"
+
+
+class PooledToken:
+  """One token's session and what its last response said about its quota."""
+
+  def __init__(self, fingerprint: str, session: Any) -> None:
+    self.fingerprint = fingerprint
+    self.session = session
+    self.remaining: Optional[int] = None  # None until the first response
+    self.resting_until = 0.0  # epoch seconds
+    self.revoked = False
+
+  def usable(self, now: float) -> bool:
+    return not self.revoked and now >= self.resting_until
+
+
+class TokenPool:
+  """Thread-safe scheduler over several tokens; see the module docstring."""
+
+  def __init__(self, tokens: Sequence[str], session_factory: Callable[[str], Any]) -> None:
+    """session_factory(token) builds the authenticated session for one token (see make_session)."""
+    self.tokens: List[PooledToken] = []
+    seen = set()
+    for token in tokens:
+      fp = token_fingerprint(token)
+      if token and fp not in seen:
+        seen.add(fp)
+        self.tokens.append(PooledToken(fp, session_factory(token)))
+    if not self.tokens:
+      raise ValueError("TokenPool needs at least one token")
+    self.fingerprint = pool_fingerprint(tokens)
+    self._pins: Dict[str, PooledToken] = {}
+    self._lock = threading.Lock()
+
+  def __len__(self) -> int:
+    return len(self.tokens)
+
+  def pick(self, repo: Optional[str] = None, exclude: Collection[PooledToken] = ()) -> PooledToken:
+    """
+    Token for the next request: the pinned one for a private repo, else the usable token
+    with the most quota left (untried tokens first). Raises TokenPoolExhausted.
+    """
+    now = time.time()
+    with self._lock:
+      pinned = self._pins.get(repo) if repo else None
+      if pinned is not None and not pinned.revoked:
+        if pinned in exclude or not pinned.usable(now):
+          raise TokenPoolExhausted(f"the only token that can see {repo} is rate limited", pinned.resting_until)
+        return pinned
+      candidates = [t for t in self.tokens if t not in exclude and t.usable(now)]
+      if not candidates:
+        waiting = [t.resting_until for t in self.tokens if not t.revoked]
+        if not waiting:
+          raise TokenPoolExhausted("every token in the pool was rejected (revoked or invalid)")
+        raise TokenPoolExhausted("every token in the pool is rate limited", min(waiting))
+      return max(candidates, key=lambda t: float("inf") if t.remaining is None else t.remaining)
+
+  def pin(self, repo: str, token: PooledToken) -> None:
+    """Route later requests for repo (e.g. a private one) to token."""
+    with self._lock:
+      self._pins[repo] = token
+
+  def observe(self, token: PooledToken, status: int, headers: Mapping[str, str]) -> bool:
+    """
+    Update token from a response. Returns True if the request should be retried on
+    another token (revoked, or primary / secondary rate limit).
+    """
+    now = time.time()
+    with self._lock:
+      remaining = _int_header(headers, "X-RateLimit-Remaining")
+      reset = _int_header(headers, "X-RateLimit-Reset")
+      if remaining is not None:
+        token.remaining = remaining
+      if status == 401:
+        token.revoked = True
+        return True
+      if status in (403, 429):
+        retry_after = _int_header(headers, "Retry-After")
+        if retry_after is not None:
+          token.resting_until = now + retry_after
+          return True
+        if remaining == 0:
+          token.resting_until = float(reset) if reset is not None else now + 60
+          return True
+        return False
+      if remaining == 0 and reset is not None:
+        # Out of quota after this request: stop picking it before it gets a 403.
+        token.resting_until = float(reset)
+      return False
+
+  def remaining(self) -> Optional[int]:
+    """Quota left across usable tokens, or None before any token reported it."""
+    with self._lock:
+      known = [t.remaining for t in self.tokens if not t.revoked and t.remaining is not None]
+      return sum(known) if known else None
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+  try:
+    value = headers.get(name)
+    return int(value) if value is not None else None
+  except ValueError:
+    return None
@@ -0,0 +1,259 @@
+"""
+Concrete topic recommendations.
+
+TopicIndex is built once per preset: its vocabulary is every topic listed in
+TOPIC_TAXONOMY.md plus the preset's topicProfile, and an inverted index maps keywords
+(a topic's own name, a few common aliases, and the parts of hyphenated topics) to the
+topics they point at. The taxonomy's "topic combination" blocks seed co-occurrence
+counts, and TopicIndex.with_account adds the pairs of topics set together on the
+scanned repos, so recommendations follow how the account already tags similar work.
+
+A repo's keywords come from its name, description and README headings. recommend
+sums keyword hits, how often the repo's current topics appear with each candidate,
+and a bonus for the preset's recommendedTopics; requiredTopics that are missing always
+come first. A lookup is a few dict reads per keyword, well under a millisecond.
+"""
+
+from __future__ import annotations
+
+import copy
+import re
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+TAXONOMY_PATH = Path(__file__).resolve().parents[2] / "TOPIC_TAXONOMY.md"
+
+# Score a candidate needs before it is recommended: one exact keyword hit, a preset
+# recommendation, or a topic set alongside one of the repo's topics at least half the time.
+MIN_SCORE = 0.5
+PART_WEIGHT = 0.4  # split between all topics sharing the part ("plugin" -> 4 topics)
+PRESET_BONUS = 0.5
+COOCCURRENCE_WEIGHT = 1.0
+# Topics seen on fewer repos than this do not predict others.
+MIN_SUPPORT = 2
+RELATED_PER_TOPIC = 10
+DEFAULT_LIMIT = 5
+MAX_HEADINGS = 100
+
+# Spellings people use in descriptions and headings for taxonomy topics.
+_ALIASES: Dict[str, str] = {
+  "js": "javascript",
+  "ts": "typescript",
+  "node": "nodejs",
+  "node.js": "nodejs",
+  "golang": "go",
+  "c++": "cpp",
+  "c#": "csharp",
+  "next.js": "nextjs",
+  "nuxt.js": "nuxt",
+  "vue.js": "vue",
+  "k8s": "kubernetes",
+  "ml": "machine-learning",
+  "cli": "cli-tool",
+  "command-line": "cli-tool",
+  "vscode": "vscode-extension",
+  "vs-code": "vscode-extension",
+  "docker": "docker-image",
+  "dockerfile": "docker-image",
+  "terraform": "terraform-module",
+  "wordpress": "wordpress-plugin",
+  "scraper": "scraping",
+  "tests": "testing",
+  "docs": "documentation",
+  "dataviz": "data-visualization",
+  "ci": "ci-cd",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+_TOPIC_RE = re.compile(r"`([a-z0-9][a-z0-9-]*)`")
+
+
+def keywords(text: str) -> Set[str]:
+  """Lowercase words of text plus adjacent pairs joined by '-' (matches "machine-learning")."""
+  words = _TOKEN_RE.findall(text.lower())
+  out = set(words)
+  out.update(f"{a}-{b}" for a, b in zip(words, words[1:]))
+  return out
+
+
+def repo_keywords(repo: Mapping[str, Any], analysis: Mapping[str, Any]) -> Set[str]:
+  """Keywords from the repo name, description and README section headings."""
+  parts = [repo.get("name") or "", repo.get("description") or ""]
+  parts.extend((analysis.get("readmeSections") or [])[:MAX_HEADINGS])
+  return keywords("\n".join(parts))
+
+
+@lru_cache(maxsize=4)
+def load_taxonomy(path: Path = TAXONOMY_PATH) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, ...], ...]]:
+  """
+  (topics, combinations) from the taxonomy guide: topics from its bulleted lists, and
+  one tuple per fenced example set outside the "Poor" examples. Topics the guide calls
+  too generic are left out. A missing file gives empty results, so recommendations
+  fall back to the preset and the account.
+  """
+  try:
+    text = path.read_text(encoding="utf-8")
+  except OSError:
+    return (), ()
+  topics: Dict[str, None] = {}
+  combos: List[Tuple[str, ...]] = []
+  generic: Set[str] = set()
+  heading = label = ""
+  fence: Optional[List[str]] = None
+  for line in text.splitlines():
+    s = line.strip()
+    if s.startswith("```"):
+      if fence is None:
+        fence = []
+        continue
+      combo = tuple(t.strip() for t in ",".join(fence).split(",") if t.strip())
+      if "poor" not in heading:
+        combos.append(combo)
+        topics.update(dict.fromkeys(combo))
+      elif "generic" in label:
+        generic.update(combo)
+      fence = None
+    elif fence is not None:
+      fence.append(s)
+    elif s.startswith("#"):
+      heading, label = s.lower(), ""
+    elif s.startswith("**"):
+      label = s.lower()
+    elif s.startswith("- "):
+      topics.update(dict.fromkeys(_TOPIC_RE.findall(s)))
+  return tuple(t for t in topics if t not in generic), tuple(combos)
+
+
+class TopicIndex:
+  """Inverted keyword -> topic index plus co-occurrence; see the module docstring."""
+
+  def __init__(
+    self,
+    topics: Iterable[str],
+    combinations_seen: Iterable[Sequence[str]] = (),
+    recommended: Sequence[str] = (),
+    required: Sequence[str] = (),
+  ) -> None:
+    self.required = [t.lower() for t in required]
+    self.recommended = [t.lower() for t in recommended]
+    vocabulary = dict.fromkeys(t.lower() for t in topics)
+    vocabulary.update(dict.fromkeys(self.recommended + self.required))
+    self.topics = list(vocabulary)
+    self._index = _build_index(self.topics)
+    # Aliases that are topics themselves ("docs"): recommend one spelling, never both.
+    self._synonyms: Dict[str, Set[str]] = {}
+    for alias, topic in _ALIASES.items():
+      if alias in vocabulary and topic in vocabulary:
+        self._synonyms.setdefault(alias, set()).add(topic)
+        self._synonyms.setdefault(topic, set()).add(alias)
+    self._topic_counts: Counter = Counter()
+    self._pair_counts: Counter = Counter()
+    for combo in combinations_seen:
+      self._observe(combo)
+    self._related = self._relate()
+
+  @classmethod
+  def for_preset(cls, preset: Mapping[str, Any], taxonomy_path: Path = TAXONOMY_PATH) -> TopicIndex:
+    """Index over the taxonomy and the preset's topicProfile."""
+    topics, combos = load_taxonomy(taxonomy_path)
+    tp = preset.get("topicProfile") or {}
+    return cls(
+      topics,
+      combos,
+      recommended=tp.get("recommendedTopics") or [],
+      required=tp.get("requiredTopics") or [],
+    )
+
+  def with_account(self, topic_sets: Iterable[Sequence[str]]) -> TopicIndex:
+    """Copy of this index that also counts the topics set together on the account's repos."""
+    other = copy.copy(self)
+    other._topic_counts = Counter(self._topic_counts)
+    other._pair_counts = Counter(self._pair_counts)
+    for topics in topic_sets:
+      other._observe(topics)
+    other._related = other._relate()
+    return other
+
+  def recommend(
+    self,
+    keyword_set: Set[str],
+    current: Sequence[str],
+    limit: int = DEFAULT_LIMIT,
+  ) -> List[str]:
+    """Up to limit topics to add, best first; missing requiredTopics lead."""
+    have = {t.lower() for t in current}
+    out = [t for t in self.required if t not in have][:limit]
+    if len(out) >= limit:
+      return out
+    scores: Dict[str, float] = {}
+    for kw in keyword_set:
+      for topic, weight in self._index.get(kw, ()):
+        scores[topic] = scores.get(topic, 0.0) + weight
+    # Strongest association per candidate, so a repo with many topics is not over-credited.
+    related: Dict[str, float] = {}
+    for t in have:
+      for topic, p in self._related.get(t, ()):
+        related[topic] = max(related.get(topic, 0.0), p)
+    for topic, p in related.items():
+      scores[topic] = scores.get(topic, 0.0) + COOCCURRENCE_WEIGHT * p
+    for topic in self.recommended:
+      scores[topic] = scores.get(topic, 0.0) + PRESET_BONUS
+    taken = have.union(out)
+    for t in list(taken):
+      taken.update(self._synonyms.get(t, ()))
+    ranked = sorted(
+      ((s, t) for t, s in scores.items() if s >= MIN_SCORE),
+      key=lambda st: (-st[0], st[1]),
+    )
+    for _, topic in ranked:
+      if len(out) >= limit:
+        break
+      if topic not in taken:
+        out.append(topic)
+        taken.add(topic)
+        taken.update(self._synonyms.get(topic, ()))
+    return out
+
+  def _observe(self, topics: Sequence[str]) -> None:
+    unique = sorted({t.lower() for t in topics if t})
+    self._topic_counts.update(unique)
+    self._pair_counts.update(combinations(unique, 2))
+
+  def _relate(self) -> Dict[str, List[Tuple[str, float]]]:
+    """topic -> [(other, P(other | topic))], strongest RELATED_PER_TOPIC first."""
+    related: Dict[str, List[Tuple[str, float]]] = {}
+    counts = self._topic_counts
+    for (a, b), n in self._pair_counts.items():
+      if counts[a] >= MIN_SUPPORT:
+        related.setdefault(a, []).append((b, n / counts[a]))
+      if counts[b] >= MIN_SUPPORT:
+        related.setdefault(b, []).append((a, n / counts[b]))
+    for topic, pairs in related.items():
+      pairs.sort(key=lambda tp: (-tp[1], tp[0]))
+      del pairs[RELATED_PER_TOPIC:]
+    return related
+
+
+def _build_index(topics: Sequence[str]) -> Dict[str, List[Tuple[str, float]]]:
+  exact: Dict[str, Set[str]] = {}
+  parts: Dict[str, Set[str]] = {}
+  known = set(topics)
+  for topic in topics:
+    exact.setdefault(topic, set()).add(topic)
+    if "-" in topic:
+      for part in topic.split("-"):
+        parts.setdefault(part, set()).add(topic)
+  for alias, topic in _ALIASES.items():
+    if topic in known:
+      exact.setdefault(alias, set()).add(topic)
+  index: Dict[str, Dict[str, float]] = {}
+  for kw, targets in parts.items():
+    for topic in targets:
+      index.setdefault(kw, {})[topic] = PART_WEIGHT / len(targets)
+  for kw, targets in exact.items():
+    for topic in targets:
+      index.setdefault(kw, {})[topic] = 1.0
+  return {kw: sorted(weights.items()) for kw, weights in index.items()}
@@ -0,0 +1,179 @@
+"""
+Event-driven re-evaluation for `gh-visibility watch`.
+
+Instead of rescanning an account, the watcher polls the public events feed for a
+user (or org) with If-None-Match, so the steady-state cost is one conditional request
+per interval (a 304 does not count against the rate limit). Repos that had a push, a
+repository edit (description, topics, visibility), were created or made public are
+re-fetched and re-scored; each result is written to a sink as one JSON line.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, TextIO, Tuple
+
+from .analyzer import Analyzer
+from .token_pool import TokenPoolExhausted
+
+if TYPE_CHECKING:
+  from .github_client import GitHubClient
+
+# Event types that can change how a repo presents itself. Topic and description
+# edits arrive as RepositoryEvent (action "edited").
+TRIGGER_EVENTS = {"PushEvent", "RepositoryEvent", "PublicEvent", "CreateEvent"}
+DEFAULT_INTERVAL = 60
+# The events API serves at most 300 events (3 pages of 100).
+MAX_EVENT_PAGES = 3
+
+Sink = Callable[[Dict[str, Any]], None]
+
+
+def jsonl_sink(stream: TextIO) -> Sink:
+  """Sink that appends one JSON object per line and flushes, for tail -f or log shippers."""
+  def write(record: Dict[str, Any]) -> None:
+    stream.write(json.dumps(record) + "\n")
+    stream.flush()
+  return write
+
+
+def _is_trigger(event: Dict[str, Any]) -> bool:
+  kind = event.get("type")
+  if kind not in TRIGGER_EVENTS:
+    return False
+  if kind == "CreateEvent":
+    # Branch/tag creation does not change presentation; a new repository does.
+    return (event.get("payload") or {}).get("ref_type") == "repository"
+  return True
+
+
+class EventWatcher:
+  """Polls events for one owner and re-evaluates only the repos they touch."""
+
+  def __init__(
+    self,
+    client: GitHubClient,
+    analyzer: Analyzer,
+    owner: str,
+    sink: Sink,
+    org: bool = False,
+    mode: str = "analyze",
+    backfill: bool = False,
+  ) -> None:
+    """
+    backfill: on the first poll, also re-evaluate repos named in events already in the
+    feed. By default the first poll only records where the feed starts.
+    """
+    self.client = client
+    self.analyzer = analyzer
+    self.owner = owner
+    self.sink = sink
+    self.org = org
+    self.mode = mode
+    self.backfill = backfill
+    self.etag: Optional[str] = None
+    self.poll_interval: Optional[int] = None
+    self.last_event_id: Optional[int] = None
+    self._primed = False
+
+  def _new_events(self) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+    """(events newer than last_event_id oldest first, feed etag); events is None if unchanged."""
+    page = self.client.get_events(self.owner, org=self.org, etag=self.etag)
+    if page.poll_interval:
+      self.poll_interval = page.poll_interval
+    if page.not_modified:
+      return None, self.etag
+    etag = page.etag
+    events = list(page.events)
+    # Keep reading older pages only while every event on the page is new.
+    n = 1
+    while (
+      self.last_event_id is not None
+      and events
+      and n < MAX_EVENT_PAGES
+      and len(page.events) == 100
+      and int(events[-1]["id"]) > self.last_event_id
+    ):
+      n += 1
+      page = self.client.get_events(self.owner, org=self.org, page=n)
+      events.extend(page.events)
+    if self.last_event_id is not None:
+      events = [e for e in events if int(e["id"]) > self.last_event_id]
+    events.sort(key=lambda e: int(e["id"]))
+    return events, etag
+
+  def _advance(self, events: List[Dict[str, Any]], etag: Optional[str]) -> None:
+    self._primed = True
+    self.etag = etag
+    if events:
+      self.last_event_id = int(events[-1]["id"])
+
+  def poll(self) -> int:
+    """
+    Run one poll; returns how many repos were re-evaluated. The feed position only
+    advances after every triggered repo was handled, so a failed poll is retried.
+    """
+    events, etag = self._new_events()
+    if events is None:
+      return 0
+    if not self._primed and not self.backfill:
+      self._advance(events, etag)
+      return 0
+
+    triggers: Dict[str, Set[str]] = {}
+    for event in events:
+      name = (event.get("repo") or {}).get("name")
+      if name and _is_trigger(event):
+        triggers.setdefault(name, set()).add(event["type"])
+
+    for full_name, kinds in triggers.items():
+      record: Dict[str, Any] = {
+        "repo": full_name,
+        "triggers": sorted(kinds),
+        "evaluatedAt": datetime.now(timezone.utc).isoformat(),
+      }
+      summary = self.client.get_repo(full_name)
+      if summary is None:
+        record["type"] = "removed"
+      else:
+        ev = self.analyzer.evaluate_summary(self.client, summary, mode=self.mode)
+        record["type"] = "evaluation"
+        record["evaluation"] = ev.to_dict()
+      self.sink(record)
+    self._advance(events, etag)
+    return len(triggers)
+
+  def run(
+    self,
+    interval: int = DEFAULT_INTERVAL,
+    stop: Optional[threading.Event] = None,
+    max_polls: Optional[int] = None,
+  ) -> None:
+    """
+    Poll until stop is set (or max_polls polls have run). Waits at least the server's
+    X-Poll-Interval between polls, even if interval is shorter. A failed poll is
+    reported on stderr and retried at the next interval; when every token is rate
+    limited, not before the first one resets. TokenPoolExhausted is raised when every
+    token was rejected, since polling again cannot succeed.
+    """
+    stop = stop or threading.Event()
+    polls = 0
+    while not stop.is_set():
+      wait = float(max(interval, self.poll_interval or 0))
+      try:
+        self.poll()
+      except TokenPoolExhausted as e:
+        if e.reset_at is None:
+          raise
+        sys.stderr.write(f"watch: poll failed: {e.describe()}\n")
+        wait = max(wait, e.reset_at - time.time())
+      except Exception as e:
+        sys.stderr.write(f"watch: poll failed: {e}\n")
+      polls += 1
+      if max_polls is not None and polls >= max_polls:
+        return
+      stop.wait(wait)
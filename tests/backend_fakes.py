@@ -0,0 +1,63 @@
+"""Shared fakes for backend tests: an in-memory GitHub client and the backend import path."""
+
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from gh_visibility.github_client import ReadmeStream, RepoSummary
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+if str(BACKEND_DIR) not in sys.path:
+  sys.path.insert(0, str(BACKEND_DIR))
+
+README = "# {name}\n\nA small tool that does one thing well.\n\n## Installation\n\npip install it\n\n## Usage\n\nRun it.\n"
+
+
+def summary(repo_id: int, name: str, owner: str = "octo", description: Optional[str] = "A tool") -> RepoSummary:
+  return RepoSummary(
+    id=repo_id,
+    name=name,
+    full_name=f"{owner}/{name}",
+    html_url=f"https://github.com/{owner}/{name}",
+    private=False,
+    description=description,
+    topics=["python"],
+    archived=False,
+    pushed_at="2025-03-01T00:00:00Z",
+    default_branch="main",
+  )
+
+
+class FakeClient:
+  """
+  Just enough of GitHubClient for Analyzer.iter_evaluations. readmes maps full names
+  to README text (missing: no README). gates maps full names to events the README
+  fetch waits on, so tests can hold a scan at a repo boundary.
+  """
+
+  def __init__(
+    self,
+    repos: List[RepoSummary],
+    readmes: Optional[Dict[str, str]] = None,
+    gates: Optional[Dict[str, threading.Event]] = None,
+    error: Optional[Exception] = None,
+  ) -> None:
+    self.repos = repos
+    self.readmes = readmes if readmes is not None else {r.full_name: README.format(name=r.name) for r in repos}
+    self.gates = gates or {}
+    self.error = error
+    self.fetching: Dict[str, threading.Event] = {r.full_name: threading.Event() for r in repos}
+
+  def list_repos_for_user(self, username: str) -> Iterator[RepoSummary]:
+    if self.error is not None:
+      raise self.error
+    yield from self.repos
+
+  def get_readme_stream(self, full_name: str, max_bytes: int) -> Optional[ReadmeStream]:
+    self.fetching[full_name].set()
+    gate = self.gates.get(full_name)
+    if gate is not None:
+      gate.wait(5)
+    text = self.readmes.get(full_name)
+    return ReadmeStream.from_bytes(text.encode("utf-8"), max_bytes) if text is not None else None
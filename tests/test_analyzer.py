@@ -36,3 +36,17 @@ def test_analyzer_score_returns_all_dimensions():
     if isinstance(v, dict):
       assert "score" in v
       assert "explanation" in v
+
+
+def test_readme_accumulator_matches_whole_text_for_any_chunking():
+  from gh_visibility.readme import ReadmeAccumulator, analyze_readme
+
+  text = "# Title\r\n\r\nWhat this tool does, for whom.\n\n## Install\n\npip install it\n## Usage\nrun it"
+  whole = analyze_readme(text)
+  for size in (1, 2, 3, 7, 64):
+    acc = ReadmeAccumulator()
+    for i in range(0, len(text), size):
+      acc.feed(text[i:i + size])
+    assert acc.finish() == whole
+  assert whole["readmeSections"] == ["Title", "Install", "Usage"]
+  assert whole["introHasWhatWhoPlatform"] is True
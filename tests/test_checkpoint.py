@@ -0,0 +1,75 @@
+"""Tests for checkpointed scans: an interrupted, resumed scan matches an uninterrupted one."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fake_github import FakeGitHubServer  # noqa: E402
+
+from gh_visibility.analyzer import Analyzer  # noqa: E402
+from gh_visibility.checkpoint import JournalError, ScanJournal  # noqa: E402
+from gh_visibility.github_client import GitHubClient  # noqa: E402
+
+PARAMS = {"user": "octo", "repoFilter": None, "mode": "suggest", "preset": "indie-hacker", "readmeMaxBytes": 524288}
+
+
+class FlakyClient(GitHubClient):
+  """Fails the README fetch after a number of successful ones."""
+
+  def __init__(self, *args, fail_after, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.fail_after = fail_after
+
+  def get_readme_stream(self, *args, **kwargs):
+    if self.fail_after == 0:
+      raise ConnectionError("network blip")
+    self.fail_after -= 1
+    return super().get_readme_stream(*args, **kwargs)
+
+
+def _scan(analyzer, client, journal=None):
+  evs = list(analyzer.iter_evaluations(client, "octo", mode="suggest", journal=journal))
+  return analyzer.finalize(evs, benchmark_mode="internal")
+
+
+def test_resumed_scan_matches_uninterrupted_run(tmp_path):
+  path = tmp_path / "scan.journal"
+  analyzer = Analyzer()
+  with FakeGitHubServer(accounts={"octo": 250}) as server:
+    journal = ScanJournal.create(path, PARAMS)
+    with pytest.raises(ConnectionError):
+      _scan(analyzer, FlakyClient("t", api_root=server.url, fail_after=180), journal)
+    journal.close()
+    # The process died halfway through writing the next record.
+    with open(path, "ab") as f:
+      f.write(b'{"type": "evaluation", "evalu')
+
+    readme_before = server.stats.by_endpoint.get("readme", 0)
+    list_before = server.stats.by_endpoint.get("list_repos", 0)
+    journal = ScanJournal.resume(path, PARAMS)
+    started_at = journal.started_at
+    assert len(journal.evaluations) == 180 and journal.listing_done
+    resumed = _scan(analyzer, GitHubClient("t", api_root=server.url), journal)
+    journal.close()
+    assert server.stats.by_endpoint["readme"] - readme_before == 70
+    assert server.stats.by_endpoint["list_repos"] == list_before
+
+    fresh = tmp_path / "fresh.journal"
+    journal = ScanJournal.create(fresh, PARAMS)
+    journal.started_at = started_at
+    uninterrupted = _scan(analyzer, GitHubClient("t", api_root=server.url), journal)
+    journal.close()
+  assert resumed == uninterrupted
+  assert len(resumed) == 250
+
+
+def test_resume_rejects_a_different_scan(tmp_path):
+  path = tmp_path / "scan.journal"
+  ScanJournal.create(path, PARAMS).close()
+  with pytest.raises(JournalError):
+    ScanJournal.create(path, PARAMS)
+  with pytest.raises(JournalError):
+    ScanJournal.resume(path, dict(PARAMS, user="someone-else"))
@@ -0,0 +1,39 @@
+"""Modules the CLI entrypoint loads at startup (python -X importtime)."""
+
+import subprocess
+import sys
+
+# Modules only the command paths need; loading any of them at startup is a regression
+# (with requests and the analyzer loaded eagerly, importing the CLI took over 100 ms).
+DEFERRED = {
+  "requests",
+  "urllib3",
+  "gh_visibility.github_client",
+  "gh_visibility.analyzer",
+  "gh_visibility.output",
+  "gh_visibility.rescore",
+  "gh_visibility.suggestions",
+}
+
+
+def _importtime(module):
+  proc = subprocess.run(
+    [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+    capture_output=True,
+    text=True,
+    check=True,
+  )
+  cumulative = {}
+  for line in proc.stderr.splitlines():
+    if not line.startswith("import time:") or "|" not in line:
+      continue
+    _, cum, name = (part.strip() for part in line[len("import time:"):].split("|"))
+    if cum.isdigit():
+      cumulative[name] = int(cum)
+  return cumulative
+
+
+def test_cli_import_defers_heavy_modules():
+  timings = _importtime("gh_visibility.cli")
+  assert "gh_visibility.cli" in timings
+  assert not DEFERRED & set(timings), f"imported at startup: {sorted(DEFERRED & set(timings))}"
@@ -0,0 +1,157 @@
+"""Tests for scan-to-scan diffs (CLI files and stored scans)."""
+
+import json
+import sys
+from pathlib import Path
+
+from gh_visibility import diff as diff_module
+from gh_visibility.cli import main
+from gh_visibility.diff import DIMENSIONS, ScanDiff, ScoreRow, iter_scan_file, read_rows, row_key
+from gh_visibility.watch import jsonl_sink
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+import store  # noqa: E402
+
+
+def _evaluation(repo_id, name, overall, readme=50.0, **extra):
+  scores = {dim: {"score": 50.0, "explanation": "x"} for dim in DIMENSIONS}
+  scores["overall"]["score"] = overall
+  scores["readmeStructure"]["score"] = readme
+  return {"repo": {"id": repo_id, "name": name, "fullName": f"octo/{name}", **extra}, "scores": scores, "suggestions": []}
+
+
+BEFORE = [
+  _evaluation(30, "gamma", 60.0),
+  _evaluation(10, "alpha", 70.0, readme=80.0),
+  _evaluation(20, "beta", 50.0),
+  _evaluation(None, "local-only", 40.0),
+]
+AFTER = [
+  _evaluation(10, "alpha", 62.0, readme=40.0),
+  _evaluation(30, "gamma", 63.0),  # moved less than the threshold
+  _evaluation(40, "delta", 55.0),
+  _evaluation(None, "local-only", 48.0),
+]
+
+
+def _write(tmp_path, name, evaluations, jsonl=False):
+  path = tmp_path / name
+  with open(path, "w", encoding="utf-8") as f:
+    if jsonl:
+      f.writelines(json.dumps(e) + "\n" for e in evaluations)
+    else:
+      json.dump(evaluations, f, indent=2)
+  return path
+
+
+def test_scan_files_stream_in_either_format(tmp_path, monkeypatch):
+  monkeypatch.setattr(diff_module, "_CHUNK", 64)  # every evaluation spans several reads
+  array = _write(tmp_path, "a.json", BEFORE)
+  lines = _write(tmp_path, "a.jsonl", BEFORE, jsonl=True)
+  assert list(iter_scan_file(array)) == list(iter_scan_file(lines)) == BEFORE
+  assert [r.full_name for r in read_rows(array)] == ["octo/alpha", "octo/beta", "octo/gamma", "octo/local-only"]
+
+  broken = tmp_path / "broken.json"
+  broken.write_text(json.dumps(BEFORE)[:-40])
+  try:
+    list(iter_scan_file(broken))
+  except ValueError as e:
+    assert "broken.json" in str(e)
+  else:
+    raise AssertionError("truncated scan file was accepted")
+
+
+def test_merge_join_reports_added_removed_and_moved_scores(tmp_path):
+  diff = diff_module.diff_scan_files(_write(tmp_path, "a.json", BEFORE), _write(tmp_path, "b.jsonl", AFTER, jsonl=True))
+  entries = [e.to_dict() for e in diff]
+  assert [(e["status"], e["repo"]["fullName"]) for e in entries] == [
+    ("changed", "octo/alpha"),
+    ("removed", "octo/beta"),
+    ("added", "octo/delta"),
+    ("changed", "octo/local-only"),
+  ]
+  assert entries[0]["deltas"] == {"overall": -8.0, "readmeStructure": -40.0}
+  assert entries[0]["overall"] == {"before": 70.0, "after": 62.0}
+  assert diff.summary.to_dict() == {"compared": 3, "added": 1, "removed": 1, "changed": 2, "improved": 1, "regressed": 1}
+
+  only_readme = ScanDiff(read_rows(tmp_path / "a.json"), read_rows(tmp_path / "b.jsonl"), dimensions=["readmeStructure"])
+  assert [e.full_name for e in only_readme if e.status == "changed"] == ["octo/alpha"]
+
+
+def test_watch_logs_diff_by_their_latest_records(tmp_path):
+  log = tmp_path / "watch.jsonl"
+  with open(log, "w", encoding="utf-8") as f:
+    sink = jsonl_sink(f)
+    for e in AFTER[:2]:
+      sink({"repo": e["repo"]["fullName"], "triggers": ["PushEvent"], "type": "evaluation", "evaluation": e})
+    sink({"repo": "octo/gamma", "triggers": ["DeleteEvent"], "type": "removed"})
+    sink({"repo": "octo/beta", "triggers": ["PushEvent"], "type": "evaluation", "evaluation": BEFORE[2]})
+  diff = diff_module.diff_scan_files(_write(tmp_path, "a.json", BEFORE), log)
+  assert [(e.status, e.full_name) for e in diff] == [
+    ("changed", "octo/alpha"),
+    ("removed", "octo/gamma"),
+    ("removed", "octo/local-only"),
+  ]
+
+  # A repo recreated after its removal is back in the scan.
+  with open(log, "a", encoding="utf-8") as f:
+    jsonl_sink(f)({"repo": "octo/gamma", "triggers": ["CreateEvent"], "type": "evaluation", "evaluation": BEFORE[0]})
+  assert "octo/gamma" not in {e.full_name for e in diff_module.diff_scan_files(tmp_path / "a.json", log)}
+
+
+def test_latest_row_of_a_repo_wins():
+  def row(repo_id, overall):
+    return ScoreRow(row_key(repo_id, "o/r"), repo_id, "o/r", (overall,) + (None,) * (len(DIMENSIONS) - 1))
+
+  # A watch log lists a repo once per update; only the last one is compared.
+  diff = ScanDiff([row(1, 50.0)], [row(1, 20.0), row(1, 52.0)])
+  assert list(diff) == [] and diff.summary.compared == 1
+
+
+def test_cli_diff_json_and_regression_exit_status(tmp_path, capsys):
+  before, after = _write(tmp_path, "a.json", BEFORE), _write(tmp_path, "b.json", AFTER)
+  out = tmp_path / "diff.json"
+  assert main(["diff", str(before), str(after), "--output", "json", "--outfile", str(out), "--fail-on-regression"]) == 1
+  report = json.loads(out.read_text())
+  assert report["summary"]["regressed"] == 1 and len(report["repos"]) == 4
+
+  assert main(["diff", str(before), str(after), "--dimension", "overall", "--threshold", "10"]) == 0
+  table = capsys.readouterr().out
+  assert "+ octo/delta" in table and "- octo/beta" in table and "~" not in table
+  assert main(["diff", str(after), str(after), "--fail-on-regression"]) == 0
+
+
+def test_stored_scans_diff_against_previous(tmp_path, monkeypatch):
+  monkeypatch.setattr(store, "DB_PATH", tmp_path / "scans.db")
+  first = store.save_scan("octo", "indie-hacker", BEFORE)
+  store.save_scan("octo", "portfolio-dev", AFTER)
+  second = store.save_scan("octo", "indie-hacker", AFTER)
+  assert store.get_previous_scan_id(second) == first
+  assert store.get_previous_scan_id(first) is None
+
+  result = store.diff_scans(first, second, threshold=5.0, limit=2)
+  assert result["summary"]["changed"] == 2 and result["summary"]["added"] == 1
+  assert [e["repo"]["fullName"] for e in result["repos"]] == ["octo/alpha", "octo/beta"]
+  assert result["truncated"]
+
+
+def test_join_of_100k_repos_matches_every_row():
+  # Speed at this size is tracked by the diff stage of `benchmarks/bench.py --size large`.
+  def rows(offset, bump):
+    for i in range(offset, offset + 100_000):
+      score = float(i % 100) + (bump if i % 100 == 0 else 0.0)
+      yield ScoreRow((0, i), i, f"o/r{i}", (score,) * len(DIMENSIONS))
+
+  diff = ScanDiff(rows(0, 0.0), rows(1_000, 10.0))
+  entries = list(diff)
+  assert [e.repo_id for e in entries] == sorted(e.repo_id for e in entries)
+  assert [e.repo_id for e in entries if e.status == "removed"] == list(range(1_000))
+  assert [e.repo_id for e in entries if e.status == "added"] == list(range(100_000, 101_000))
+  changed = [e for e in entries if e.status == "changed"]
+  assert [e.repo_id for e in changed] == list(range(1_000, 100_000, 100))
+  assert all(e.deltas == dict.fromkeys(DIMENSIONS, 10.0) for e in changed)
+  assert diff.summary.to_dict() == {
+    "compared": 99_000, "added": 1_000, "removed": 1_000, "changed": 990, "improved": 990, "regressed": 0,
+  }
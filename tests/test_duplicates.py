@@ -0,0 +1,55 @@
+"""Tests for near-duplicate README detection (MinHash + LSH)."""
+
+from gh_visibility.analyzer import Analyzer
+from gh_visibility.duplicates import find_duplicate_groups, readme_signature, similarity
+from gh_visibility.readme import ReadmeAccumulator
+
+TEMPLATE = "\n".join(
+  ["# {name}", "", "This project was generated from the company starter template."]
+  + [f"- Step {i}: run `make target-{i}` and check the output of stage {i}." for i in range(20)]
+  + ["## License", "", "MIT"]
+)
+
+
+def _own_readme(i: int) -> str:
+  return "\n".join(
+    [f"# tool-{i}", "", f"Tool {i} converts format {i} files for people who work with format {i}."]
+    + [f"- Feature {i}.{j}: handles case {j} of format {i} without extra setup." for j in range(12)]
+  )
+
+
+def test_template_copies_group_and_distinct_readmes_do_not():
+  copies = [TEMPLATE.format(name=f"service-{i}") for i in range(6)]
+  copies[2] += "\n- Step 99: an extra local step."
+  others = [_own_readme(i) for i in range(50)]
+  signatures = [readme_signature(t) for t in others[:25] + copies + others[25:]] + [None]
+
+  groups = find_duplicate_groups(signatures)
+  assert groups[25:31] == [0] * 6
+  assert groups[:25] == [None] * 25 and groups[31:] == [None] * 26
+  assert similarity(signatures[25], signatures[27]) > 0.8
+  assert similarity(signatures[0], signatures[1]) < 0.3
+
+
+def test_streamed_signature_matches_whole_text():
+  acc = ReadmeAccumulator()
+  for i in range(0, len(TEMPLATE), 7):
+    acc.feed(TEMPLATE[i:i + 7])
+  acc.finish()
+  assert acc.signature() == readme_signature(TEMPLATE)
+
+
+def test_finalize_marks_duplicates_and_lowers_readme_structure():
+  analyzer = Analyzer()
+  readmes = [TEMPLATE.format(name="a"), TEMPLATE.format(name="b"), _own_readme(1)]
+  evs = [
+    analyzer.evaluate_repo({"name": f"repo-{i}", "fullName": f"octo/repo-{i}"}, text, mode="suggest")
+    for i, text in enumerate(readmes)
+  ]
+  before = [ev.scores["readmeStructure"]["score"] for ev in evs]
+  out = analyzer.finalize(evs, mode="suggest")
+
+  assert [e["analysis"]["readmeDuplicateGroup"] for e in out] == ["readme-dup-1", "readme-dup-1", None]
+  assert out[0]["scores"]["readmeStructure"]["score"] < before[0]
+  assert out[2]["scores"]["readmeStructure"]["score"] == before[2]
+  assert any("repo-1" in s["message"] for s in out[0]["suggestions"] if s["dimension"] == "readmeStructure")
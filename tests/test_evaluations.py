@@ -0,0 +1,109 @@
+"""Tests for paging stored evaluations (keyset cursors, filters) and who may read them."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests import backend_fakes  # noqa: F401  (backend import path)
+
+import main
+import store
+from gh_visibility.http_cache import token_fingerprint
+
+OWNER = {"Authorization": "Bearer t"}
+
+
+def _evaluation(repo_id, name, overall, structure=50.0):
+  scores = {dim: {"score": 50.0} for dim in store.DIMENSIONS}
+  scores["overall"] = {"score": overall}
+  scores["readmeStructure"] = {"score": structure}
+  return {"repo": {"id": repo_id, "name": name, "fullName": f"octo/{name}"}, "scores": scores}
+
+
+# Ties on overall: the position tiebreak keeps pages stable.
+SCAN = [
+  _evaluation(1, "a", 70.0, 20.0),
+  _evaluation(2, "b", 50.0),
+  _evaluation(3, "c", 70.0),
+  _evaluation(4, "d", 50.0, 30.0),
+  _evaluation(5, "e", 70.0),
+]
+
+
+@pytest.fixture
+def scan_id(tmp_path, monkeypatch):
+  monkeypatch.setattr(store, "DB_PATH", tmp_path / "scans.db")
+  return store.save_scan("octo", "indie-hacker", SCAN, token_fp=token_fingerprint("t"))
+
+
+def _pages(scan_id, **kwargs):
+  names, cursor = [], None
+  while True:
+    page = store.get_evaluations_page(scan_id, limit=2, cursor=cursor, **kwargs)
+    names.extend(e["repo"]["name"] for e in page["items"])
+    cursor = page["next_cursor"]
+    if cursor is None:
+      return names, page["total"]
+
+
+def test_keyset_pages_are_stable_across_ties(scan_id):
+  assert _pages(scan_id, sort="overall", order="desc") == (["e", "c", "a", "d", "b"], 5)
+  assert _pages(scan_id, sort="overall", order="asc") == (["b", "d", "a", "c", "e"], 5)
+  assert _pages(scan_id, sort="name", order="desc") == (["e", "d", "c", "b", "a"], 5)
+  assert _pages(scan_id) == (["a", "b", "c", "d", "e"], 5)
+
+
+def test_filters_apply_to_every_page_and_the_total(scan_id):
+  assert _pages(scan_id, sort="overall", order="desc", min_scores={"overall": 60}) == (["e", "c", "a"], 3)
+  assert _pages(scan_id, max_scores={"readmeStructure": 40}) == (["a", "d"], 2)
+  assert _pages(scan_id, min_scores={"overall": 60}, max_scores={"readmeStructure": 40}) == (["a"], 1)
+  with pytest.raises(ValueError):
+    store.get_evaluations_page(scan_id, min_scores={"stars": 1})
+
+
+def test_endpoint_rejects_bad_cursors_and_queries(scan_id):
+  http = TestClient(main.app)
+  url = f"/scans/{scan_id}/evaluations"
+  first = http.get(url, params={"sort": "overall", "order": "desc", "limit": 2}, headers=OWNER).json()
+  assert [e["repo"]["name"] for e in first["items"]] == ["e", "c"] and first["username"] == "octo"
+  second = http.get(url, params={"sort": "overall", "order": "desc", "limit": 2, "cursor": first["next_cursor"]}, headers=OWNER)
+  assert [e["repo"]["name"] for e in second.json()["items"]] == ["a", "d"]
+  for params in ({"cursor": "not-a-cursor"}, {"sort": "stars"}, {"order": "up"}, {"min_stars": "1"}, {"max_overall": "high"}):
+    assert http.get(url, params=params, headers=OWNER).status_code == 400, params
+
+
+def test_stored_scans_are_readable_only_by_their_token_or_account(scan_id, monkeypatch):
+  http = TestClient(main.app)
+  url = f"/scans/{scan_id}/evaluations"
+  logins = {"other": "someone-else", "owner-rotated": "Octo", "revoked": None}
+  monkeypatch.setattr(main, "_token_login", lambda token: logins[token])
+
+  assert http.get(url).status_code == 401
+  assert http.get(url, headers={"Authorization": "Basic dDp0"}).status_code == 401
+  assert http.get(url, headers=OWNER).status_code == 200
+  # Another token of the scanned account can read it; others get the same 404 as a missing scan.
+  assert http.get(url, headers={"Authorization": "token owner-rotated"}).status_code == 200
+  for token in ("other", "revoked"):
+    assert http.get(url, headers={"Authorization": f"Bearer {token}"}).status_code == 404
+  assert http.get(f"/scans/{scan_id + 1}/evaluations", headers=OWNER).status_code == 404
+
+  # The diff checks both sides, including the scan "previous" resolves to.
+  later = store.save_scan("octo", "indie-hacker", SCAN[:3], token_fp=token_fingerprint("other"))
+  assert http.get(f"/scans/previous/diff/{later}", headers={"Authorization": "Bearer other"}).status_code == 404
+  diff = http.get(f"/scans/previous/diff/{later}", headers={"Authorization": "Bearer owner-rotated"})
+  assert diff.status_code == 200 and diff.json()["summary"]["removed"] == 2
+
+
+def test_token_login_is_cached_per_token(monkeypatch):
+  calls = []
+
+  class Client:
+    def get_authenticated_login(self):
+      calls.append(1)
+      return "octo"
+
+  monkeypatch.setattr(main, "client_for", lambda token, tokens=None: Client())
+  monkeypatch.setattr(main, "_LOGINS", type(main._LOGINS)())
+  assert main._token_login("t") == main._token_login("t") == "octo"
+  assert len(calls) == 1
+  main._token_login("u")
+  assert len(calls) == 2
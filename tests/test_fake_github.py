@@ -0,0 +1,122 @@
+"""End-to-end checks of GitHubClient against the local fake GitHub API."""
+
+import sys
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fake_github import FakeGitHubServer, FaultConfig  # noqa: E402
+
+from gh_visibility import metrics, profiling  # noqa: E402
+from gh_visibility.analyzer import Analyzer  # noqa: E402
+from gh_visibility.cli import main  # noqa: E402
+from gh_visibility.github_client import GitHubClient  # noqa: E402
+from gh_visibility.http_cache import ResponseCache  # noqa: E402
+
+
+def test_scan_paginates_fetches_readmes_and_revalidates():
+  with FakeGitHubServer(accounts={"octo": 250}) as server:
+    cache = ResponseCache(ttl=0)
+    client = GitHubClient("t", api_root=server.url, cache=cache)
+    evaluations = Analyzer().evaluate_account(client, "octo")
+    assert len(evaluations) == 250
+    assert server.stats.by_endpoint["list_repos"] == 4  # 3 full/partial pages + empty page
+    assert any(e["analysis"]["hasReadme"] for e in evaluations)
+
+    Analyzer().evaluate_account(GitHubClient("t", api_root=server.url, cache=cache), "octo")
+    assert server.stats.not_modified > 200  # every 200 from the first pass; 404s are not cached
+
+
+def test_fault_injection_is_deterministic_and_rate_limited():
+  faults = FaultConfig(secondary_limit_rate=0.5, rate_limit=3, seed=7)
+  outcomes = []
+  for _ in range(2):
+    with FakeGitHubServer(faults=faults) as server:
+      codes = []
+      for _ in range(6):
+        resp = requests.get(f"{server.url}/users/gen-5/repos")
+        codes.append((resp.status_code, resp.headers.get("Retry-After")))
+      outcomes.append(codes)
+  assert outcomes[0] == outcomes[1]
+  assert (403, "1") in outcomes[0]
+  assert sum(1 for code, _ in outcomes[0] if code == 200) <= 3
+
+
+def test_unknown_user_is_404():
+  with FakeGitHubServer() as server:
+    client = GitHubClient("t", api_root=server.url)
+    with pytest.raises(requests.HTTPError):
+      list(client.list_repos_for_user("nobody"))
+
+
+def test_readme_stream_stops_at_byte_budget_and_flags_truncation():
+  with FakeGitHubServer(accounts={"octo": 40}) as server:
+    client = GitHubClient("t", api_root=server.url)
+    analyzer = Analyzer(readme_max_bytes=2048)
+    evaluations = analyzer.evaluate_account(client, "octo")
+    truncated = [e for e in evaluations if e["analysis"]["readmeTruncated"]]
+    assert truncated and len(truncated) < len(evaluations)
+
+    name = truncated[0]["repo"]["fullName"]
+    stream = client.get_readme_stream(name, max_bytes=2048)
+    text = "".join(stream)
+    assert stream.truncated and stream.bytes_read == 2048
+    assert len(text.encode("utf-8")) <= 2048
+    full = client.get_readme_markdown(name)
+    assert full.startswith(text) and len(full) > len(text)
+
+    # As on GitHub, only the Accept header selects raw markdown; ?accept= still gets JSON.
+    assert not text.lstrip().startswith("{")
+    envelope = requests.get(f"{server.url}/repos/{name}/readme", params={"accept": "application/vnd.github.raw"})
+    assert envelope.json()["encoding"] == "base64"
+
+
+def test_readme_budget_must_be_positive():
+  with pytest.raises(ValueError):
+    Analyzer(readme_max_bytes=0)
+  for argv in (["scan", "--user", "octo", "--readme-max-kb", "0"], ["scan-local", ".", "--readme-max-kb", "-1"]):
+    with pytest.raises(SystemExit) as exc:
+      main(argv)
+    assert exc.value.code == 2
+
+
+def _profiled_scan(monkeypatch, tmp_path, server, user):
+  profiles = []
+
+  class RecordingProfile(profiling.ScanProfile):
+    def start(self):
+      profiles.append(self)
+      super().start()
+
+  monkeypatch.setattr(profiling, "ScanProfile", RecordingProfile)
+  monkeypatch.setenv("GITHUB_API_URL", server.url)
+  argv = ["--token", "t", "scan", "--user", user, "--output", "json", "--outfile", str(tmp_path / "out.json"),
+          "--profile", "--profile-out", str(tmp_path / "scan.folded")]
+  return profiles, argv
+
+
+def test_profiled_scan_reports_repo_timings_and_stage_totals(monkeypatch, tmp_path, capsys):
+  with FakeGitHubServer(accounts={"octo": 12}) as server:
+    profiles, argv = _profiled_scan(monkeypatch, tmp_path, server, "octo")
+    assert main(argv) == 0
+  profile = profiles[0]
+  assert len(profile.repo_seconds) == 12
+  assert all(name.startswith("octo/") and seconds >= 0 for name, seconds in profile.repo_seconds)
+  assert profile._stages["readme_fetch"][0] == 12 and profile._stages["score"][0] == 12
+  assert profile._stages["render"][0] == 1
+  assert {endpoint for endpoint, *_ in profile.requests} >= {"list_repos", "readme"}
+  report = capsys.readouterr().err
+  assert "Profile: wall" in report and "Slowest repos:" in report and "readme_fetch" in report
+  assert (tmp_path / "scan.folded").read_text().strip()
+
+
+def test_failed_profiled_scan_still_stops_the_profile(monkeypatch, tmp_path):
+  with FakeGitHubServer() as server:
+    profiles, argv = _profiled_scan(monkeypatch, tmp_path, server, "nobody")
+    with pytest.raises(requests.HTTPError):
+      main(argv)
+  assert profiles[0]._on_request not in metrics._request_observers
+  assert not profiles[0]._sampler._thread.is_alive()
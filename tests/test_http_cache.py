@@ -0,0 +1,77 @@
+"""Tests for the shared GitHub response cache and conditional requests."""
+
+import time
+
+import requests
+
+from gh_visibility.github_client import GitHubClient
+from gh_visibility.http_cache import CachedResponse, ResponseCache, make_key, token_fingerprint
+
+
+class FakeSession:
+  """Returns one JSON page with an ETag; answers 304 when If-None-Match matches."""
+
+  def __init__(self):
+    self.calls = []
+
+  def get(self, url, params=None, headers=None):
+    self.calls.append((url, dict(headers or {})))
+    resp = requests.Response()
+    resp.url = url
+    if (headers or {}).get("If-None-Match") == '"v1"':
+      resp.status_code = 304
+      resp._content = b""
+      return resp
+    resp.status_code = 200
+    resp._content = b'{"login": "octo"}'
+    resp.headers["ETag"] = '"v1"'
+    resp.headers["Content-Type"] = "application/json"
+    return resp
+
+
+def _entry(body: bytes) -> CachedResponse:
+  return CachedResponse(status_code=200, content=body, headers={}, etag=None, stored_at=time.monotonic())
+
+
+def test_token_fingerprint_is_stable_and_hides_token():
+  fp = token_fingerprint("ghp_secret")
+  assert fp == token_fingerprint("ghp_secret")
+  assert fp != token_fingerprint("ghp_other")
+  assert "ghp_secret" not in fp
+
+
+def test_cache_evicts_least_recently_used_by_bytes():
+  cache = ResponseCache(max_bytes=3 * _entry(b"x" * 100).size, ttl=60)
+  for i in range(3):
+    cache.store(make_key("fp", f"u{i}", None), _entry(b"x" * 100))
+  assert cache.lookup(make_key("fp", "u0", None))[0] is not None
+  cache.store(make_key("fp", "u3", None), _entry(b"x" * 100))
+  assert cache.lookup(make_key("fp", "u1", None))[0] is None
+  assert cache.lookup(make_key("fp", "u0", None))[0] is not None
+  assert cache.stats()["bytes"] <= cache.max_bytes
+
+
+def test_client_serves_fresh_hits_and_revalidates_stale_entries():
+  cache = ResponseCache(ttl=60)
+  session = FakeSession()
+  client = GitHubClient(token="t1", api_root="https://api.test", session=session, cache=cache)
+
+  assert client._get("users/octo").json() == {"login": "octo"}
+  assert client._get("users/octo").json() == {"login": "octo"}
+  assert len(session.calls) == 1
+
+  cache.ttl = 0
+  assert client._get("users/octo").json() == {"login": "octo"}
+  assert len(session.calls) == 2
+  assert session.calls[1][1]["If-None-Match"] == '"v1"'
+  assert cache.stats()["revalidations"] == 1
+
+
+def test_cache_is_isolated_per_token():
+  cache = ResponseCache(ttl=60)
+  s1, s2 = FakeSession(), FakeSession()
+  GitHubClient(token="t1", api_root="https://api.test", session=s1, cache=cache)._get("users/octo")
+  GitHubClient(token="t2", api_root="https://api.test", session=s2, cache=cache)._get("users/octo")
+  assert len(s1.calls) == 1
+  assert len(s2.calls) == 1
+  assert "If-None-Match" not in s2.calls[0][1]
@@ -0,0 +1,153 @@
+"""Tests for background scan jobs (POST/GET/DELETE /scans) against a fake GitHub client."""
+
+import threading
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from tests.backend_fakes import FakeClient, summary
+
+import main
+import store
+from jobs import CANCELLED, FAILED, SUCCEEDED, JobManager, JobQueueFull, ScanJob
+
+REPOS = [summary(1, "alpha"), summary(2, "beta"), summary(3, "gamma")]
+SCAN = {"username": "octo", "token": "t", "mode": "analyze"}
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+  monkeypatch.setattr(store, "DB_PATH", tmp_path / "scans.db")
+  manager = JobManager(max_workers=1, max_pending=1)
+  monkeypatch.setattr(main, "jobs", manager)
+  yield TestClient(main.app), manager, monkeypatch
+  manager.shutdown()
+
+
+def _use_client(monkeypatch, client):
+  monkeypatch.setattr(main, "client_for", lambda token, tokens=None: client)
+
+
+def _wait(manager, job_id):
+  manager.get(job_id)._future.result(timeout=10)
+  return manager.get(job_id).snapshot()
+
+
+def test_job_reports_progress_phases_and_saves_the_scan(api):
+  http, manager, monkeypatch = api
+  _use_client(monkeypatch, FakeClient(REPOS))
+  phases = []
+  original = ScanJob.set_progress
+  monkeypatch.setattr(ScanJob, "set_progress", lambda self, phase, done, total: (
+    phases.append((phase, done, total)), original(self, phase, done, total)
+  ))
+
+  created = http.post("/scans", json=SCAN)
+  assert created.status_code == 202 and created.json()["status"] in ("queued", "running")
+  job = _wait(manager, created.json()["id"])
+  assert job["status"] == SUCCEEDED and job["progress"] == {"phase": "done", "done": 3, "total": 3}
+  assert [e["repo"]["name"] for e in job["evaluations"]] == ["alpha", "beta", "gamma"]
+  assert phases[0] == ("listing", 0, None)
+  assert ("evaluating", 0, 3) in phases and ("evaluating", 3, 3) in phases
+  assert phases[-1] == ("finalizing", 3, 3)
+
+  # A finished job id resolves to the scan it saved, as does the scan id itself.
+  assert main._resolve_scan_id(job["id"]) == job["scan_id"]
+  assert main._resolve_scan_id(str(job["scan_id"])) == job["scan_id"]
+  page = http.get(f"/scans/{job['id']}/evaluations").json()
+  assert page["total"] == 3
+
+
+def test_unknown_or_unfinished_job_refs_do_not_resolve(api):
+  http, manager, monkeypatch = api
+  with pytest.raises(HTTPException) as e:
+    main._resolve_scan_id("no-such-job")
+  assert e.value.status_code == 404
+  assert http.get("/scans/no-such-job").status_code == 404
+  assert http.delete("/scans/no-such-job").status_code == 404
+
+  gate = threading.Event()
+  _use_client(monkeypatch, FakeClient(REPOS, gates={"octo/alpha": gate}))
+  job_id = http.post("/scans", json=SCAN).json()["id"]
+  with pytest.raises(HTTPException):
+    main._resolve_scan_id(job_id)  # still running: no scan saved yet
+  gate.set()
+  _wait(manager, job_id)
+
+
+def test_full_queue_is_rejected_with_429(api):
+  http, manager, monkeypatch = api
+  gate = threading.Event()
+  client = FakeClient(REPOS, gates={"octo/alpha": gate})
+  _use_client(monkeypatch, client)
+  running = http.post("/scans", json=SCAN).json()["id"]
+  assert client.fetching["octo/alpha"].wait(5)
+  queued = http.post("/scans", json=SCAN).json()["id"]  # waits for the only worker
+  response = http.post("/scans", json=SCAN)
+  assert response.status_code == 429
+  with pytest.raises(JobQueueFull):
+    manager.submit("octo", "indie-hacker", lambda job: None)
+  gate.set()
+  assert _wait(manager, running)["status"] == SUCCEEDED
+  assert _wait(manager, queued)["status"] == SUCCEEDED
+
+
+def test_cancel_stops_at_the_next_repo_boundary(api):
+  http, manager, monkeypatch = api
+  gate = threading.Event()
+  client = FakeClient(REPOS, gates={"octo/beta": gate})
+  _use_client(monkeypatch, client)
+  job_id = http.post("/scans", json=SCAN).json()["id"]
+  assert client.fetching["octo/beta"].wait(5)
+
+  assert http.delete(f"/scans/{job_id}").status_code == 200
+  gate.set()  # beta finishes scoring, then the boundary check stops the job
+  job = _wait(manager, job_id)
+  assert job["status"] == CANCELLED
+  assert [e["repo"]["name"] for e in job["evaluations"]] == ["alpha"]
+  assert job["scan_id"] is None and not client.fetching["octo/gamma"].is_set()
+
+
+def test_queued_job_cancelled_before_it_starts():
+  manager = JobManager(max_workers=1)
+  release = threading.Event()
+  blocker = manager.submit("octo", "p", lambda job: release.wait(5))
+  waiting = manager.submit("octo", "p", lambda job: pytest.fail("cancelled job ran"))
+  manager.cancel(waiting.id)
+  release.set()
+  blocker._future.result(timeout=5)
+  assert waiting.snapshot()["status"] == CANCELLED
+  assert manager.status_counts()[SUCCEEDED] == 1
+  manager.shutdown()
+
+
+def test_failed_job_reports_the_error(api):
+  http, manager, monkeypatch = api
+  _use_client(monkeypatch, FakeClient(REPOS, error=RuntimeError("listing exploded")))
+  job = _wait(manager, http.post("/scans", json=SCAN).json()["id"])
+  assert job["status"] == FAILED and job["error"] == "listing exploded"
+  assert job["finished_at"] and job["evaluations"] == []
+
+
+def test_exhausted_token_pool_maps_to_429_with_retry_after(api):
+  import time
+
+  from gh_visibility.token_pool import TokenPoolExhausted
+
+  http, manager, monkeypatch = api
+  limited = TokenPoolExhausted("every token in the pool is rate limited", time.time() + 120)
+  _use_client(monkeypatch, FakeClient(REPOS, error=limited))
+
+  response = http.post("/scan", json=SCAN)
+  assert response.status_code == 429 and 119 <= int(response.headers["Retry-After"]) <= 120
+  assert "usable again at" in response.json()["detail"]
+  event = http.post("/scan/stream?format=ndjson", json=SCAN).json()
+  assert event["type"] == "error" and 119 <= event["retry_after"] <= 120
+
+  job = _wait(manager, http.post("/scans", json=SCAN).json()["id"])
+  assert job["status"] == FAILED and job["retry_at"].startswith(time.strftime("%Y-%m-%d", time.gmtime(limited.reset_at)))
+
+  _use_client(monkeypatch, FakeClient(REPOS, error=TokenPoolExhausted("every token in the pool was rejected")))
+  assert http.post("/scan", json=SCAN).status_code == 401
+  assert _wait(manager, http.post("/scans", json=SCAN).json()["id"])["retry_at"] is None
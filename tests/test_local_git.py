@@ -0,0 +1,91 @@
+"""Tests for scoring local clones and bare mirrors (scan-local)."""
+
+import os
+import subprocess
+import zlib
+from pathlib import Path
+
+from gh_visibility.diff import ScanDiff, row_from_evaluation
+from gh_visibility.local_git import find_repositories, local_repo_id, read_local_repo, scan_local
+from gh_visibility.presets import load_preset
+
+
+COMMIT_DATE = "2024-03-01T12:00:00+00:00"
+
+
+def _git(cwd, *args):
+  env = dict(os.environ, GIT_AUTHOR_DATE=COMMIT_DATE, GIT_COMMITTER_DATE=COMMIT_DATE)
+  subprocess.run(
+    ["git", "-c", "user.email=dev@example.com", "-c", "user.name=Dev", *args],
+    cwd=cwd, check=True, capture_output=True, env=env,
+  )
+
+
+def _make_repo(root: Path) -> Path:
+  repo = root / "work" / "tool"
+  repo.mkdir(parents=True)
+  _git(repo, "init", "-q", "-b", "main")
+  (repo / "README.md").write_text(
+    "# tool\n\nWhat it does, who it is for and which platforms it runs on.\n\n## Install\n\npip install tool\n",
+    encoding="utf-8",
+  )
+  (repo / "LICENSE").write_text("MIT\n", encoding="utf-8")
+  (repo / ".github" / "ISSUE_TEMPLATE").mkdir(parents=True)
+  (repo / ".github" / "ISSUE_TEMPLATE" / "bug.md").write_text("bug\n", encoding="utf-8")
+  (repo / ".github" / "pull_request_template.md").write_text("pr\n", encoding="utf-8")
+  _git(repo, "add", "-A")
+  _git(repo, "commit", "-q", "-m", "init")
+  return repo
+
+
+def test_reads_community_files_and_readme_from_git_objects(tmp_path):
+  repo = _make_repo(tmp_path)
+  # Working-tree edits are ignored: only committed content counts.
+  (repo / "README.md").write_text("", encoding="utf-8")
+
+  info, analysis, signature = read_local_repo(repo)
+  assert info["fullName"].endswith("/tool")
+  assert info["id"] == local_repo_id(info["fullName"])
+  assert info["defaultBranch"] == "main"
+  assert info["pushedAt"].startswith("2024-03-01T12:00:00")
+  assert analysis["hasLicense"] and analysis["hasIssueTemplates"] and analysis["hasPrTemplate"]
+  assert not analysis["hasContributing"]
+  assert analysis["hasReadme"] and analysis["readmeSections"] == ["tool", "Install"]
+  assert analysis["introHasWhatWhoPlatform"]
+
+  assert signature is None  # too short to compare with other READMEs
+  _, small, _ = read_local_repo(repo, max_bytes=10)
+  assert small["readmeTruncated"] and small["readmeSections"] == ["tool"]
+
+
+def test_scan_local_covers_clones_and_bare_mirrors(tmp_path):
+  repo = _make_repo(tmp_path)
+  mirror = tmp_path / "mirrors" / "tool.git"
+  _git(tmp_path, "clone", "-q", "--mirror", str(repo), str(mirror))
+  _git(tmp_path, "init", "-q", "--bare", str(tmp_path / "mirrors" / "empty.git"))
+
+  assert [p.name for p in find_repositories(tmp_path)] == ["empty.git", "tool.git", "tool"]
+  evaluations, errors = scan_local(tmp_path, preset=load_preset("indie-hacker"), jobs=1)
+  assert [e["repo"]["name"] for e in evaluations] == ["tool", "tool"]
+  assert evaluations[0]["analysis"] == evaluations[1]["analysis"]
+  assert evaluations[0]["scores"] == evaluations[1]["scores"]
+  assert len(errors) == 1 and "no commits" in errors[0][1]
+
+
+def test_local_repo_ids_do_not_collide_like_crc32():
+  a, b = "octo/tool-29685295", "octo/tool-32060020"
+  assert zlib.crc32(a.encode()) == zlib.crc32(b.encode())
+  assert local_repo_id(a) != local_repo_id(b)
+  assert local_repo_id(a) == local_repo_id(a) and 0 <= local_repo_id(a) < 2**63
+
+  def scan(score):
+    return sorted(
+      (row_from_evaluation({"repo": {"id": local_repo_id(n), "fullName": n}, "scores": {"overall": {"score": score}}})
+       for n in (a, b)),
+      key=lambda row: row.key,
+    )
+
+  # Two repos whose ids collided used to merge into one in a diff.
+  diff = ScanDiff(scan(50.0), scan(60.0))
+  assert sorted(entry.full_name for entry in diff) == [a, b]
+  assert diff.summary.compared == 2
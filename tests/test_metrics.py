@@ -0,0 +1,30 @@
+"""Tests for the in-process metrics registry."""
+
+from gh_visibility.metrics import MetricsRegistry
+from gh_visibility.profiling import percentile
+
+
+def test_prometheus_rendering_of_counter_and_histogram():
+  registry = MetricsRegistry()
+  requests = registry.counter("reqs_total", "Requests.", ["endpoint", "status"])
+  latency = registry.histogram("latency_seconds", "Latency.", ["stage"], buckets=(0.1, 1.0))
+  requests.inc(endpoint="readme", status="200")
+  requests.inc(endpoint="readme", status="200")
+  latency.observe(0.05, stage="score")
+  latency.observe(3.0, stage="score")
+
+  text = registry.render_prometheus()
+  assert "# TYPE reqs_total counter" in text
+  assert 'reqs_total{endpoint="readme",status="200"} 2' in text
+  assert 'latency_seconds_bucket{stage="score",le="0.1"} 1' in text
+  assert 'latency_seconds_bucket{stage="score",le="1"} 1' in text
+  assert 'latency_seconds_bucket{stage="score",le="+Inf"} 2' in text
+  assert 'latency_seconds_count{stage="score"} 2' in text
+  assert 'latency_seconds_sum{stage="score"} 3.05' in text
+
+
+def test_percentile_nearest_rank():
+  values = [0.1 * i for i in range(1, 21)]
+  assert percentile(values, 50) == values[9]
+  assert percentile(values, 95) == values[18]
+  assert percentile([], 95) == 0.0
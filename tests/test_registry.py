@@ -0,0 +1,89 @@
+"""Tests for the preset and rubric registry."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from gh_visibility.presets import PRESETS_DIR, load_preset
+from gh_visibility.registry import PresetRegistry, PresetValidationError, thaw
+
+
+def _copy_presets(tmp_path):
+  target = tmp_path / "presets"
+  shutil.copytree(PRESETS_DIR, target)
+  return target
+
+
+def test_registry_loads_all_presets_frozen():
+  registry = PresetRegistry()
+  assert "indie-hacker" in registry.ids()
+  preset = registry.get("indie-hacker")
+  assert thaw(preset) == load_preset("indie-hacker")
+  with pytest.raises(TypeError):
+    preset["weights"] = {}
+  assert registry.rubric["dimensions"]
+
+
+def test_registry_unknown_preset_raises():
+  with pytest.raises(FileNotFoundError):
+    PresetRegistry().get("nonexistent-preset-id")
+
+
+def test_registry_rejects_invalid_preset_at_load(tmp_path):
+  presets = _copy_presets(tmp_path)
+  (presets / "broken.json").write_text(json.dumps({"id": "broken", "weights": {"nameClarity": "high"}}))
+  with pytest.raises(PresetValidationError) as exc:
+    PresetRegistry(presets_dir=presets)
+  assert "broken" in exc.value.errors
+
+
+def test_registry_hot_reload_swaps_snapshot_and_keeps_last_good(tmp_path):
+  presets = _copy_presets(tmp_path)
+  registry = PresetRegistry(presets_dir=presets)
+  before = registry.get("indie-hacker")
+
+  path = presets / "indie-hacker.json"
+  data = json.loads(path.read_text())
+  data["weights"]["nameClarity"] = 2.5
+  path.write_text(json.dumps(data))
+  os.utime(path, ns=(0, 10**18))
+  assert registry.reload_if_changed() is True
+  assert registry.get("indie-hacker")["weights"]["nameClarity"] == 2.5
+  assert before["weights"]["nameClarity"] == 1.0
+
+  data["weights"]["nameClarity"] = "bad"
+  path.write_text(json.dumps(data))
+  os.utime(path, ns=(0, 2 * 10**18))
+  assert registry.reload_if_changed() is False
+  assert registry.last_reload_error
+  assert registry.get("indie-hacker")["weights"]["nameClarity"] == 2.5
+
+
+@pytest.mark.parametrize("content", ["[1, 2]", '"indie"', "null"])
+def test_registry_reports_non_object_presets_as_invalid(tmp_path, content):
+  presets = _copy_presets(tmp_path)
+  (presets / "listy.json").write_text(content)
+  with pytest.raises(PresetValidationError) as exc:
+    PresetRegistry(presets_dir=presets)
+  assert "expected object" in exc.value.errors["listy"][0]
+
+
+def test_preset_files_outside_the_registry_are_validated_too(tmp_path):
+  registry = PresetRegistry()
+  draft = json.loads((PRESETS_DIR / "indie-hacker.json").read_text())
+  del draft["id"]
+  path = tmp_path / "draft.json"
+  path.write_text(json.dumps(draft))
+  preset = registry.load_file(path)
+  assert preset["id"] == "draft" and preset["weights"] == registry.get("indie-hacker")["weights"]
+
+  for bad in ([draft], {**draft, "weights": {"nameClarity": "high"}}):
+    path.write_text(json.dumps(bad))
+    with pytest.raises(PresetValidationError) as exc:
+      registry.load_file(path)
+    assert "draft" in exc.value.errors
+  path.write_text("{not json")
+  with pytest.raises(PresetValidationError, match="cannot read draft.json"):
+    registry.load_file(path)
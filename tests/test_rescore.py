@@ -0,0 +1,78 @@
+"""Tests for offline rescoring from saved raw inputs."""
+
+from datetime import datetime, timezone
+
+from gh_visibility.analyzer import Analyzer
+from gh_visibility.github_client import ReadmeStream, RepoSummary
+from gh_visibility.presets import load_preset
+from gh_visibility.rescore import read_raw_inputs, rescore, write_raw_input
+
+
+def _repo(i: int) -> dict:
+  return {
+    "id": i,
+    "name": f"tool-{i}",
+    "fullName": f"octo/tool-{i}",
+    "description": "A CLI that does a useful thing for developers on Linux and macOS." if i % 2 else None,
+    "topics": ["cli", "python"][: i % 3],
+    "pushedAt": "2025-01-01T00:00:00Z",
+  }
+
+
+def _write_raw(path, n: int, fetched_at: datetime) -> None:
+  with open(path, "w", encoding="utf-8") as f:
+    for i in range(n):
+      readme = f"# Tool {i}\n\nWhat this is and who it is for.\n\n## Usage\n\nRun it." if i % 4 else None
+      write_raw_input(f, _repo(i), readme, fetched_at=fetched_at)
+
+
+def test_rescore_matches_live_scoring(tmp_path):
+  fetched_at = datetime(2025, 1, 11, tzinfo=timezone.utc)
+  raw = tmp_path / "raw.jsonl"
+  _write_raw(raw, 5, fetched_at)
+  preset = load_preset("indie-hacker")
+
+  evaluations = rescore(raw, preset=preset, mode="suggest", jobs=1)
+
+  analyzer = Analyzer(preset=preset)
+  records = list(read_raw_inputs(raw))
+  expected = analyzer.finalize(
+    [analyzer.evaluate_repo(r["repo"], r["readme"], mode="suggest", now=fetched_at) for r in records],
+    mode="suggest",
+  )
+  assert evaluations == expected
+  assert evaluations[0]["analysis"]["daysSinceLastPush"] == 10
+
+  # A README cut at the download budget is rescored as truncated, like the live scan.
+  long_readme = "# Big\n\nWhat this is and who it is for.\n\n" + "## Usage\n\nRun it with care.\n\n" * 400
+  summary = RepoSummary(
+    id=99, name="big", full_name="octo/big", html_url="https://github.com/octo/big", private=False,
+    description="A CLI", topics=["cli"], archived=False, pushed_at="2025-01-01T00:00:00Z", default_branch="main",
+  )
+
+  class Client:
+    def get_readme_stream(self, full_name, max_bytes):
+      return ReadmeStream.from_bytes(long_readme.encode("utf-8"), max_bytes)
+
+  streamed = tmp_path / "streamed.jsonl"
+  live = Analyzer(preset=preset, readme_max_bytes=2048)
+  with open(streamed, "w", encoding="utf-8") as f:
+    ev = live.evaluate_summary(
+      Client(), summary, mode="suggest", now=fetched_at,
+      record_raw=lambda repo, readme, truncated: write_raw_input(f, repo, readme, fetched_at, truncated=truncated),
+    )
+  live_result = live.finalize([ev], mode="suggest")
+  assert live_result[0]["analysis"]["readmeTruncated"] is True
+  assert next(read_raw_inputs(streamed))["readmeTruncated"] is True
+  assert rescore(streamed, preset=preset, mode="suggest", jobs=1) == live_result
+
+
+def test_rescore_parallel_preserves_order(tmp_path):
+  raw = tmp_path / "raw.jsonl"
+  _write_raw(raw, 250, datetime(2025, 1, 11, tzinfo=timezone.utc))
+  preset = load_preset("portfolio-dev")
+
+  serial = rescore(raw, preset=preset, jobs=1)
+  parallel = rescore(raw, preset=preset, jobs=2)
+  assert [e["repo"]["id"] for e in parallel] == list(range(250))
+  assert parallel == serial
@@ -0,0 +1,97 @@
+"""Tests for README section matching against preset requirements."""
+
+import json
+import os
+import shutil
+
+from gh_visibility.analyzer import Analyzer
+from gh_visibility.presets import PRESETS_DIR, load_preset
+from gh_visibility.registry import PresetRegistry
+from gh_visibility.sections import SectionMatcher, matcher_for, normalize_heading, section_key
+
+HEADINGS = [
+  "readme-lint",
+  "🚀 Getting Started",
+  "1. Installation & Setup",
+  "Usage with **readme-lint**",
+  "[API Reference](docs/api.md)",
+  "License (MIT)",
+  "Who is this for?",
+]
+
+
+def test_normalize_and_synonyms():
+  assert normalize_heading("2) What's **New**?") == "whats new"
+  assert normalize_heading("[API Reference](docs/api.md)") == "api reference"
+  assert section_key("Getting Started") == section_key("Quickstart") == section_key("Quick Start")
+  assert section_key("Running Locally") == section_key("How to Run It")
+  assert section_key("Some Custom Section") == "some custom section"
+
+
+def test_one_pass_covers_every_preset():
+  found = matcher_for().match(HEADINGS)
+  missing = {
+    preset: SectionMatcher.missing(found, load_preset(preset)["readmeRequirements"]["requiredSections"])
+    for preset in ("indie-hacker", "open-source-maintainer", "technical-writer")
+  }
+  assert missing == {
+    "indie-hacker": ["What This Is"],
+    "open-source-maintainer": ["What This Is", "Configuration", "Contributing"],
+    "technical-writer": ["What This Is", "Examples", "Contributing"],
+  }
+  # Words are matched whole: "apiary" is not "api", "docs/api.md" link targets are ignored.
+  assert matcher_for().match(["Apiary notes", "[Guide](docs/api.md)"]) == set()
+
+
+def test_phrases_must_start_the_heading():
+  matcher = matcher_for()
+  # A phrase later in the heading, or a bare-word synonym followed by more words, names no section.
+  assert matcher.match([
+    "Why the build fails on Windows",
+    "Breaking changes in v2",
+    "About the author",
+    "Known issues and questions",
+  ]) == set()
+  assert matcher.match(["Why?", "## About", "Changes"]) == {"why i built this", "what this is", "changelog"}
+  # Multi-word synonyms and section names still match as the heading's first words.
+  assert matcher.match(["✨ Frequently asked questions (and answers)", "2. Release notes for v2"]) == {"faq", "changelog"}
+
+
+def test_custom_preset_sections_are_matched():
+  preset = {"readmeRequirements": {"requiredSections": ["Data Sources"], "recommendedSections": []}}
+  assert "data sources" in matcher_for(preset).match(["## Data sources"])
+
+
+def test_matcher_follows_registry_reloads(tmp_path):
+  presets = tmp_path / "presets"
+  shutil.copytree(PRESETS_DIR, presets)
+  registry = PresetRegistry(presets_dir=presets)
+  assert matcher_for(registry=registry).match(["Data sources"]) == set()
+
+  path = presets / "indie-hacker.json"
+  data = json.loads(path.read_text())
+  data["readmeRequirements"]["recommendedSections"].append("Data Sources")
+  path.write_text(json.dumps(data))
+  os.utime(path, ns=(0, 10**18))
+  assert registry.reload_if_changed() is True
+  assert matcher_for(registry=registry).match(["Data sources"]) == {"data sources"}
+
+
+def test_missing_sections_feed_score_and_suggestions():
+  analyzer = Analyzer(preset=load_preset("indie-hacker"))
+  body = " ".join(["word"] * 300)
+  complete = "\n".join(["# app", body, "## About", "## Who it's for", "## Getting Started", "## Usage"])
+  partial = "\n".join(["# app", body, "## About", "## Install", "## Notes"])
+  full = analyzer.evaluate_repo({"name": "app"}, complete, mode="suggest")
+  part = analyzer.evaluate_repo({"name": "app"}, partial, mode="suggest")
+
+  assert full.analysis["readmeSectionCoverage"] == 1.0
+  assert full.analysis["readmeMissingRecommendedSections"] == ["Pricing", "FAQ", "Changelog"]
+  assert part.analysis["readmeMissingSections"] == ["Who This Is For", "Quick Start", "Usage"]
+  assert part.scores["readmeStructure"]["score"] == full.scores["readmeStructure"]["score"] - 15.0
+  assert "1/4 required sections" in part.scores["readmeStructure"]["explanation"]
+  suggestion = next(s for s in part.suggestions if s["dimension"] == "readmeStructure")
+  assert suggestion["proposedChange"] == {"kind": "readme", "sections": ["Who This Is For", "Quick Start", "Usage"]}
+
+  # Without a preset the heading count still drives structure.
+  assert Analyzer().evaluate_repo({"name": "app"}, partial).analysis["readmeSectionCoverage"] is None
@@ -0,0 +1,111 @@
+"""Tests for single-flight coalescing of identical POST /scan requests."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.backend_fakes import FakeClient, summary
+
+import main
+import singleflight
+import store
+from singleflight import SingleFlight
+
+
+def _run_concurrently(flight, fn, release, callers=5):
+  pool = ThreadPoolExecutor(max_workers=callers)
+  futures = [pool.submit(flight.do, "key", fn) for _ in range(callers)]
+  time.sleep(0.2)  # let every caller reach do() while the leader is still running
+  release.set()
+  pool.shutdown(wait=True)
+  return futures
+
+
+def test_concurrent_identical_calls_run_once_and_share_the_result():
+  flight, release, calls = SingleFlight(), threading.Event(), []
+
+  def fn():
+    calls.append(1)
+    release.wait(5)
+    return {"repos": 3}
+
+  futures = _run_concurrently(flight, fn, release)
+  results = [f.result(timeout=5) for f in futures]
+  assert len(calls) == 1
+  assert all(result is results[0][0] for result, _ in results)
+  assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+
+
+def test_leader_failure_reaches_followers_but_does_not_poison_the_key():
+  flight, release = SingleFlight(reuse_window=60), threading.Event()
+
+  def fail():
+    release.wait(5)
+    raise RuntimeError("rate limited")
+
+  futures = _run_concurrently(flight, fail, release, callers=3)
+  for f in futures:
+    with pytest.raises(RuntimeError, match="rate limited"):
+      f.result(timeout=5)
+  # Failures are never reused: the next call runs again.
+  assert flight.do("key", lambda: "ok") == ("ok", False)
+
+
+def test_finished_results_are_reused_only_within_the_window(monkeypatch):
+  now = [100.0]
+  monkeypatch.setattr(singleflight.time, "monotonic", lambda: now[0])
+  flight, calls = SingleFlight(reuse_window=30), []
+
+  def fn():
+    calls.append(1)
+    return len(calls)
+
+  assert flight.do("key", fn) == (1, False)
+  now[0] += 30
+  assert flight.do("key", fn) == (1, True)
+  now[0] += 0.5
+  assert flight.do("key", fn) == (2, False)
+  assert SingleFlight().do("key", fn) == (3, False)  # no window: nothing is kept
+
+
+def test_scan_key_covers_everything_that_changes_the_result():
+  base = main.ScanRequest(username="Octo", token="ghp_secret")
+  key = main._scan_key(base)
+  assert "ghp_secret" not in repr(key)
+  assert main._scan_key(base.model_copy(update={"username": "octo"})) == key
+  variants = [
+    {"token": "ghp_other"},
+    {"tokens": ["ghp_extra"]},
+    {"preset": "portfolio-dev"},
+    {"preset_payload": {"id": "draft", "weights": {"overall": 1}}},
+    {"repo": "alpha"},
+    {"mode": "analyze"},
+    {"benchmark": "internal"},
+    {"use_llm": True},
+    {"use_llm": True, "llm_api_key": "sk-one"},
+  ]
+  keys = {main._scan_key(base.model_copy(update=v)) for v in variants}
+  assert len(keys) == len(variants) and key not in keys
+  with_key = main._scan_key(base.model_copy(update={"use_llm": True, "llm_api_key": "sk-one"}))
+  assert "sk-one" not in repr(with_key)
+  assert with_key != main._scan_key(base.model_copy(update={"use_llm": True, "llm_api_key": "sk-two"}))
+
+
+def test_scan_endpoint_marks_coalesced_responses(tmp_path, monkeypatch):
+  monkeypatch.setattr(store, "DB_PATH", tmp_path / "scans.db")
+  monkeypatch.setattr(main, "scan_flights", SingleFlight(reuse_window=60))
+  client = FakeClient([summary(1, "alpha")])
+  listings = []
+  original = client.list_repos_for_user
+  monkeypatch.setattr(client, "list_repos_for_user", lambda user: (listings.append(user), original(user))[1])
+  monkeypatch.setattr(main, "client_for", lambda token, tokens=None: client)
+  http = TestClient(main.app)
+  body = {"username": "octo", "token": "t", "mode": "analyze"}
+
+  first, second = http.post("/scan", json=body), http.post("/scan", json=body)
+  assert first.headers["X-Scan-Coalesced"] == "0" and second.headers["X-Scan-Coalesced"] == "1"
+  assert first.json() == second.json() and len(listings) == 1
+  assert http.post("/scan", json={**body, "mode": "suggest"}).headers["X-Scan-Coalesced"] == "0"
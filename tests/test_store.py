@@ -0,0 +1,178 @@
+"""Tests for the SQLite scan store: connection pool and per-repo score rows."""
+
+import sqlite3
+import threading
+from datetime import date, datetime, timezone
+
+import pytest
+
+from tests import backend_fakes  # noqa: F401  (backend import path)
+
+import store
+from store import DIMENSIONS, _ConnectionPool
+
+
+def _evaluation(name, overall, **repo):
+  scores = {dim: {"score": 50.0} for dim in DIMENSIONS}
+  scores["overall"] = {"score": overall}
+  del scores["metadataHygiene"]  # an unscored dimension is stored as NULL
+  return {"repo": {"name": name, "fullName": f"octo/{name}", **repo}, "scores": scores}
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+  monkeypatch.setattr(store, "DB_PATH", tmp_path / "scans.db")
+  return tmp_path / "scans.db"
+
+
+def test_save_scan_writes_one_row_per_repo_and_dimension(db):
+  scan_id = store.save_scan("octo", "indie-hacker", [_evaluation("alpha", 70.0), {"repo": {}, "scores": {}}])
+  with sqlite3.connect(db) as conn:
+    rows = conn.execute(
+      "SELECT position, repo, dimension, score FROM repo_scores WHERE scan_id = ? ORDER BY position, dimension",
+      (scan_id,),
+    ).fetchall()
+  assert len(rows) == 2 * len(DIMENSIONS)
+  alpha = {dim: score for position, repo, dim, score in rows if position == 0}
+  assert alpha["overall"] == 70.0 and alpha["metadataHygiene"] is None
+  # A repo without any name is stored under "?" rather than failing the NOT NULL column.
+  assert {repo for position, repo, _, _ in rows if position == 1} == {"?"}
+  assert store.get_history("octo")[0]["summary"] == [
+    {"fullName": "octo/alpha", "overall": 70.0},
+    {"fullName": "?", "overall": None},
+  ]
+
+
+def test_pool_hands_each_connection_to_one_thread_at_a_time(db):
+  pool = _ConnectionPool(db, 2)
+  held, release, third = [], threading.Event(), threading.Event()
+  both_held = threading.Barrier(3)
+
+  def hold():
+    with pool.connection() as conn:
+      held.append(conn)
+      both_held.wait(5)
+      release.wait(5)
+
+  holders = [threading.Thread(target=hold) for _ in range(2)]
+  for t in holders:
+    t.start()
+  both_held.wait(5)
+
+  def checkout():
+    with pool.connection() as conn:
+      assert conn in held
+      third.set()
+
+  waiter = threading.Thread(target=checkout)
+  waiter.start()
+  assert not third.wait(0.2)  # both connections are out
+  release.set()
+  assert third.wait(5)
+  for t in holders + [waiter]:
+    t.join()
+  assert held[0] is not held[1]
+  pool.close()
+
+
+def test_close_also_closes_connections_that_are_checked_out(db):
+  pool = _ConnectionPool(db, 2)
+  with pool.connection() as busy:
+    pool.close()
+    busy.execute("SELECT 1")  # still usable until returned
+  with pytest.raises(sqlite3.ProgrammingError):
+    busy.execute("SELECT 1")
+  with pytest.raises(sqlite3.ProgrammingError, match="closed"):
+    with pool.connection():
+      pass
+
+
+def test_wal_readers_are_not_blocked_by_an_open_write(db):
+  store.save_scan("octo", "indie-hacker", [_evaluation("alpha", 70.0)])
+  pool = _ConnectionPool(db, 2)
+  with pool.connection() as writer, pool.connection() as reader:
+    assert writer.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute(
+      "INSERT INTO scans (username, preset_id, timestamp, repo_count, summary) VALUES ('octo', 'p', '2025-01-01', 0, '')"
+    )
+    # The reader sees the last committed state without waiting for the writer.
+    assert reader.execute("SELECT COUNT(*) FROM scans").fetchone() == (1,)
+    writer.execute("COMMIT")
+    assert reader.execute("SELECT COUNT(*) FROM scans").fetchone() == (2,)
+  pool.close()
+
+
+class _Clock:
+  """Stands in for store.datetime so each save_scan gets a chosen timestamp."""
+
+  def __init__(self):
+    self.now = None
+
+  def install(self, monkeypatch):
+    clock = self
+
+    class FixedDatetime(datetime):
+      @classmethod
+      def now(cls, tz=None):
+        return clock.now
+
+    monkeypatch.setattr(store, "datetime", FixedDatetime)
+    return self
+
+
+def test_bucket_start_week_and_month_boundaries():
+  assert store.bucket_start(date(2025, 3, 2), "week") == "2025-02-24"  # Sunday -> previous Monday
+  assert store.bucket_start(date(2025, 3, 3), "week") == "2025-03-03"  # Monday starts its own week
+  assert store.bucket_start(date(2024, 12, 31), "week") == "2024-12-30"
+  assert store.bucket_start(date(2025, 3, 31), "month") == "2025-03-01"
+  assert store.bucket_start(date(2025, 3, 31), "day") == "2025-03-31"
+  with pytest.raises(ValueError):
+    store.bucket_start(date(2025, 3, 31), "year")
+
+
+def test_trend_buckets_hold_account_min_avg_max(db, monkeypatch):
+  clock = _Clock().install(monkeypatch)
+  for day, (alpha, beta) in ((date(2025, 2, 28), (40.0, 80.0)), (date(2025, 3, 2), (60.0, 70.0)), (date(2025, 3, 3), (90.0, 50.0))):
+    clock.now = datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc)
+    store.save_scan("octo", "indie-hacker", [_evaluation("alpha", alpha), _evaluation("beta", beta)])
+
+  weekly = store.get_trend("octo", dimensions=["overall"], granularity="week")["overall"]
+  assert weekly == [
+    {"bucket": "2025-02-24", "count": 4, "min": 40.0, "avg": 62.5, "max": 80.0},
+    {"bucket": "2025-03-03", "count": 2, "min": 50.0, "avg": 70.0, "max": 90.0},
+  ]
+  monthly = store.get_trend("octo", repo="octo/alpha", dimensions=["overall"], granularity="month")["overall"]
+  assert [(b["bucket"], b["count"], b["min"], b["max"]) for b in monthly] == [
+    ("2025-02-01", 1, 40.0, 40.0),
+    ("2025-03-01", 2, 60.0, 90.0),
+  ]
+  # An unscored dimension adds no samples.
+  assert store.get_trend("octo", dimensions=["metadataHygiene"])["metadataHygiene"] == []
+
+  # start/end are widened to whole buckets: mid-week dates still cover both weeks.
+  widened = store.get_trend("octo", dimensions=["overall"], granularity="week", start=date(2025, 2, 27), end=date(2025, 3, 4))
+  assert [b["bucket"] for b in widened["overall"]] == ["2025-02-24", "2025-03-03"]
+  daily = store.get_trend("octo", dimensions=["overall"], start=date(2025, 3, 1), end=date(2025, 3, 2))
+  assert [b["bucket"] for b in daily["overall"]] == ["2025-03-02"]
+
+
+def test_trends_endpoint_validates_its_query(db, monkeypatch):
+  from fastapi.testclient import TestClient
+
+  import main
+
+  store.save_scan("octo", "indie-hacker", [_evaluation("alpha", 70.0)])
+  monkeypatch.setattr(main, "_token_login", {"t": "Octo", "other": "someone-else", "revoked": None}.get)
+  http = TestClient(main.app)
+  owner = {"Authorization": "Bearer t"}
+  ok = http.get("/trends", params={"username": "octo", "dimension": "overall,readmeStructure", "granularity": "month"}, headers=owner)
+  assert ok.status_code == 200 and set(ok.json()["series"]) == {"overall", "readmeStructure"}
+  assert ok.json()["series"]["overall"][0]["avg"] == 70.0
+  assert http.get("/trends", params={"username": "octo", "dimension": "stars"}, headers=owner).status_code == 400
+  assert http.get("/trends", params={"username": "octo", "granularity": "year"}, headers=owner).status_code == 400
+
+  # Only a token of the account reads its trends; others get 404 whether or not it was scanned.
+  assert http.get("/trends", params={"username": "octo"}).status_code == 401
+  for token in ("other", "revoked"):
+    assert http.get("/trends", params={"username": "octo", "repo": "octo/alpha"}, headers={"Authorization": f"Bearer {token}"}).status_code == 404
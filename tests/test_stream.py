@@ -0,0 +1,88 @@
+"""Tests for POST /scan/stream framing and its terminal summary/error events."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from tests.backend_fakes import FakeClient, summary
+
+import main
+import store
+
+BOILERPLATE = "\n".join(
+  ["# Project", "", "This repository was generated from the company template and has not been edited yet."]
+  + [f"Step {i}: follow the template checklist item number {i} before publishing anything." for i in range(40)]
+)
+REPOS = [summary(1, "alpha"), summary(2, "beta", description=None), summary(3, "gamma")]
+SCAN = {"username": "octo", "token": "t", "mode": "suggest"}
+
+
+@pytest.fixture
+def http(tmp_path, monkeypatch):
+  monkeypatch.setattr(store, "DB_PATH", tmp_path / "scans.db")
+  return TestClient(main.app), monkeypatch
+
+
+def _ndjson(response):
+  return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+
+def _sse(response):
+  events = []
+  for block in response.text.split("\n\n"):
+    if not block.strip():
+      continue
+    kind, data = block.split("\n")
+    assert kind.startswith("event: ") and data.startswith("data: ")
+    events.append({"type": kind[len("event: "):], **json.loads(data[len("data: "):])})
+  return events
+
+
+@pytest.mark.parametrize("fmt, parse, media_type", [
+  ("ndjson", _ndjson, "application/x-ndjson"),
+  ("sse", _sse, "text/event-stream"),
+])
+def test_stream_frames_one_event_per_repo_then_a_summary(http, fmt, parse, media_type):
+  client, monkeypatch = http
+  monkeypatch.setattr(main, "client_for", lambda token, tokens=None: FakeClient(REPOS))
+  response = client.post(f"/scan/stream?format={fmt}", json=SCAN)
+  assert response.status_code == 200 and response.headers["content-type"].startswith(media_type)
+  events = parse(response)
+  assert [e["type"] for e in events] == ["evaluation"] * 3 + ["summary"]
+  assert [e["evaluation"]["repo"]["name"] for e in events[:3]] == ["alpha", "beta", "gamma"]
+  assert events[-1]["repo_count"] == 3 and events[-1]["scan_id"] is not None
+
+
+def test_summary_carries_final_evaluations_changed_by_account_passes(http):
+  client, monkeypatch = http
+  readmes = {"octo/alpha": BOILERPLATE, "octo/beta": BOILERPLATE, "octo/gamma": BOILERPLATE.replace("Project", "Gamma")}
+  monkeypatch.setattr(main, "client_for", lambda token, tokens=None: FakeClient(REPOS, readmes=readmes))
+  llm = {"dimension": "overall", "severity": "note", "message": "from the LLM"}
+  monkeypatch.setattr(main, "_apply_llm", lambda req, preset, evs: [
+    e.update(suggestions=list(e.get("suggestions") or []) + [llm]) for e in evs
+  ])
+  events = _ndjson(client.post("/scan/stream?format=ndjson", json=SCAN))
+  streamed = {e["evaluation"]["repo"]["fullName"]: e["evaluation"] for e in events[:-1]}
+  final = events[-1]
+
+  groups = final["readmeDuplicateGroups"]
+  assert set(groups) == {"octo/alpha", "octo/beta", "octo/gamma"}
+  updated = final["updated"]
+  for name, evaluation in updated.items():
+    assert evaluation["analysis"]["readmeDuplicateGroup"] == groups[name]
+    assert evaluation["scores"]["overall"] == final["overall"][name]
+    assert evaluation["scores"]["overall"]["score"] < streamed[name]["scores"]["overall"]["score"]
+  # Topic recommendations only exist after finalize, so the update is the first to name them.
+  topic = next(s for s in updated["octo/alpha"]["suggestions"] if s["dimension"] == "topicCoverage")
+  assert topic["proposedChange"]["kind"] == "topics"
+  assert updated["octo/alpha"]["suggestions"].count(llm) == 1  # streamed LLM suggestions are kept
+
+
+def test_failed_scan_ends_with_an_error_event(http):
+  client, monkeypatch = http
+  monkeypatch.setattr(main, "client_for", lambda token, tokens=None: FakeClient(REPOS, error=RuntimeError("listing failed")))
+  for fmt, parse in (("ndjson", _ndjson), ("sse", _sse)):
+    events = parse(client.post(f"/scan/stream?format={fmt}", json=SCAN))
+    assert events == [{"type": "error", "detail": "listing failed"}]
+  assert client.post("/scan/stream?format=xml", json=SCAN).status_code == 400
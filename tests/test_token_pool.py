@@ -0,0 +1,101 @@
+"""Tests for scheduling requests over a pool of tokens."""
+
+import sys
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fake_github import FakeGitHubServer, FaultConfig  # noqa: E402
+
+from gh_visibility.analyzer import Analyzer  # noqa: E402
+from gh_visibility.github_client import GitHubClient  # noqa: E402
+from gh_visibility.http_cache import token_fingerprint  # noqa: E402
+from gh_visibility.token_pool import TokenPool, TokenPoolExhausted, pool_fingerprint  # noqa: E402
+
+
+def test_pool_multiplies_the_request_budget_and_fails_over():
+  # 100 repos need 102 requests: more than one token's budget of 60.
+  with FakeGitHubServer(accounts={"octo": 100}, faults=FaultConfig(rate_limit=60)) as server:
+    with pytest.raises(requests.HTTPError):
+      Analyzer().evaluate_account(GitHubClient("a", api_root=server.url), "octo")
+
+    server.revoke_token("revoked")
+    client = GitHubClient.from_tokens(["revoked", "b", "c"], api_root=server.url)
+    evaluations = Analyzer().evaluate_account(client, "octo")
+    assert len(evaluations) == 100
+    assert server.stats.unauthorized == 1  # dropped after its first 401
+    b, c = client._pool.tokens[1:]
+    # Requests were balanced by remaining quota.
+    assert abs(b.remaining - c.remaining) <= 1
+
+    with pytest.raises(TokenPoolExhausted):
+      Analyzer().evaluate_account(client, "octo")
+
+
+def test_private_repos_stay_on_their_token():
+  pool = TokenPool(["a", "b"], lambda token: token)
+  a, b = pool.tokens
+  pool.observe(a, 200, {"X-RateLimit-Remaining": "10"})
+  pool.observe(b, 200, {"X-RateLimit-Remaining": "4000"})
+  assert pool.pick() is b
+  pool.pin("octo/secret", a)
+  assert pool.pick("octo/secret") is a
+
+  pool.observe(a, 403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(int(time.time()) + 60)})
+  assert pool.pick() is b
+  with pytest.raises(TokenPoolExhausted):
+    pool.pick("octo/secret")
+
+
+def test_single_token_pool_shares_the_token_cache_identity():
+  assert pool_fingerprint(["a", "a"]) == token_fingerprint("a")
+  assert pool_fingerprint(["a", "b"]) == pool_fingerprint(["b", "a"]) != token_fingerprint("a")
+
+
+def test_exhaustion_says_when_a_token_is_usable_again():
+  e = TokenPoolExhausted("every token in the pool is rate limited", reset_at=1_700_000_090.2)
+  assert e.retry_after(now=1_700_000_000) == 91
+  assert e.retry_after(now=1_700_000_100) == 1  # never "retry in 0s"
+  assert e.describe(now=1_700_000_000) == (
+    "every token in the pool is rate limited; a token is usable again at 2023-11-14 22:14:50 UTC (in 91s)"
+  )
+  rejected = TokenPoolExhausted("every token in the pool was rejected (revoked or invalid)")
+  assert rejected.retry_after() is None and rejected.describe() == str(rejected)
+
+
+def test_cli_scan_and_watch_exit_cleanly_when_the_pool_is_exhausted(monkeypatch):
+  from gh_visibility.cli import main
+
+  with FakeGitHubServer(accounts={"octo": 100}, faults=FaultConfig(rate_limit=30)) as server:
+    monkeypatch.setenv("GITHUB_API_URL", server.url)
+    with pytest.raises(SystemExit) as exc:
+      main(["--token", "a,b", "scan", "--user", "octo"])
+    assert str(exc.value.code).startswith("scan stopped: every token in the pool is rate limited; a token is usable again at ")
+
+    server.revoke_token("c")
+    server.revoke_token("d")
+    with pytest.raises(SystemExit) as exc:
+      main(["--token", "c,d", "watch", "--user", "octo", "--once"])
+  assert exc.value.code == "watch stopped: every token in the pool was rejected (revoked or invalid)"
+
+
+def test_watch_waits_for_the_first_token_reset(monkeypatch):
+  from gh_visibility.watch import EventWatcher
+
+  waits = []
+
+  class Stop:
+    def is_set(self):
+      return False
+
+    def wait(self, seconds):
+      waits.append(seconds)
+
+  watcher = EventWatcher(None, Analyzer(), "octo", lambda record: None)
+  monkeypatch.setattr(watcher, "poll", lambda: (_ for _ in ()).throw(TokenPoolExhausted("limited", time.time() + 600)))
+  watcher.run(interval=60, stop=Stop(), max_polls=2)
+  assert len(waits) == 1 and 590 < waits[0] <= 600
@@ -0,0 +1,57 @@
+"""Tests for concrete topic recommendations."""
+
+import time
+
+from gh_visibility.analyzer import Analyzer
+from gh_visibility.presets import load_preset
+from gh_visibility.topics import TopicIndex, keywords, load_taxonomy, repo_keywords
+
+
+def test_taxonomy_parses_lists_and_combinations_but_not_generic_topics():
+  topics, combos = load_taxonomy()
+  assert {"vscode-extension", "machine-learning", "cli-tool", "markdown"} <= set(topics)
+  assert not {"awesome", "tool"} & set(topics)
+  assert ("cli-tool", "python", "automation", "developer-tools", "productivity") in combos
+  assert all("my-personal-project" not in c for c in combos)
+
+
+def test_recommend_ranks_keyword_hits_and_puts_required_topics_first():
+  index = TopicIndex.for_preset(load_preset("open-source-maintainer"))
+  repo = {"name": "vscode-md", "description": "VS Code extension that lints Markdown, written in TypeScript."}
+  recs = index.recommend(repo_keywords(repo, {"readmeSections": ["Usage"]}), ["typescript"], limit=4)
+  assert recs[0] == "open-source"
+  assert set(recs[1:3]) == {"markdown", "vscode-extension"}
+  assert "typescript" not in recs
+
+  # Synonyms are not recommended alongside each other or a topic already set.
+  assert "documentation" not in index.recommend(keywords("docs for the docs site"), ["docs"])
+
+
+def test_account_cooccurrence_suggests_topics_used_together():
+  index = TopicIndex(["python", "django", "rust"]).with_account([["python", "django"]] * 3 + [["rust"]])
+  assert index.recommend(set(), ["python"]) == ["django"]
+  assert index.recommend(set(), ["rust"]) == []
+
+
+def test_finalize_names_concrete_topics_in_suggestions():
+  analyzer = Analyzer(preset=load_preset("indie-hacker"))
+  repo = {"name": "scrape-kit", "fullName": "octo/scrape-kit", "description": "Python CLI for scraping sites", "topics": []}
+  ev = analyzer.evaluate_repo(repo, None, mode="suggest")
+  out = analyzer.finalize([ev], mode="suggest")
+  topic = next(s for s in out[0]["suggestions"] if s["dimension"] == "topicCoverage")
+  assert {"python", "cli-tool", "scraping", "developer-tools"} <= set(topic["proposedChange"]["topics"])
+  assert "scraping" in topic["message"]
+
+
+def test_lookup_is_sub_millisecond_at_account_scale():
+  index = TopicIndex.for_preset(load_preset("portfolio-dev"))
+  pool = ["python", "react", "typescript", "cli-tool", "automation", "docker-image", "aws", "testing"]
+  index = index.with_account([pool[i % 8:i % 8 + 3] for i in range(10_000)])
+  kw = repo_keywords(
+    {"name": "react-dashboard", "description": "A React and TypeScript dashboard for AWS cost analytics"},
+    {"readmeSections": ["Installation", "Usage", "Deploying with Docker", "License"]},
+  )
+  start = time.perf_counter()
+  for _ in range(1_000):
+    index.recommend(kw, ["react"])
+  assert (time.perf_counter() - start) / 1_000 < 0.001
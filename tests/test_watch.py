@@ -0,0 +1,38 @@
+"""Tests for the event-driven watch mode against the fake GitHub API."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+
+from fake_github import FakeGitHubServer  # noqa: E402
+
+from gh_visibility.analyzer import Analyzer  # noqa: E402
+from gh_visibility.github_client import GitHubClient  # noqa: E402
+from gh_visibility.watch import EventWatcher  # noqa: E402
+
+
+def test_watch_reevaluates_only_changed_repos_and_polls_conditionally():
+  with FakeGitHubServer(accounts={"octo": 20}, poll_interval=30) as server:
+    repos = server.account("octo").repos()
+    a, b = repos[0]["name"], repos[1]["name"]
+    server.add_event("octo", "PushEvent", a)
+    records = []
+    watcher = EventWatcher(GitHubClient("t", api_root=server.url), Analyzer(), "octo", records.append)
+
+    assert watcher.poll() == 0  # first poll only records the feed position
+    assert watcher.poll_interval == 30
+    requests_before = server.stats.requests
+    assert watcher.poll() == 0
+    assert server.stats.not_modified == 1
+    assert server.stats.requests == requests_before + 1
+
+    server.update_repo("octo", b, description="A much clearer description of what this does")
+    server.add_event("octo", "RepositoryEvent", b, {"action": "edited"})
+    server.add_event("octo", "CreateEvent", a, {"ref_type": "branch"})
+    server.add_event("octo", "WatchEvent", a)
+    assert watcher.poll() == 1
+    assert [r["repo"] for r in records] == [f"octo/{b}"]
+    assert records[0]["triggers"] == ["RepositoryEvent"]
+    evaluation = records[0]["evaluation"]
+    assert evaluation["repo"]["description"].startswith("A much clearer")
@@ -0,0 +1,201 @@
+"""Tests for the backend webhook receiver, using recorded GitHub payloads."""
+
+import hashlib
+import hmac
+import json
+import sys
+import threading
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1] / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import main  # noqa: E402
+import store  # noqa: E402
+from tests.backend_fakes import README, FakeClient, summary  # noqa: E402
+from webhooks import WEBHOOK_DELIVERIES, RepoChange, RescoreQueue, handle_delivery, parse_delivery, summary_from_payload  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "webhooks"
+SECRET = "It's a Secret to Everybody"
+BOILERPLATE = "\n".join(
+  ["# Project", "", "This repository was generated from the company template and has not been edited yet."]
+  + [f"Step {i}: follow the template checklist item number {i} before publishing anything." for i in range(40)]
+)
+
+
+def _payload(name):
+  return (FIXTURES / f"{name}.json").read_bytes()
+
+
+def _headers(event, body, delivery, secret=SECRET):
+  sig = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+  return {"X-GitHub-Event": event, "X-GitHub-Delivery": delivery, "X-Hub-Signature-256": f"sha256={sig}"}
+
+
+class FakeClock:
+  def __init__(self):
+    self.now = 1000.0
+
+  def __call__(self):
+    return self.now
+
+
+def _queue(clock, ran):
+  return RescoreQueue(ran.append, delay=10, max_delay=30, clock=clock, background=False)
+
+
+def test_signature_is_required_and_checked():
+  queue = _queue(FakeClock(), [])
+  body = _payload("push")
+  status, _ = handle_delivery(_headers("push", body, "d1", secret="wrong"), body, SECRET, queue)
+  assert status == 401
+  headers = _headers("push", body, "d1")
+  del headers["X-Hub-Signature-256"]
+  assert handle_delivery(headers, body, SECRET, queue)[0] == 401
+  assert queue.pending() == 0
+
+
+def test_delivery_metrics_use_a_fixed_set_of_event_labels():
+  WEBHOOK_DELIVERIES.reset()
+  queue = _queue(FakeClock(), [])
+  body = _payload("push")
+  for i in range(5):
+    headers = dict(_headers("push", body, f"x{i}", secret="wrong"), **{"X-GitHub-Event": f"made-up-{i}"})
+    assert handle_delivery(headers, body, SECRET, queue)[0] == 401
+  star = json.dumps({"action": "created", "repository": {"full_name": "octo/x"}}).encode()
+  assert handle_delivery(_headers("star", star, "s1"), star, SECRET, queue)[1]["status"] == "ignored"
+  handle_delivery(_headers("push", body, "p1"), body, SECRET, queue)
+  assert WEBHOOK_DELIVERIES.values() == {("rejected", "rejected"): 5, ("other", "ignored"): 1, ("push", "queued"): 1}
+
+
+def test_deliveries_for_one_repo_coalesce_until_quiet():
+  clock, ran = FakeClock(), []
+  queue = _queue(clock, ran)
+  push, edited, public = _payload("push"), _payload("repository-edited"), _payload("public")
+
+  assert handle_delivery(_headers("push", push, "d1"), push, SECRET, queue) == (202, {"status": "queued", "repo": "octo/readme-lint"})
+  # GitHub redelivery of the same delivery id.
+  assert handle_delivery(_headers("push", push, "d1"), push, SECRET, queue)[1]["status"] == "duplicate"
+  assert handle_delivery(_headers("public", public, "d2"), public, SECRET, queue)[0] == 202
+  clock.now += 5
+  assert handle_delivery(_headers("repository", edited, "d3"), edited, SECRET, queue)[1]["status"] == "coalesced"
+
+  clock.now += 5  # the push alone would be due now, but the edit restarted its window
+  assert queue.flush() == 1 and ran[0][0].full_name == "octo/dotfiles"
+  clock.now += 5
+  assert queue.flush() == 1
+  change = ran[1][0]
+  assert change.events == ["push", "repository.edited"]
+  assert change.repository["topics"] == ["python", "markdown", "cli-tool"]  # latest metadata wins
+  assert queue.pending() == 0
+
+
+def test_busy_repo_is_rescored_by_max_delay():
+  clock, ran = FakeClock(), []
+  queue = _queue(clock, ran)
+  body = _payload("push")
+  for i in range(8):
+    handle_delivery(_headers("push", body, f"d{i}"), body, SECRET, queue)
+    clock.now += 5
+    queue.flush()
+  assert len(ran) == 1 and len(ran[0]) == 1
+
+
+def test_ignored_events_and_branches():
+  push = json.loads(_payload("push"))
+  assert parse_delivery("push", dict(push, ref="refs/heads/feature")) is None
+  assert parse_delivery("push", dict(push, deleted=True)) is None
+  assert parse_delivery("star", push) is None
+  body = json.dumps({"zen": "Keep it logically awesome.", "hook_id": 1}).encode()
+  assert handle_delivery(_headers("ping", body, "p"), body, SECRET, _queue(FakeClock(), []))[0] == 200
+
+  deleted = dict(json.loads(_payload("repository-edited")), action="deleted")
+  clock, ran = FakeClock(), []
+  queue = _queue(clock, ran)
+  queue.submit(parse_delivery("push", push))
+  # A deletion replaces the pending push and still reaches the handler.
+  assert queue.submit(parse_delivery("repository", deleted)) == "removed"
+  assert queue.flush(force=True) == 1 and ran[0][0].removed and ran[0][0].events == ["repository.deleted"]
+
+
+def test_summary_from_push_payload_converts_epoch_timestamps():
+  summary = summary_from_payload(json.loads(_payload("push"))["repository"])
+  assert summary.full_name == "octo/readme-lint"
+  assert summary.pushed_at == "2025-03-02T09:15:04Z"
+  assert summary.topics == ["python", "markdown"]
+
+
+def _change(repo_id, name, owner="octo", **fields):
+  repository = {
+    "id": repo_id, "name": name, "full_name": f"{owner}/{name}", "owner": {"login": owner},
+    "description": "A tool", "topics": ["python"], "pushed_at": 1740906904, "default_branch": "main", **fields,
+  }
+  return RepoChange(owner=owner, full_name=repository["full_name"], repository=repository, events=["push"])
+
+
+def _removed(change):
+  change.removed = True
+  return change
+
+
+def test_rescore_refreshes_repos_in_the_latest_scan(tmp_path, monkeypatch):
+  monkeypatch.setattr(store, "DB_PATH", tmp_path / "scans.db")
+  monkeypatch.setenv("GH_VISIBILITY_WEBHOOK_TOKENS", "w")
+  repos = [summary(1, "alpha"), summary(2, "beta"), summary(3, "gamma")]
+  readmes = {"octo/alpha": BOILERPLATE, "octo/beta": BOILERPLATE, "octo/gamma": README.format(name="gamma")}
+  monkeypatch.setattr(main, "client_for", lambda token, tokens=None: FakeClient(repos, readmes=readmes))
+  http = TestClient(main.app)
+  for _ in range(2):
+    assert http.post("/scan", json={"username": "octo", "token": "t"}).status_code == 200
+  history = store.get_history("octo")
+  latest, previous = history[0]["scan_id"], history[1]["scan_id"]
+  before = {e["repo"]["name"]: e for e in store.get_scan_evaluations(latest)}
+  account_trend = store.get_trend("octo", dimensions=["overall"])["overall"]
+  beta_trend = store.get_trend("octo", repo="octo/beta", dimensions=["overall"])["overall"]
+
+  hooks = FakeClient(repos + [summary(4, "delta")], readmes={**readmes, "octo/delta": README.format(name="delta")})
+  monkeypatch.setattr(main, "client_for", lambda token, tokens=None: hooks)
+  main._rescore_changes([_change(2, "beta", description=None), _change(4, "delta"), _change(9, "solo", owner="nobody")])
+
+  # No new scan: history, "latest" and "previous" still point at the account scans.
+  assert [(h["scan_id"], h["source"]) for h in store.get_history("octo")] == [(latest, "scan"), (previous, "scan")]
+  assert store.get_history("octo")[0]["repo_count"] == 4
+  refreshed = store.get_scan_evaluations(latest)
+  assert [e["repo"]["name"] for e in refreshed] == ["alpha", "beta", "gamma", "delta"]
+  beta = refreshed[1]
+  assert beta["repo"]["description"] is None
+  # The README is unchanged, so it is still a duplicate of alpha's, as the account scan found.
+  assert beta["analysis"]["readmeDuplicateGroup"] == before["beta"]["analysis"]["readmeDuplicateGroup"]
+  assert beta["scores"]["readmeStructure"] == before["beta"]["scores"]["readmeStructure"]
+  assert any("alpha" in s["message"] for s in beta["suggestions"] if s["dimension"] == "readmeStructure")
+  assert refreshed[0] == before["alpha"]
+
+  diff = store.diff_scans(previous, latest, threshold=1)
+  assert diff["summary"]["added"] == 1 and diff["summary"]["removed"] == 0
+  assert {(r["repo"]["fullName"], r["status"]) for r in diff["repos"]} == {("octo/beta", "changed"), ("octo/delta", "added")}
+
+  # Only per-repo rollups take the webhook sample; account-wide buckets stay scan-only.
+  assert store.get_trend("octo", dimensions=["overall"])["overall"] == account_trend
+  assert store.get_trend("octo", repo="octo/beta", dimensions=["overall"])["overall"][0]["count"] == beta_trend[0]["count"] + 1
+
+  # An owner never scanned with the webhook preset has nothing to refresh.
+  assert store.get_history("nobody") == [] and not hooks.fetching.get("nobody/solo")
+
+  # Beta's README is rewritten, epsilon copies the boilerplate and gamma is deleted.
+  hooks.repos.append(summary(5, "epsilon"))
+  rewritten = "# beta\n\nBeta turns webhook payloads into tidy changelogs.\n\n## Usage\n\nbeta --since v1\n\n## Options\n\n--format md\n"
+  hooks.readmes.update({"octo/beta": rewritten, "octo/epsilon": BOILERPLATE})
+  hooks.fetching.update({"octo/epsilon": threading.Event()})
+  main._rescore_changes([_change(2, "beta"), _change(5, "epsilon"), _removed(_change(3, "gamma"))])
+  refreshed = {e["repo"]["name"]: e for e in store.get_scan_evaluations(latest)}
+  assert list(refreshed) == ["alpha", "beta", "delta", "epsilon"]
+  assert store.get_history("octo")[0]["repo_count"] == 4
+  beta = refreshed["beta"]
+  assert beta["analysis"].get("readmeDuplicateGroup") is None
+  assert not [s for s in beta["suggestions"] if (s.get("proposedChange") or {}).get("duplicateGroup")]
+  assert beta["scores"]["readmeStructure"]["score"] > before["beta"]["scores"]["readmeStructure"]["score"]
+  epsilon = refreshed["epsilon"]
+  assert epsilon["analysis"]["readmeDuplicateGroup"] == before["alpha"]["analysis"]["readmeDuplicateGroup"]
+  assert any("alpha" in s["message"] for s in epsilon["suggestions"] if s["dimension"] == "readmeStructure")